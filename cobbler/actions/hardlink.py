@@ -7,15 +7,43 @@ Hard links Cobbler content together to save space.
 # SPDX-FileCopyrightText: 2021 Enno Gotthold <egotthold@suse.de>
 # SPDX-FileCopyrightText: Copyright SUSE LLC
 
+import hashlib
+import json
 import logging
 import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
 
-from cobbler import utils
+from cobbler.utils import filesystem_helpers
+
+INDEX_FILE = "/var/lib/cobbler/hardlink_index.json"
+
+
+def hash_file(path: str, buffer_size: int = 1048576) -> str:
+    """
+    Hash the content of a file.
+
+    :param path: The file to hash.
+    :param buffer_size: The number of bytes read at once.
+    :return: The SHA256 of the file content.
+    """
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file_fd:
+        while True:
+            data = file_fd.read(buffer_size)
+            if not data:
+                break
+            sha256.update(data)
+    return sha256.hexdigest()
 
 
 class HardLinker:
     """
-    TODO
+    Finds files with identical content in the mirrors of Cobbler and replaces the duplicates with hardlinks.
+
+    The content hashes are kept in an index keyed by the path of the file. An entry is reused as long as the size,
+    mtime and inode of the file did not change, so after a reposync only the new and changed files are hashed again.
     """
 
     def __init__(self, api=None):
@@ -29,43 +57,203 @@ class HardLinker:
                 "cobbler hardlink requires the Cobbler-API for resolving the root folders."
             )
         self.api = api
-        self.hardlink = ""
         self.logger = logging.getLogger()
-        self.family = utils.get_family()
         self.webdir = self.api.settings().webdir
+        self.index_path = INDEX_FILE
 
-        # Getting the path to hardlink
-        for possible_location in ["/usr/bin/hardlink", "/usr/sbin/hardlink"]:
-            if os.path.exists(possible_location):
-                self.hardlink = possible_location
-        if not self.hardlink:
-            utils.die("please install 'hardlink' to use this feature")
+    def __load_index(self) -> Dict[str, list]:
+        """
+        Read the index of the last run.
 
-    def run(self):
+        :return: The entries of the index: path -> [size, mtime, inode, hash]
+        """
+        try:
+            with open(self.index_path, encoding="UTF-8") as index_fd:
+                return json.load(index_fd)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            self.logger.warning(
+                'Ignoring unreadable hardlink index "%s": %s', self.index_path, error
+            )
+            return {}
+
+    def __scan(self) -> Dict[str, os.stat_result]:
+        """
+        Find all non-empty regular files below the mirror directories. Symbolic links are not followed.
+
+        :return: The files and their stat results.
+        """
+        files = {}
+        for root in [f"{self.webdir}/distro_mirror", f"{self.webdir}/repo_mirror"]:
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        file_stat = os.lstat(path)
+                    except OSError:
+                        continue
+                    if stat.S_ISREG(file_stat.st_mode) and file_stat.st_size > 0:
+                        files[path] = file_stat
+        return files
+
+    @staticmethod
+    def __unchanged(path: str, file_stat: os.stat_result) -> bool:
+        """
+        Check that a file was not replaced or modified since it was scanned.
+
+        :param path: The file to check.
+        :param file_stat: The stat result of the scan.
+        :return: True if the size, mtime and inode of the file are still the same.
+        """
+        try:
+            current = os.lstat(path)
+        except OSError:
+            return False
+        return (current.st_size, current.st_mtime_ns, current.st_ino) == (
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+            file_stat.st_ino,
+        )
+
+    def __link(self, source: str, path: str) -> bool:
+        """
+        Atomically replace a file by a hardlink. The link is created next to the file and renamed over it, so the path
+        always exists.
+
+        :param source: The file to link to.
+        :param path: The file which is replaced.
+        :return: True if the file was replaced.
+        """
+        tmp_path = f"{path}.cobbler-hardlink"
+        try:
+            os.link(source, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as error:
+            self.logger.warning("failed to hardlink %s to %s: %s", path, source, error)
+            if os.path.lexists(tmp_path):
+                os.unlink(tmp_path)
+            return False
+        return True
+
+    def run(self, dry_run: bool = False) -> dict:
         """
         Simply hardlinks directories that are Cobbler managed.
+
+        :param dry_run: If True, nothing is linked and only the space which could be reclaimed is reported.
+        :return: A report with the number of scanned files ("files"), hashed files ("hashed"), duplicates ("linked")
+                 and the bytes which are ("reclaimed") or could be ("reclaimable") freed.
         """
         self.logger.info("now hardlinking to save space, this may take some time.")
+        index = self.__load_index()
+        files = self.__scan()
+
+        hashes: Dict[str, str] = {}
+        to_hash: List[str] = []
+        for path, file_stat in files.items():
+            entry = index.get(path)
+            if entry is not None and entry[:3] == [
+                file_stat.st_size,
+                file_stat.st_mtime_ns,
+                file_stat.st_ino,
+            ]:
+                hashes[path] = entry[3]
+            else:
+                to_hash.append(path)
+
+        def hash_or_none(path: str):
+            try:
+                return hash_file(path)
+            except OSError as error:
+                self.logger.warning("failed to hash %s: %s", path, error)
+                return None
+
+        with ThreadPoolExecutor() as executor:
+            for path, digest in zip(to_hash, executor.map(hash_or_none, to_hash)):
+                if digest is not None:
+                    hashes[path] = digest
 
-        # Setting the args for hardlink according to the distribution. Must end with a space!
-        if self.family == "debian":
-            hardlink_args = ["-f", "-p", "-o", "-t", "-v"]
-        elif self.family == "suse":
-            hardlink_args = ["-f", "-v"]
+        # Only files on the same device with the same size and content can be linked.
+        groups: Dict[Tuple[int, int, str], List[str]] = {}
+        for path, digest in hashes.items():
+            file_stat = files[path]
+            groups.setdefault((file_stat.st_dev, file_stat.st_size, digest), []).append(
+                path
+            )
+
+        linked = 0
+        freed = 0
+        for (_, size, _), paths in groups.items():
+            if len(paths) < 2:
+                continue
+            paths.sort()
+            # Link to the inode which already has the most links, that needs the fewest replacements.
+            source = max(paths, key=lambda path: files[path].st_nlink)
+            source_stat = files[source]
+            # An inode is only freed once all of its links were replaced, links outside the mirrors keep it.
+            replaced: Dict[int, int] = {}
+            nlinks: Dict[int, int] = {}
+            for path in paths:
+                path_stat = files[path]
+                if path_stat.st_ino == source_stat.st_ino:
+                    continue
+                if not dry_run:
+                    # The files may have changed since they were hashed, e.g. by a running reposync.
+                    if not self.__unchanged(source, source_stat):
+                        self.logger.warning(
+                            "%s changed since it was hashed, not linking to it", source
+                        )
+                        break
+                    if not self.__unchanged(path, path_stat):
+                        self.logger.warning(
+                            "%s changed since it was hashed, not linking it", path
+                        )
+                        continue
+                    if not self.__link(source, path):
+                        continue
+                    files[path] = os.lstat(path)
+                linked += 1
+                replaced[path_stat.st_ino] = replaced.get(path_stat.st_ino, 0) + 1
+                nlinks[path_stat.st_ino] = path_stat.st_nlink
+            freed += size * sum(
+                1 for inode, count in replaced.items() if count >= nlinks[inode]
+            )
+
+        if not dry_run:
+            filesystem_helpers.write_file(
+                self.index_path,
+                json.dumps(
+                    {
+                        path: [
+                            files[path].st_size,
+                            files[path].st_mtime_ns,
+                            files[path].st_ino,
+                            digest,
+                        ]
+                        for path, digest in hashes.items()
+                    },
+                    sort_keys=True,
+                ),
+            )
+
+        report = {
+            "files": len(files),
+            "hashed": len(to_hash),
+            "linked": linked,
+            "reclaimable" if dry_run else "reclaimed": freed,
+        }
+        if dry_run:
+            self.logger.info(
+                "%d of %d files are duplicates, %d bytes could be reclaimed",
+                linked,
+                len(files),
+                freed,
+            )
         else:
-            hardlink_args = ["-c", "-v"]
-        hardlink_cmd = (
-            [self.hardlink]
-            + hardlink_args
-            + [f"{self.webdir}/distro_mirror", f"{self.webdir}/repo_mirror"]
-        )
-        utils.subprocess_call(hardlink_cmd.copy(), shell=False)
-
-        hardlink_cmd = [
-            self.hardlink,
-            "-c",
-            "-v",
-            f"{self.webdir}/distro_mirror",
-            f"{self.webdir}/repo_mirror",
-        ]
-        return utils.subprocess_call(hardlink_cmd.copy(), shell=False)
+            self.logger.info(
+                "hardlinked %d of %d files, %d bytes reclaimed",
+                linked,
+                len(files),
+                freed,
+            )
+        return report
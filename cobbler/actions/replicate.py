@@ -8,12 +8,14 @@ Replicate from a Cobbler master.
 # SPDX-FileCopyrightText: Scott Henson <shenson@redhat.com>
 
 import fnmatch
+import json
 import logging
 import os
 import xmlrpc.client
-from typing import Optional
+from typing import Dict, Optional
 
 from cobbler import utils
+from cobbler.items import system
 from cobbler.utils import filesystem_helpers
 
 OBJ_TYPES = [
@@ -27,6 +29,32 @@ OBJ_TYPES = [
     "file",
 ]
 
+# The name of the "get_*_since" XML-RPC method of every object type.
+SINCE_METHODS = {
+    "distro": "get_distros_since",
+    "profile": "get_profiles_since",
+    "system": "get_systems_since",
+    "repo": "get_repos_since",
+    "image": "get_images_since",
+    "mgmtclass": "get_mgmtclasses_since",
+    "package": "get_packages_since",
+    "file": "get_files_since",
+}
+
+# Objects are removed children first, so a recursive removal never leaves a stale entry behind.
+REMOVAL_ORDER = [
+    "system",
+    "profile",
+    "image",
+    "distro",
+    "repo",
+    "mgmtclass",
+    "package",
+    "file",
+]
+
+STATE_FILE = "/var/lib/cobbler/replicate_state.json"
+
 
 class Replicate:
     """
@@ -73,7 +101,11 @@ class Replicate:
         self.prune = False
         self.sync_all = False
         self.use_ssl = False
+        self.incremental = False
         self.local = None
+        self.state_path = STATE_FILE
+        # The objects of the master which could not be replicated, as (type, name).
+        self.failed = []
 
     def rsync_it(self, from_path: str, to_path: str, object_type: Optional[str] = None):
         """
@@ -119,6 +151,108 @@ class Replicate:
 
     # -------------------------------------------------------
 
+    def create_objects(
+        self,
+        obj_type: str,
+        remote_objects: list,
+        local_objects: Optional[Dict[str, dict]] = None,
+    ) -> list:
+        """
+        Create local objects from the data of the master and add them to their collection without saving them. Saving
+        an object renders its parent, which already lists all created objects as children, so all of them have to be
+        known before the first one is saved. Each object is added right after it was created, so a new child finds its
+        new parent. The remote objects therefore have to be sorted by depth.
+
+        The network interfaces of systems are checked for duplicates once for all systems instead of once per
+        interface. Systems with conflicts are skipped and all conflicts are logged together. Objects which can't be
+        created are skipped as well and recorded in ``self.failed``.
+
+        :param obj_type: The type of the objects.
+        :param remote_objects: The data of the objects on the master.
+        :param local_objects: The local objects by uid. Objects which exist locally under the same name are already
+                              known to their parents and are not added.
+        :return: The data of the objects on the master with the created objects.
+        """
+        if local_objects is None:
+            local_objects = {}
+        creator = getattr(self.api, f"new_{obj_type}")
+        new_objects = []
+        with system.defer_duplicate_checks():
+            for rdata in remote_objects:
+                newobj = creator()
+                try:
+                    newobj.from_dict(utils.revert_strip_none(rdata))
+                except Exception:
+                    utils.log_exc()
+                    self.__skip(obj_type, [(rdata, newobj)])
+                    continue
+                new_objects.append((rdata, newobj))
+                # Systems are added once all of them were checked for duplicates, they are never parents.
+                if obj_type != "system" and not self.__add_unsaved(
+                    obj_type, rdata, newobj, local_objects
+                ):
+                    new_objects.pop()
+        if obj_type != "system":
+            return new_objects
+
+        duplicates = self.api.systems().find_duplicates(
+            [newobj for _, newobj in new_objects]
+        )
+        conflicting = set()
+        for message, names in duplicates.items():
+            self.logger.error(message)
+            conflicting.update(names)
+        skipped = [
+            (rdata, newobj)
+            for rdata, newobj in new_objects
+            if newobj.name in conflicting
+        ]
+        if skipped:
+            self.logger.error(
+                "skipping %d systems with duplicate network information", len(skipped)
+            )
+            self.__skip(obj_type, skipped)
+        return [
+            (rdata, newobj)
+            for rdata, newobj in new_objects
+            if newobj.name not in conflicting
+            and self.__add_unsaved(obj_type, rdata, newobj, local_objects)
+        ]
+
+    def __add_unsaved(
+        self, obj_type: str, rdata: dict, newobj, local_objects: Dict[str, dict]
+    ) -> bool:
+        """
+        Add a created object to its collection without saving it, unless it exists locally under the same name.
+
+        :param obj_type: The type of the object.
+        :param rdata: The data of the object on the master.
+        :param newobj: The created object.
+        :param local_objects: The local objects by uid.
+        :return: False if the object could not be added and was skipped.
+        """
+        if local_objects.get(rdata.get("uid"), {}).get("name") == rdata["name"]:
+            return True
+        try:
+            self.api.add_item(obj_type, newobj, save=False)
+        except Exception:
+            utils.log_exc()
+            self.__skip(obj_type, [(rdata, newobj)])
+            return False
+        return True
+
+    def __skip(self, obj_type: str, skipped: list):
+        """
+        Record objects which are not replicated and remove them from the children of their parents again.
+
+        :param obj_type: The type of the objects.
+        :param skipped: The data of the objects on the master with the created objects.
+        """
+        self.api.get_items(obj_type).discard_pending([newobj for _, newobj in skipped])
+        self.failed.extend((obj_type, rdata["name"]) for rdata, _ in skipped)
+
+    # -------------------------------------------------------
+
     def add_objects_not_on_local(self, obj_type: str):
         """
         Add objects locally which are not present on the slave but on the master.
@@ -128,24 +262,24 @@ class Replicate:
         local_objects = utils.lod_to_dod(self.local_data[obj_type], "uid")
         remote_objects = utils.lod_sort_by_key(self.remote_data[obj_type], "depth")
 
-        for rdata in remote_objects:
-
-            # do not add the system if it is not on the transfer list
-            if not rdata["name"] in self.must_include[obj_type]:
-                continue
-
-            if not rdata["uid"] in local_objects:
-                creator = getattr(self.api, f"new_{obj_type}")
-                newobj = creator()
-                newobj.from_dict(utils.revert_strip_none(rdata))
-                try:
-                    self.logger.info("adding %s %s", obj_type, rdata["name"])
-                    if not self.api.add_item(obj_type, newobj):
-                        self.logger.error(
-                            "failed to add %s %s", obj_type, rdata["name"]
-                        )
-                except Exception:
-                    utils.log_exc()
+        # do not add the system if it is not on the transfer list
+        remote_objects = [
+            rdata
+            for rdata in remote_objects
+            if rdata["name"] in self.must_include[obj_type]
+            and rdata["uid"] not in local_objects
+        ]
+
+        new_objects = self.create_objects(obj_type, remote_objects)
+        for rdata, newobj in new_objects:
+            try:
+                self.logger.info("adding %s %s", obj_type, rdata["name"])
+                if not self.api.add_item(obj_type, newobj):
+                    self.logger.error("failed to add %s %s", obj_type, rdata["name"])
+                    self.failed.append((obj_type, rdata["name"]))
+            except Exception:
+                utils.log_exc()
+                self.failed.append((obj_type, rdata["name"]))
 
     # -------------------------------------------------------
 
@@ -158,28 +292,29 @@ class Replicate:
         local_objects = utils.lod_to_dod(self.local_data[obj_type], "uid")
         remote_objects = utils.lod_to_dod(self.remote_data[obj_type], "uid")
 
-        for (ruid, rdata) in remote_objects.items():
-            # do not add the system if it is not on the transfer list
-            if rdata["name"] not in self.must_include[obj_type]:
-                continue
-
-            if ruid in local_objects:
-                ldata = local_objects[ruid]
-                if ldata["mtime"] < rdata["mtime"]:
-                    if ldata["name"] != rdata["name"]:
-                        self.logger.info("removing %s %s", obj_type, ldata["name"])
-                        self.api.remove_item(obj_type, ldata["name"], recursive=True)
-                    creator = getattr(self.api, f"new_{obj_type}")
-                    newobj = creator()
-                    newobj.from_dict(utils.revert_strip_none(rdata))
-                    try:
-                        self.logger.info("updating %s %s", obj_type, rdata["name"])
-                        if not self.api.add_item(obj_type, newobj):
-                            self.logger.error(
-                                "failed to update %s %s", obj_type, rdata["name"]
-                            )
-                    except Exception:
-                        utils.log_exc()
+        # do not add the system if it is not on the transfer list
+        remote_objects = [
+            rdata
+            for rdata in utils.lod_sort_by_key(list(remote_objects.values()), "depth")
+            if rdata["name"] in self.must_include[obj_type]
+            and rdata["uid"] in local_objects
+            and local_objects[rdata["uid"]]["mtime"] < rdata["mtime"]
+        ]
+
+        new_objects = self.create_objects(obj_type, remote_objects, local_objects)
+        for rdata, newobj in new_objects:
+            ldata = local_objects[rdata["uid"]]
+            if ldata["name"] != rdata["name"]:
+                self.logger.info("removing %s %s", obj_type, ldata["name"])
+                self.api.remove_item(obj_type, ldata["name"], recursive=True)
+            try:
+                self.logger.info("updating %s %s", obj_type, rdata["name"])
+                if not self.api.add_item(obj_type, newobj):
+                    self.logger.error("failed to update %s %s", obj_type, rdata["name"])
+                    self.failed.append((obj_type, rdata["name"]))
+            except Exception:
+                utils.log_exc()
+                self.failed.append((obj_type, rdata["name"]))
 
     # -------------------------------------------------------
 
@@ -206,57 +341,7 @@ class Replicate:
             self.logger.info("*NOT* Removing Objects Not Stored On Master")
 
         if not self.omit_data:
-            self.logger.info("Rsyncing distros")
-            for distro in self.must_include["distro"]:
-                if self.must_include["distro"][distro] == 1:
-                    self.logger.info("Rsyncing distro %s", distro)
-                    target = self.remote.get_distro(distro)
-                    target_webdir = os.path.join(
-                        self.remote_settings["webdir"], "distro_mirror"
-                    )
-                    tail = filesystem_helpers.path_tail(target_webdir, target["kernel"])
-                    if tail != "":
-                        try:
-                            # path_tail(a,b) returns something that looks like
-                            # an absolute path, but it's really the sub-path
-                            # from a that is contained in b. That means we want
-                            # the first element of the path
-                            dest = os.path.join(
-                                self.settings.webdir,
-                                "distro_mirror",
-                                tail.split("/")[1],
-                            )
-                            self.rsync_it(f"distro-{target['name']}", dest)
-                        except Exception:
-                            self.logger.error("Failed to rsync distro %s", distro)
-                            continue
-                    else:
-                        self.logger.warning(
-                            "Skipping distro %s, as it doesn't appear to live under distro_mirror",
-                            distro,
-                        )
-
-            self.logger.info("Rsyncing repos")
-            for repo in self.must_include["repo"]:
-                if self.must_include["repo"][repo] == 1:
-                    self.rsync_it(
-                        f"repo-{repo}",
-                        os.path.join(self.settings.webdir, "repo_mirror", repo),
-                        "repo",
-                    )
-
-            self.logger.info("Rsyncing distro repo configs")
-            self.rsync_it(
-                "cobbler-distros/config/",
-                os.path.join(self.settings.webdir, "distro_mirror", "config"),
-            )
-            self.logger.info("Rsyncing automatic installation templates & snippets")
-            self.rsync_it("cobbler-templates", self.settings.autoinstall_templates_dir)
-            self.rsync_it("cobbler-snippets", self.settings.autoinstall_snippets_dir)
-            self.logger.info("Rsyncing triggers")
-            self.rsync_it("cobbler-triggers", "/var/lib/cobbler/triggers")
-            self.logger.info("Rsyncing scripts")
-            self.rsync_it("cobbler-scripts", "/var/lib/cobbler/scripts")
+            self.rsync_data()
         else:
             self.logger.info("*NOT* Rsyncing Data")
 
@@ -268,6 +353,168 @@ class Replicate:
         for what in OBJ_TYPES:
             self.replace_objects_newer_on_remote(what)
 
+    def rsync_data(self):
+        """
+        Rsync the trees of the included distros and repos as well as the templates, snippets, triggers and scripts from
+        the master.
+        """
+        self.logger.info("Rsyncing distros")
+        for distro in self.must_include["distro"]:
+            if self.must_include["distro"][distro] == 1:
+                self.logger.info("Rsyncing distro %s", distro)
+                target = self.remote.get_distro(distro)
+                target_webdir = os.path.join(
+                    self.remote_settings["webdir"], "distro_mirror"
+                )
+                tail = filesystem_helpers.path_tail(target_webdir, target["kernel"])
+                if tail != "":
+                    try:
+                        # path_tail(a,b) returns something that looks like
+                        # an absolute path, but it's really the sub-path
+                        # from a that is contained in b. That means we want
+                        # the first element of the path
+                        dest = os.path.join(
+                            self.settings.webdir,
+                            "distro_mirror",
+                            tail.split("/")[1],
+                        )
+                        self.rsync_it(f"distro-{target['name']}", dest)
+                    except Exception:
+                        self.logger.error("Failed to rsync distro %s", distro)
+                        continue
+                else:
+                    self.logger.warning(
+                        "Skipping distro %s, as it doesn't appear to live under distro_mirror",
+                        distro,
+                    )
+
+        self.logger.info("Rsyncing repos")
+        for repo in self.must_include["repo"]:
+            if self.must_include["repo"][repo] == 1:
+                self.rsync_it(
+                    f"repo-{repo}",
+                    os.path.join(self.settings.webdir, "repo_mirror", repo),
+                    "repo",
+                )
+
+        self.logger.info("Rsyncing distro repo configs")
+        self.rsync_it(
+            "cobbler-distros/config/",
+            os.path.join(self.settings.webdir, "distro_mirror", "config"),
+        )
+        self.logger.info("Rsyncing automatic installation templates & snippets")
+        self.rsync_it("cobbler-templates", self.settings.autoinstall_templates_dir)
+        self.rsync_it("cobbler-snippets", self.settings.autoinstall_snippets_dir)
+        self.logger.info("Rsyncing triggers")
+        self.rsync_it("cobbler-triggers", "/var/lib/cobbler/triggers")
+        self.logger.info("Rsyncing scripts")
+        self.rsync_it("cobbler-scripts", "/var/lib/cobbler/scripts")
+
+    def replicate_data_incremental(self, since: float):
+        """
+        Replicate only the objects which changed on the master since the last replication. Deleted objects are detected
+        by comparing the uids of the local objects with the uids on the master. All changes are saved as one batch
+        which is followed by a single sync of the affected systems.
+
+        :param since: The modification time of the master at the last replication.
+        """
+        self.remote_settings = self.remote.get_settings()
+        self.logger.info("Querying objects changed on master since %s", since)
+        remote_uids = {}
+        for what in OBJ_TYPES:
+            self.remote_data[what] = getattr(self.remote, SINCE_METHODS[what])(since)
+            remote_uids[what] = set(self.remote.get_item_uids(what))
+            self.local_data[what] = self.local.get_items(
+                what, ["uid", "name", "mtime", "depth"]
+            )
+
+        self.generate_include_map()
+        # Objects which were replicated before are kept up to date, even if nothing that depends on them changed.
+        for what in OBJ_TYPES:
+            local_uids = {ldata["uid"] for ldata in self.local_data[what]}
+            for rdata in self.remote_data[what]:
+                if rdata["uid"] in local_uids:
+                    self.must_include[what][rdata["name"]] = 1
+
+        removals = []
+        if self.prune:
+            self.logger.info("Removing Objects Not Stored On Master")
+            for what in REMOVAL_ORDER:
+                if what == "system" and len(self.system_patterns) == 0:
+                    continue
+                for ldata in utils.lod_sort_by_key(self.local_data[what], "depth")[
+                    ::-1
+                ]:
+                    if ldata["uid"] not in remote_uids[what]:
+                        self.logger.info("removing %s %s", what, ldata["name"])
+                        removals.append((what, ldata["name"], True))
+        else:
+            self.logger.info("*NOT* Removing Objects Not Stored On Master")
+
+        if not self.omit_data:
+            self.rsync_data()
+        else:
+            self.logger.info("*NOT* Rsyncing Data")
+
+        self.logger.info("Updating Objects Changed On Master")
+        items = []
+        for what in OBJ_TYPES:
+            local_objects = utils.lod_to_dod(self.local_data[what], "uid")
+            remote_objects = [
+                rdata
+                for rdata in utils.lod_sort_by_key(self.remote_data[what], "depth")
+                if rdata["name"] in self.must_include[what]
+                and (
+                    rdata["uid"] not in local_objects
+                    or local_objects[rdata["uid"]]["mtime"] < rdata["mtime"]
+                )
+            ]
+            new_objects = self.create_objects(what, remote_objects, local_objects)
+            for rdata, newobj in new_objects:
+                ldata = local_objects.get(rdata["uid"])
+                if ldata is not None and ldata["name"] != rdata["name"]:
+                    self.logger.info("removing %s %s", what, ldata["name"])
+                    removals.append((what, ldata["name"], True))
+                self.logger.info("replicating %s %s", what, rdata["name"])
+                items.append(newobj)
+
+        if not items and not removals:
+            self.logger.info("Nothing changed on master")
+            return
+        self.api.save_batch(items, removals)
+        for ref in items:
+            if ref.COLLECTION_TYPE == "distro":
+                ref.link_distro()
+
+    def load_state(self) -> Dict[str, float]:
+        """
+        Read the modification times of the masters at their last replication.
+
+        :return: The modification time per master URI.
+        """
+        try:
+            with open(self.state_path, encoding="UTF-8") as state_fd:
+                return json.load(state_fd)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            self.logger.warning(
+                'Ignoring unreadable replication state "%s": %s', self.state_path, error
+            )
+            return {}
+
+    def save_state(self, master_mtime: float):
+        """
+        Record the modification time of the master this replication started from.
+
+        :param master_mtime: The modification time of the master.
+        """
+        state = self.load_state()
+        state[self.uri] = master_mtime
+        filesystem_helpers.write_file(
+            self.state_path, json.dumps(state, sort_keys=True, indent=1)
+        )
+
     def link_distros(self):
         """
         Link a distro from its location into the web directory to make it available for usage.
@@ -276,6 +523,23 @@ class Replicate:
             self.logger.debug("Linking Distro %s", distro.name)
             distro.link_distro()
 
+    def __remote_item(self, obj_type: str, name: str) -> dict:
+        """
+        Get the data of an object on the master. Objects which were not queried yet, e.g. unchanged parents during an
+        incremental replication, are fetched on demand.
+
+        :param obj_type: The type of the object.
+        :param name: The name of the object.
+        :return: The data of the object or an empty dict if it does not exist on the master.
+        """
+        if name not in self.remote_dict[obj_type]:
+            rdata = self.remote.get_item(obj_type, name)
+            if not isinstance(rdata, dict):
+                return {}
+            self.remote_dict[obj_type][name] = rdata
+            self.remote_data[obj_type].append(rdata)
+        return self.remote_dict[obj_type][name]
+
     def generate_include_map(self):
         """
         Method that generates the information that is required to perform the replicate option.
@@ -313,7 +577,7 @@ class Replicate:
             # include all profiles that systems require whether they are explicitly included or not
             self.logger.debug("* Adding Profiles Required By Systems")
             for sys in self.must_include["system"]:
-                pro = self.remote_dict["system"][sys].get("profile", "")
+                pro = self.__remote_item("system", sys).get("profile", "")
                 self.logger.debug("?: system %s requires profile %s.", sys, pro)
                 if pro != "":
                     self.logger.debug("Adding profile %s for system %s.", pro, sys)
@@ -325,7 +589,7 @@ class Replicate:
             while True:
                 loop_exit = True
                 for pro in self.must_include["profile"]:
-                    parent = self.remote_dict["profile"][pro].get("parent", "")
+                    parent = self.__remote_item("profile", pro).get("parent", "")
                     if parent != "":
                         if parent not in self.must_include["profile"]:
                             self.logger.debug(
@@ -340,7 +604,7 @@ class Replicate:
             # or not
             self.logger.debug("* Adding Distros Required By Profiles")
             for profile_for_distro in self.must_include["profile"]:
-                distro = self.remote_dict["profile"][profile_for_distro].get(
+                distro = self.__remote_item("profile", profile_for_distro).get(
                     "distro", ""
                 )
                 if not distro == "<<inherit>>" and not distro == "~":
@@ -353,7 +617,7 @@ class Replicate:
             # or not
             self.logger.debug("* Adding Repos Required By Profiles")
             for profile_for_repo in self.must_include["profile"]:
-                repos = self.remote_dict["profile"][profile_for_repo].get("repos", [])
+                repos = self.__remote_item("profile", profile_for_repo).get("repos", [])
                 if repos != "<<inherit>>":
                     for repo in repos:
                         self.logger.debug(
@@ -364,7 +628,7 @@ class Replicate:
             # include all images that systems require whether they are explicitly included or not
             self.logger.debug("* Adding Images Required By Systems")
             for sys in self.must_include["system"]:
-                img = self.remote_dict["system"][sys].get("image", "")
+                img = self.__remote_item("system", sys).get("image", "")
                 self.logger.debug("?: system %s requires image %s.", sys, img)
                 if img != "":
                     self.logger.debug("Adding image %s for system %s.", img, sys)
@@ -388,6 +652,7 @@ class Replicate:
         omit_data: bool = False,
         sync_all: bool = False,
         use_ssl: bool = False,
+        incremental: bool = False,
     ):
         """
         Get remote profiles and distros and sync them locally
@@ -406,6 +671,8 @@ class Replicate:
         :param omit_data: If the data behind images etc should be omitted or not.
         :param sync_all: If everything should be synced (then the patterns are useless) or not.
         :param use_ssl: If HTTPS or HTTP should be used.
+        :param incremental: Only replicate the objects which changed on the master since the last replication from it.
+                            The first replication from a master is always a full one.
         """
 
         self.port = str(port)
@@ -429,6 +696,7 @@ class Replicate:
         self.prune = prune
         self.sync_all = sync_all
         self.use_ssl = use_ssl
+        self.incremental = incremental
 
         if self.use_ssl:
             protocol = "https"
@@ -457,6 +725,7 @@ class Replicate:
         self.logger.info("omit_data           = %s", self.omit_data)
         self.logger.info("sync_all            = %s", self.sync_all)
         self.logger.info("use_ssl             = %s", self.use_ssl)
+        self.logger.info("incremental         = %s", self.incremental)
 
         self.logger.info("XMLRPC endpoint: %s", self.uri)
         self.logger.debug("test ALPHA")
@@ -468,8 +737,25 @@ class Replicate:
         )
         self.local.ping()
 
-        self.replicate_data()
-        self.link_distros()
-        self.logger.info("Syncing")
-        self.api.sync()
+        # Taken before querying, so changes made on the master during the replication are picked up next time.
+        master_mtime = self.remote.last_modified_time()
+        since = self.load_state().get(self.uri) if self.incremental else None
+        if since is not None:
+            self.replicate_data_incremental(since)
+        else:
+            if self.incremental:
+                self.logger.info("No previous replication from this master found")
+            self.replicate_data()
+            self.link_distros()
+            self.logger.info("Syncing")
+            self.api.sync()
+        if self.failed:
+            # Otherwise the next incremental replication would not try these objects again.
+            self.logger.warning(
+                "Not recording the replication state, %d objects were not replicated: %s",
+                len(self.failed),
+                ", ".join(f"{obj_type} {name}" for obj_type, name in self.failed),
+            )
+        else:
+            self.save_state(master_mtime)
         self.logger.info("Done")
@@ -7,11 +7,21 @@ Reports on automatic installation activity by examining the logs in
 # SPDX-FileCopyrightText: Copyright 2007-2009, Red Hat, Inc and Others
 # SPDX-FileCopyrightText: Michael DeHaan <michael.dehaan AT gmail>
 
+import copy
 import glob
 import gzip
+import json
+import logging
+import os
 import re
+import threading
 import time
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
+
+from cobbler.utils import filesystem_helpers
+
+INSTALL_LOG = "/var/log/cobbler/install.log"
+STATUS_INDEX_FILE = "/var/lib/cobbler/install_status.json"
 
 
 class InstallStatus:
@@ -48,6 +58,29 @@ class InstallStatus:
             )
         return False
 
+    def record(
+        self, profile_or_system: str, name: str, start_or_stop: str, timestamp: float
+    ):
+        """
+        Record a start or stop of an installation. Recording the same event twice has no effect.
+
+        :param profile_or_system: This can be ``system`` or ``profile``.
+        :param name: The name of the object.
+        :param start_or_stop: This parameter may be ``start`` or ``stop``
+        :param timestamp: Timestamp as returned by ``time.time()``
+        """
+        if start_or_stop == "start":
+            if self.most_recent_start < timestamp:
+                self.most_recent_start = timestamp
+                self.most_recent_target = f"{profile_or_system}:{name}"
+                self.seen_start += 1
+
+        if start_or_stop == "stop":
+            if self.most_recent_stop < timestamp:
+                self.most_recent_stop = timestamp
+                self.most_recent_target = f"{profile_or_system}:{name}"
+                self.seen_stop += 1
+
 
 class CobblerStatusReport:
     """
@@ -62,6 +95,7 @@ class CobblerStatusReport:
         :param mode: This describes how Cobbler should report. Currently, there only the option ``text`` can be set
                      explicitly.
         """
+        self.api = api
         self.settings = api.settings()
         self.ip_data: Dict[str, InstallStatus] = {}
         self.mode = mode
@@ -130,29 +164,9 @@ class CobblerStatusReport:
         """
         if ip_address not in self.ip_data:
             self.ip_data[ip_address] = InstallStatus()
-        elem = self.ip_data[ip_address]
-
-        timestamp = float(timestamp)
-
-        mrstart = elem.most_recent_start
-        mrstop = elem.most_recent_stop
-        mrtarg = elem.most_recent_target
-
-        if start_or_stop == "start":
-            if mrstart < timestamp:
-                mrstart = timestamp
-                mrtarg = f"{profile_or_system}:{name}"
-                elem.seen_start += 1
-
-        if start_or_stop == "stop":
-            if mrstop < timestamp:
-                mrstop = timestamp
-                mrtarg = f"{profile_or_system}:{name}"
-                elem.seen_stop += 1
-
-        elem.most_recent_start = mrstart
-        elem.most_recent_stop = mrstop
-        elem.most_recent_target = mrtarg
+        self.ip_data[ip_address].record(
+            profile_or_system, name, start_or_stop, float(timestamp)
+        )
 
     def process_results(self) -> dict:
         """
@@ -208,8 +222,173 @@ class CobblerStatusReport:
         """
         Calculate and print a automatic installation status report.
         """
-        self.scan_logfiles()
+        self.ip_data = self.api.install_status.snapshot()
         results = self.process_results()
         if self.mode == "text":
             return self.get_printable_results()
         return results
+
+
+class InstallStatusIndex:
+    """
+    Keeps the installation status of all ips up to date by reading only the lines which were appended to the install
+    log since the last update. The status and the position in the log are persisted, so the index resumes after a
+    restart instead of scanning all logs again.
+    """
+
+    def __init__(self, api):
+        """
+        Constructor
+
+        :param api: The API which holds all information.
+        """
+        self.api = api
+        self.logger = logging.getLogger()
+        self.index_path = STATUS_INDEX_FILE
+        self.logfile = INSTALL_LOG
+        self.ip_data: Dict[str, InstallStatus] = {}
+        # The inode of the log the offset belongs to, a rotated log gets a new inode.
+        self.inode: Optional[int] = None
+        self.offset = 0
+        self.__loaded = False
+        self.__lock = threading.Lock()
+
+    def __load(self):
+        """
+        Load the persisted index. If there is none, all install logs are scanned once.
+        """
+        try:
+            with open(self.index_path, encoding="UTF-8") as index_fd:
+                data = json.load(index_fd)
+            self.inode = data["inode"]
+            self.offset = data["offset"]
+            self.ip_data = {}
+            for ip_address, values in data["ip_data"].items():
+                elem = InstallStatus()
+                elem.__dict__.update(values)
+                self.ip_data[ip_address] = elem
+            return
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, AttributeError) as error:
+            self.logger.warning(
+                'Ignoring unreadable install status index "%s": %s',
+                self.index_path,
+                error,
+            )
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Scan all install logs and start following the current one from its end.
+        """
+        try:
+            log_stat = os.stat(self.logfile)
+            self.inode, self.offset = log_stat.st_ino, log_stat.st_size
+        except FileNotFoundError:
+            self.inode, self.offset = None, 0
+        # Lines appended during the scan are read again by the next update, recording them twice has no effect.
+        report = CobblerStatusReport(self.api, "normal")
+        report.scan_logfiles()
+        self.ip_data = report.ip_data
+        self.save()
+
+    def save(self):
+        """
+        Persist the status and the position in the log.
+        """
+        filesystem_helpers.write_file(
+            self.index_path,
+            json.dumps(
+                {
+                    "inode": self.inode,
+                    "offset": self.offset,
+                    "ip_data": {
+                        ip_address: {
+                            key: value
+                            for key, value in elem.__dict__.items()
+                            if key != "state"
+                        }
+                        for ip_address, elem in self.ip_data.items()
+                    },
+                },
+                sort_keys=True,
+            ),
+        )
+
+    def __consume(self, fname: str, offset: int) -> int:
+        """
+        Record the complete lines of a log starting at a byte offset.
+
+        :param fname: The log to read.
+        :param offset: The byte offset to start at.
+        :return: The offset after the last complete line.
+        """
+        with open(fname, "rb") as log_fd:
+            log_fd.seek(offset)
+            data = log_fd.read()
+        # A line which is still being written is read with the next update.
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("UTF-8", errors="replace").split("\n"):
+            tokens = line.split()
+            if len(tokens) != 5:
+                continue
+            (profile_or_system, name, ip_address, start_or_stop, timestamp) = tokens
+            if ip_address not in self.ip_data:
+                self.ip_data[ip_address] = InstallStatus()
+            self.ip_data[ip_address].record(
+                profile_or_system, name, start_or_stop, float(timestamp)
+            )
+        return offset + end
+
+    def refresh(self):
+        """
+        Read the lines which were appended to the install log since the last update. If the log was rotated, the rest
+        of the rotated log is read first as long as it is not compressed yet.
+        """
+        with self.__lock:
+            if not self.__loaded:
+                self.__load()
+                self.__loaded = True
+            inode, offset = self.inode, self.offset
+            try:
+                log_stat: Optional[os.stat_result] = os.stat(self.logfile)
+            except FileNotFoundError:
+                log_stat = None
+            if self.inode is not None and (
+                log_stat is None or log_stat.st_ino != self.inode
+            ):
+                for fname in CobblerStatusReport.collect_logfiles():
+                    if fname.endswith(".gz") or fname == self.logfile:
+                        continue
+                    if os.stat(fname).st_ino == self.inode:
+                        self.__consume(fname, self.offset)
+                        self.inode, self.offset = None, 0
+                        break
+                else:
+                    # The log was deleted instead of rotated, its entries must not be reported anymore.
+                    self.rebuild()
+                    return
+            if log_stat is not None:
+                if log_stat.st_size < self.offset:
+                    # The log was truncated, the entries of the old content are gone as well.
+                    self.rebuild()
+                    return
+                if self.inode is None:
+                    self.inode, self.offset = log_stat.st_ino, 0
+                if log_stat.st_size > self.offset:
+                    self.offset = self.__consume(self.logfile, self.offset)
+            if (inode, offset) != (self.inode, self.offset):
+                self.save()
+
+    def snapshot(self) -> Dict[str, InstallStatus]:
+        """
+        Bring the index up to date and return a copy of it.
+
+        :return: The installation status per ip.
+        """
+        self.refresh()
+        with self.__lock:
+            return {
+                ip_address: copy.copy(elem) for ip_address, elem in self.ip_data.items()
+            }
@@ -8,16 +8,121 @@ This is the code behind 'cobbler sync'.
 # SPDX-FileCopyrightText: Michael DeHaan <michael.dehaan AT gmail>
 
 import glob
+import hashlib
+import json
 import logging
 import os
 import time
-from typing import Optional, List
+from typing import Any, Dict, List, Optional
 
 from cobbler.cexceptions import CX
 from cobbler import templar
 from cobbler import tftpgen
 from cobbler import utils
-from cobbler.utils import filesystem_helpers
+from cobbler.utils import filesystem_helpers, thread
+
+
+class SyncManifest:
+    """
+    Records the files a sync generated, grouped by the object they were generated for, together with a fingerprint of
+    the inputs they were generated from. Entries with a key of the form ``<type>:<name>`` belong to a single object, all
+    other keys belong to a sync step like the PXE menu or the DHCP configuration.
+    """
+
+    def __init__(self, path: str):
+        """
+        Constructor
+
+        :param path: The file the manifest is loaded from and saved to.
+        """
+        self.logger = logging.getLogger()
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.previous: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(path, encoding="UTF-8") as manifest_fd:
+                self.previous = json.load(manifest_fd)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as error:
+            self.logger.warning(
+                'Ignoring unreadable sync manifest "%s": %s', path, error
+            )
+
+    @staticmethod
+    def fingerprint(data: Any) -> str:
+        """
+        Calculate a fingerprint of the inputs of a generated file.
+
+        :param data: Any JSON serializable data. Values which are not serializable are converted to strings.
+        :return: The SHA256 of the data.
+        """
+        return hashlib.sha256(
+            json.dumps(data, sort_keys=True, default=str).encode("UTF-8")
+        ).hexdigest()
+
+    def is_current(self, key: str, inputs: str) -> bool:
+        """
+        Check if the files of an object are up to date.
+
+        :param key: The key of the object.
+        :param inputs: The fingerprint of the current inputs of the object.
+        :return: True if the inputs did not change since the files were generated and none of the files was modified or
+                 removed since.
+        """
+        entry = self.previous.get(key)
+        if entry is None or entry["inputs"] != inputs:
+            return False
+        return all(
+            filesystem_helpers.file_fingerprint(path) == fingerprint
+            for path, fingerprint in entry["files"].items()
+        )
+
+    def keep(self, key: str):
+        """
+        Take over the entry of an object whose files are up to date from the previous sync. Nothing happens if the
+        previous sync did not record the object.
+
+        :param key: The key of the object.
+        """
+        if key in self.previous:
+            self.entries[key] = self.previous[key]
+
+    def update(self, key: str, inputs: Optional[str], files: Dict[str, str]):
+        """
+        Record the files which were generated for an object or a sync step.
+
+        :param key: The key of the object or sync step.
+        :param inputs: The fingerprint of the inputs of the object or None if the files are always regenerated.
+        :param files: The generated files and their fingerprints as recorded by ``filesystem_helpers.track_writes()``.
+        """
+        self.entries[key] = {"inputs": inputs, "files": files}
+
+    def orphans(self) -> List[str]:
+        """
+        Determine the files which were generated by the previous sync but not by this one. The files of sync steps which
+        were not executed this time are not considered orphaned.
+
+        :return: The sorted list of orphaned files.
+        """
+        for key, entry in self.previous.items():
+            if ":" not in key and key not in self.entries:
+                self.entries[key] = entry
+        current = set()
+        for entry in self.entries.values():
+            current.update(entry["files"])
+        previous = set()
+        for entry in self.previous.values():
+            previous.update(entry["files"])
+        return sorted(previous - current)
+
+    def save(self):
+        """
+        Save the manifest. The file is only written if the manifest changed.
+        """
+        filesystem_helpers.write_file(
+            self.path, json.dumps(self.entries, sort_keys=True, indent=1)
+        )
 
 
 class CobblerSync:
@@ -62,6 +167,7 @@ class CobblerSync:
         self.distromirror_config = os.path.join(
             self.settings.webdir, "distro_mirror/config"
         )
+        self.manifest_path = "/var/lib/cobbler/sync_manifest.json"
         filesystem_helpers.create_tftpboot_dirs(self.api)
         filesystem_helpers.create_web_dirs(self.api)
 
@@ -111,41 +217,57 @@ class CobblerSync:
         utils.run_triggers(self.api, None, "/var/lib/cobbler/triggers/sync/post/*")
         utils.run_triggers(self.api, None, "/var/lib/cobbler/triggers/change/*")
 
-    def run(self):
+    def run(self, incremental: bool = False):
         """
         Syncs the current configuration file with the config tree.
         Using the ``Check().run_`` functions previously is recommended
+
+        :param incremental: If True the existing trees are not cleaned. Only the files of objects whose inputs changed
+                            are regenerated, files are only written if their content changed and only files which are
+                            not generated anymore are removed.
         """
         self.__common_run()
+        manifest = SyncManifest(self.manifest_path)
 
         # execute the core of the sync operation
-        self.logger.info("cleaning trees")
-        self.clean_trees()
-
-        # Have the tftpd module handle copying bootloaders, distros, images, and all_system_files
-        self.tftpd.sync(self.verbose)
-        # Copy distros to the webdir
-        # Adding in the exception handling to not blow up if files have been moved (or the path references an NFS
-        # directory that's no longer mounted)
-        for distro in self.distros:
-            try:
-                self.logger.info("copying files for distro: %s", distro.name)
-                self.tftpgen.copy_single_distro_files(
-                    distro, self.settings.webdir, True
-                )
-                self.tftpgen.write_templates(distro, write_file=True)
-            except CX as cobbler_exception:
-                self.logger.error(cobbler_exception.value)
+        if incremental:
+            self.logger.info("incremental sync, keeping trees")
+        else:
+            self.logger.info("cleaning trees")
+            self.clean_trees()
+
+        # The link cache keeps file hashes and device lookups in memory and writes its databases once at the end.
+        with filesystem_helpers.link_cache():
+            # Have the tftpd module handle copying bootloaders, distros, images, and all_system_files
+            self.tftpd.sync(self.verbose, manifest=manifest)
+            # Copy distros to the webdir
+            distros = list(self.distros)
+            distro_files = thread.run_workers(
+                self.api, self.__copy_distro_to_webdir, distros
+            )
+        for distro, files in zip(distros, distro_files):
+            manifest.update(f"distro:{distro.name}", None, files)
 
+        # The workers are done at this point, so the menu, DHCP and DNS see the complete tree.
         # make the default pxe menu anyway...
-        self.tftpgen.make_pxe_menu()
+        with filesystem_helpers.track_writes() as files:
+            self.tftpgen.make_pxe_menu()
+        manifest.update("menu", None, files)
 
         if self.settings.manage_dhcp:
-            self.write_dhcp()
+            with filesystem_helpers.track_writes() as files:
+                self.write_dhcp()
+            manifest.update("dhcp", None, files)
         if self.settings.manage_dns:
             self.logger.info("rendering DNS files")
-            self.dns.regen_hosts()
-            self.dns.write_configs()
+            with filesystem_helpers.track_writes() as files:
+                self.dns.regen_hosts()
+                self.dns.write_configs()
+            manifest.update("dns", None, files)
+
+        for orphan in manifest.orphans():
+            filesystem_helpers.rmfile(orphan)
+        manifest.save()
 
         if self.settings.manage_tftpd:
             # copy in boot_files
@@ -163,6 +285,26 @@ class CobblerSync:
         utils.run_triggers(self.api, None, "/var/lib/cobbler/triggers/sync/post/*")
         utils.run_triggers(self.api, None, "/var/lib/cobbler/triggers/change/*")
 
+    def __copy_distro_to_webdir(self, distro) -> Dict[str, str]:
+        """
+        Copy the files of a single distro to the webdir and write its templates.
+
+        :param distro: The distro to copy.
+        :return: The written template files and their fingerprints.
+        """
+        # Adding in the exception handling to not blow up if files have been moved (or the path references an NFS
+        # directory that's no longer mounted)
+        with filesystem_helpers.track_writes() as files:
+            try:
+                self.logger.info("copying files for distro: %s", distro.name)
+                self.tftpgen.copy_single_distro_files(
+                    distro, self.settings.webdir, True
+                )
+                self.tftpgen.write_templates(distro, write_file=True)
+            except CX as cobbler_exception:
+                self.logger.error(cobbler_exception.value)
+        return files
+
     def clean_trees(self):
         """
         Delete any previously built pxelinux.cfg tree and virt tree info and then create directories.
@@ -14,7 +14,7 @@ import tempfile
 import threading
 from configparser import ConfigParser
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from schema import SchemaError
 
@@ -140,6 +140,8 @@ class CobblerAPI:
             self.autoinstallgen = autoinstallgen.AutoInstallationGen(self)
             self.yumgen = yumgen.YumGen(self)
             self.tftpgen = tftpgen.TFTPGen(self)
+            self.power_status_poller = power_manager.PowerStatusPoller(self)
+            self.install_status = status.InstallStatusIndex(self)
             self.__directory_startup_preparations()
             self.logger.debug("API handle initialized")
             self.perms_ok = True
@@ -1109,6 +1111,130 @@ class CobblerAPI:
             save=save,
         )
 
+    def import_systems(self, systems: List[dict], save: bool = True) -> list:
+        """
+        Create and add many systems at once. The network interfaces of all systems are checked for duplicates in a
+        single pass before any system is added, so either all systems are added or none.
+
+        :param systems: The dictionaries of the systems as returned by ``to_dict()``.
+        :param save: If the systems should be persisted.
+        :return: The added systems.
+        :raises ValueError: Raised with all conflicts in case network interfaces are duplicates.
+        """
+        self.log("import_systems", [len(systems)])
+        refs = []
+        with system.defer_duplicate_checks():
+            for system_dict in systems:
+                ref = self.new_system()
+                ref.from_dict(system_dict)
+                refs.append(ref)
+        duplicates = self.systems().find_duplicates(refs)
+        if duplicates:
+            self.systems().discard_pending(refs)
+            raise ValueError("\n".join(duplicates))
+        if save:
+            self.save_batch(refs)
+        else:
+            for ref in refs:
+                self.add_system(ref, save=False)
+        return refs
+
+    def transaction(self):
+        """
+        Group multiple saves and deletes of items into one transaction of the serializer.
+
+        :return: A context manager, see :meth:`~cobbler.serializer.Serializer.transaction`.
+        """
+        return self._collection_mgr.transaction()
+
+    def save_batch(
+        self, items: list, removals: Optional[List[Tuple[str, str, bool]]] = None
+    ) -> List[str]:
+        """
+        Save many new or modified items and remove items in a single transaction of the serializer. The items must be
+        validated by the caller. The add and delete triggers run for every item, the change triggers only once for the
+        whole batch. Instead of one sync per item a single ``sync_systems()`` runs for all affected systems.
+
+        :param items: The items to add. Items with the name of an existing item replace it.
+        :param removals: The type, name and the recursive flag of every item to remove.
+        :return: The names of the synced systems.
+        """
+        if removals is None:
+            removals = []
+        self.log("save_batch", [len(items), len(removals)])
+
+        removed_items = [
+            (what, self.get_item(what, name), recursive)
+            for what, name, recursive in removals
+        ]
+        # Failing pre triggers stop the batch before anything is changed.
+        for what, ref, _ in removed_items:
+            utils.run_triggers(
+                self, ref, f"/var/lib/cobbler/triggers/delete/{what}/pre/*", []
+            )
+        for ref in items:
+            utils.run_triggers(
+                self,
+                ref,
+                f"/var/lib/cobbler/triggers/add/{ref.COLLECTION_TYPE}/pre/*",
+                [],
+            )
+
+        with self.transaction():
+            for what, ref, recursive in removed_items:
+                self.remove_item(what, ref, recursive=recursive, with_triggers=False)
+            # All items are known before the first one is saved, since saving an item renders its parent which already
+            # lists all new items as children.
+            for ref in items:
+                self.get_items(ref.COLLECTION_TYPE).add(ref)
+            for ref in items:
+                self.get_items(ref.COLLECTION_TYPE).add(
+                    ref, save=True, with_triggers=False, with_sync=False
+                )
+
+        lite_sync = self.get_sync()
+        synced_systems: List[str] = []
+        rebuild_menu = False
+        for ref in items:
+            if ref.COLLECTION_TYPE == "system":
+                # we don't need openvz containers to be network bootable
+                if ref.virt_type == "openvz":
+                    ref.netboot_enabled = False
+                synced_systems.append(ref.name)
+            elif ref.COLLECTION_TYPE == "profile":
+                lite_sync.add_single_profile(ref.name, rebuild_menu=False)
+                synced_systems.extend(
+                    child
+                    for child in ref.get_children()
+                    if self.find_system(name=child) is not None
+                )
+                rebuild_menu = True
+            elif ref.COLLECTION_TYPE == "distro":
+                lite_sync.add_single_distro(ref.name)
+            elif ref.COLLECTION_TYPE == "image":
+                lite_sync.add_single_image(ref.name)
+        if rebuild_menu:
+            self.tftpgen.make_pxe_menu()
+        synced_systems = sorted(set(synced_systems))
+        if synced_systems:
+            # This runs the change triggers as well.
+            self.sync_systems(synced_systems)
+        else:
+            utils.run_triggers(self, None, "/var/lib/cobbler/triggers/change/*", [])
+
+        for ref in items:
+            utils.run_triggers(
+                self,
+                ref,
+                f"/var/lib/cobbler/triggers/add/{ref.COLLECTION_TYPE}/post/*",
+                [],
+            )
+        for what, ref, _ in removed_items:
+            utils.run_triggers(
+                self, ref, f"/var/lib/cobbler/triggers/delete/{what}/post/*", []
+            )
+        return synced_systems
+
     def add_repo(self, ref, check_for_duplicate_names: bool = False, save: bool = True):
         """
         Add a repository to Cobbler.
@@ -1808,7 +1934,12 @@ class CobblerAPI:
 
     # ==========================================================================
 
-    def sync(self, verbose: bool = False, what: Optional[list] = None):
+    def sync(
+        self,
+        verbose: bool = False,
+        what: Optional[list] = None,
+        incremental: bool = False,
+    ):
         """
         Take the values currently written to the configuration files in /etc, and /var, and build out the information
         tree found in /tftpboot. Any operations done in the API that have not been saved with serialize() will NOT be
@@ -1816,12 +1947,14 @@ class CobblerAPI:
 
         :param verbose: If the action should be just logged as needed or (if True) as much verbose as possible.
         :param what:   List of strings what services to sync (e.g. dhcp and/or dns). Empty list for full sync.
+        :param incremental: Only regenerate the files of changed objects instead of rebuilding the complete tree. Only
+                            used for a full sync.
         """
         # Empty what: Full sync
         if not what:
             self.logger.info("syncing all")
             sync_obj = self.get_sync(verbose=verbose)
-            sync_obj.run()
+            sync_obj.run(incremental=incremental)
             return
         # Non empty what: Specific sync
         if not isinstance(what, list):
@@ -2138,14 +2271,15 @@ class CobblerAPI:
 
     # ==========================================================================
 
-    def hardlink(self):
+    def hardlink(self, dry_run: bool = False) -> dict:
         """
         Hardlink all files where this is possible to improve performance.
 
-        :return: The return code of the subprocess call which actually hardlinks the files.
+        :param dry_run: If True, nothing is linked and only the space which could be reclaimed is reported.
+        :return: The report of the run, see :meth:`~cobbler.actions.hardlink.HardLinker.run`.
         """
         linker = hardlink.HardLinker(api=self)
-        return linker.run()
+        return linker.run(dry_run=dry_run)
 
     # ==========================================================================
 
@@ -2165,6 +2299,7 @@ class CobblerAPI:
         omit_data: bool = False,
         sync_all: bool = False,
         use_ssl: bool = False,
+        incremental: bool = False,
     ):
         """
         Pull down data/configs from a remote Cobbler server that is a master to this server.
@@ -2185,6 +2320,8 @@ class CobblerAPI:
         :param sync_all: This parameter behaves similarly to a dry run argument. If True then everything will executed,
                          if False then only some things are synced.
         :param use_ssl: Whether SSL should be used (True) or not (False).
+        :param incremental: Whether only the objects which changed on the master since the last replication should be
+                            replicated.
         """
         replicator = replicate.Replicate(self)
         return replicator.run(
@@ -2202,6 +2339,7 @@ class CobblerAPI:
             omit_data=omit_data,
             sync_all=sync_all,
             use_ssl=use_ssl,
+            incremental=incremental,
         )
 
     # ==========================================================================
@@ -2265,6 +2403,36 @@ class CobblerAPI:
             )
         return None
 
+    def power_systems(
+        self,
+        systems: list,
+        power_operation: str,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+    ) -> Dict[str, dict]:
+        """
+        Power on / power off / get power status / reboot many systems concurrently.
+
+        :param systems: Cobbler systems
+        :param power_operation: power operation. Valid values: on, off, reboot, status
+        :param user: power management user
+        :param password: power management password
+        :return: The result per system name, see :meth:`~cobbler.power_manager.PowerManager.power_systems`.
+        """
+        power_mgr = power_manager.PowerManager(self)
+        return power_mgr.power_systems(
+            systems, power_operation, user=user, password=password
+        )
+
+    def get_power_states(self, names: Optional[List[str]] = None) -> Dict[str, dict]:
+        """
+        Get the power states of systems as last polled by cobblerd. No fence agent is run.
+
+        :param names: The names of the systems. If None, the states of all polled systems are returned.
+        :return: The state per system name, see :meth:`~cobbler.power_manager.PowerStatusPoller.get_states`.
+        """
+        return self.power_status_poller.get_states(names)
+
     # ==========================================================================
 
     def clear_logs(self, system):
@@ -133,6 +133,7 @@ class AutoInstallationManager:
 
         with open(file_full_path, "w+", encoding="UTF-8") as fileh:
             fileh.write(data)
+        autoinstallgen.invalidate_render_cache()
 
         return True
 
@@ -150,6 +151,7 @@ class AutoInstallationManager:
         file_full_path = f"{self.templates_base_dir}/{file_path}"
         if not self.is_autoinstall_in_use(file_path):
             os.remove(file_full_path)
+            autoinstallgen.invalidate_render_cache()
         else:
             utils.die("attempt to delete in-use file")
 
@@ -240,6 +242,7 @@ class AutoInstallationManager:
 
         with open(file_full_path, "w+", encoding="UTF-8") as fileh:
             fileh.write(data)
+        autoinstallgen.invalidate_render_cache()
 
     def remove_autoinstall_snippet(self, file_path: str) -> bool:
         """
@@ -252,6 +255,7 @@ class AutoInstallationManager:
 
         file_full_path = f"{self.snippets_base_dir}/{file_path}"
         os.remove(file_full_path)
+        autoinstallgen.invalidate_render_cache()
 
         return True
 
@@ -6,14 +6,70 @@ Builds out filesystem trees/data based on the object tree. This is the code behi
 # SPDX-FileCopyrightText: Copyright 2006-2009, Red Hat, Inc and Others
 # SPDX-FileCopyrightText: Michael DeHaan <michael.dehaan AT gmail>
 
+import hashlib
+import json
 import urllib.parse
 import xml.dom.minidom
+from typing import Dict, Optional, Tuple
 
 from cobbler import templar
+from cobbler import template_api
 from cobbler import utils
 from cobbler import validate
 from cobbler.cexceptions import CX
 
+# Rendered automatic installation files keyed by the type and uid of the object. Each entry holds the digest of the
+# template variables, the fingerprints of the template and all snippets which were looked up and the rendered result.
+# See AutoInstallationGen.generate_autoinstall().
+_render_cache: Dict[
+    Tuple[str, str], Tuple[str, Dict[str, Optional[Tuple[int, int]]], str]
+] = {}
+render_cache_stats = {"hits": 0, "misses": 0}
+
+
+def invalidate_render_cache():
+    """
+    Drop all rendered automatic installation files. This is called whenever a template or snippet is written through
+    Cobbler, since the modification time of a file alone may not change on file systems with a coarse resolution.
+    """
+    _render_cache.clear()
+
+
+def clear_render_cache():
+    """
+    Drop all rendered automatic installation files and reset the hit and miss counters.
+    """
+    invalidate_render_cache()
+    render_cache_stats["hits"] = 0
+    render_cache_stats["misses"] = 0
+
+
+def _meta_digest(meta: dict) -> Optional[str]:
+    """
+    Calculate the digest of the variables which are passed to the template.
+
+    :param meta: The template variables.
+    :return: The SHA256 of the variables or None if they can't be serialized.
+    """
+    try:
+        data = json.dumps(meta, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(data.encode("UTF-8")).hexdigest()
+
+
+def _dependencies_unchanged(dependencies: Dict[str, Optional[Tuple[int, int]]]) -> bool:
+    """
+    Check if the template and snippet files a result was rendered from are still the same.
+
+    :param dependencies: The paths of the files and their fingerprints at the time of rendering.
+    :return: True if no file was created, modified or deleted since then.
+    """
+    return all(
+        template_api.snippet_fingerprint(path) == fingerprint
+        for path, fingerprint in dependencies.items()
+    )
+
 
 class AutoInstallationGen:
     """
@@ -325,9 +381,38 @@ class AutoInstallationGen:
             autoinstall_path = (
                 f"{self.settings.autoinstall_templates_dir}/{autoinstall_rel_path}"
             )
+            # The result only depends on the variables, the template and the snippets, so it is reused as long as none
+            # of them changed. Saving an object or changing the settings changes the variables.
+            cache_key = (obj_type, obj.uid)
+            digest = _meta_digest(meta)
+            cached = _render_cache.get(cache_key)
+            if (
+                digest is not None
+                and cached is not None
+                and cached[0] == digest
+                and _dependencies_unchanged(cached[1])
+            ):
+                render_cache_stats["hits"] += 1
+                self.templar.last_errors = []
+                return cached[2]
+            render_cache_stats["misses"] += 1
+
+            template_fingerprint = template_api.snippet_fingerprint(autoinstall_path)
             raw_data = utils.read_file_contents(autoinstall_path)
 
-            data = self.templar.render(raw_data, meta, None)
+            with template_api.track_snippets() as dependencies:
+                data = self.templar.render(raw_data, meta, None)
+            dependencies[autoinstall_path] = template_fingerprint
+
+            # Results with errors or remote snippets are rendered again on every request.
+            if (
+                digest is not None
+                and not self.templar.last_errors
+                and (-1, -1) not in dependencies.values()
+            ):
+                _render_cache[cache_key] = (digest, dependencies, data)
+            else:
+                _render_cache.pop(cache_key, None)
 
             return data
         except FileNotFoundError:
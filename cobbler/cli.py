@@ -2249,6 +2249,13 @@ class CobblerCLI:
             )
         elif object_action in ["list", "autoadd"]:
             pass
+        elif object_action in ["poweron", "poweroff", "powerstatus", "reboot"]:
+            self.parser.add_option(
+                "--name",
+                dest="name",
+                action="append",
+                help="name of object, may be given more than once",
+            )
         elif object_action not in ("reload", "update"):
             self.parser.add_option("--name", dest="name", help="name of object")
         elif object_action == "reload":
@@ -2349,7 +2356,7 @@ class CobblerCLI:
             elif object_action in ["poweron", "poweroff", "powerstatus", "reboot"]:
                 power = {
                     "power": object_action.replace("power", ""),
-                    "systems": [options.name],
+                    "systems": options.name or [],
                 }
                 task_id = self.remote.background_power_system(power, self.token)
             elif object_action == "update":
@@ -2511,6 +2518,12 @@ class CobblerCLI:
                 action="store_true",
                 help="use ssl to access the Cobbler master server api",
             )
+            self.parser.add_option(
+                "--incremental",
+                dest="incremental",
+                action="store_true",
+                help="only replicate objects changed on the master since the last replication",
+            )
             (options, _) = self.parser.parse_args(self.args)
             task_id = self.start_task("replicate", options)
 
@@ -2537,6 +2550,12 @@ class CobblerCLI:
             print(f"  build time: {version['builddate']}")
 
         elif action_name == "hardlink":
+            self.parser.add_option(
+                "--dry-run",
+                dest="dry_run",
+                action="store_true",
+                help="(OPTIONAL) only report the space which could be reclaimed",
+            )
             (options, _) = self.parser.parse_args(self.args)
             task_id = self.start_task("hardlink", options)
         elif action_name == "status":
@@ -2627,6 +2646,12 @@ class CobblerCLI:
                 action="store_true",
                 help="write DNS config files and restart service",
             )
+            self.parser.add_option(
+                "--incremental",
+                dest="incremental",
+                action="store_true",
+                help="only regenerate files of changed objects instead of rebuilding all trees",
+            )
             self.parser.add_option(
                 "--systems",
                 dest="systems",
@@ -11,9 +11,10 @@ import time
 import os
 import uuid
 from threading import Lock
-from typing import List, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
-from cobbler import utils
+from cobbler import enums, utils
+from cobbler.utils import input_converters
 from cobbler.items import (
     package,
     system,
@@ -35,6 +36,11 @@ class Collection:
     Base class for any serializable list of things.
     """
 
+    # Properties for which a secondary index is maintained. See :meth:`~Collection.find_by_indexes`. The setters of
+    # these properties must call :meth:`~Collection.update_indexes`, so values which can be changed in place (like
+    # lists) can't be indexed.
+    SEARCH_INDEXES: Tuple[str, ...] = ("uid",)
+
     def __init__(self, collection_mgr):
         """
         Constructor.
@@ -47,6 +53,10 @@ class Collection:
         self.lite_sync = None
         self.lock = Lock()
         self.logger = logging.getLogger()
+        self.indexes: Dict[str, Dict[str, Set[str]]] = {
+            key: {} for key in self.SEARCH_INDEXES
+        }
+        self.__indexed_values: Dict[str, Dict[str, Set[str]]] = {}
 
     def __iter__(self):
         """
@@ -136,9 +146,18 @@ class Collection:
                 return self.listing.get(kargs["name"], None)
 
         with self.lock:
-            for (_, obj) in list(self.listing.items()):
-                if obj.find_match(kargs, no_errors=no_errors):
-                    matches.append(obj)
+            candidates = self.find_by_indexes(kargs)
+            if candidates is None:
+                candidates = list(self.listing.values())
+        # The candidates are matched without holding the lock. Matching hydrates stubs and the setters which run during
+        # the hydration may search this collection again.
+        for obj in candidates:
+            obj.hydrate()
+            if obj.is_stub:
+                # The stub is hydrated by the current thread right now, so it isn't complete yet.
+                continue
+            if obj.find_match(kargs, no_errors=no_errors):
+                matches.append(obj)
 
         if not return_list:
             if len(matches) == 0:
@@ -186,6 +205,126 @@ class Collection:
                 new_dict[key] = _dict[key]
         return new_dict
 
+    def _index_values(self, ref: item_base.Item, key: str) -> Set[str]:
+        """
+        Compute the values under which ``ref`` is stored in the secondary index ``key``. Strings are lowercased and
+        lists are indexed element by element, so the index always yields a superset of the objects that
+        :meth:`~cobbler.items.item.Item.find_match` would accept.
+
+        :param ref: The item to compute the index values for.
+        :param key: The name of the indexed property.
+        :return: The set of index values. Empty if the item does not have the property.
+        """
+        if ref.is_stub:
+            value = ref.stub_value(key)
+        else:
+            value = getattr(ref, "_" + key, None)
+        if isinstance(value, str):
+            return {value.lower()}
+        if isinstance(value, list):
+            return {element.lower() for element in value if isinstance(element, str)}
+        return set()
+
+    def add_to_indexes(self, ref: item_base.Item):
+        """
+        Add an item to all secondary indexes of the collection. The caller must hold the collection lock.
+
+        :param ref: The item which was stored in the listing.
+        """
+        listing_key = ref.name.lower()
+        indexed_values = {}
+        for key, index in self.indexes.items():
+            values = self._index_values(ref, key)
+            for value in values:
+                index.setdefault(value, set()).add(listing_key)
+            indexed_values[key] = values
+        self.__indexed_values[listing_key] = indexed_values
+
+    def remove_from_indexes(self, listing_key: str):
+        """
+        Remove an item from all secondary indexes of the collection. The caller must hold the collection lock.
+
+        :param listing_key: The key of the item in the listing.
+        """
+        indexed_values = self.__indexed_values.pop(listing_key, {})
+        for key, values in indexed_values.items():
+            index = self.indexes[key]
+            for value in values:
+                bucket = index.get(value)
+                if bucket is None:
+                    continue
+                bucket.discard(listing_key)
+                if not bucket:
+                    del index[value]
+
+    def update_indexes(self, ref: item_base.Item):
+        """
+        Refresh the secondary indexes for an item after one of its indexed properties changed. Items which are not
+        stored in this collection (e.g. unsaved handles) are ignored.
+
+        :param ref: The item which was modified.
+        """
+        if ref.is_stub:
+            # The setters are called while a stub is hydrated. It is already indexed with the same values and the
+            # collection lock may be held by the caller which triggered the hydration.
+            return
+        listing_key = ref.name.lower()
+        with self.lock:
+            if self.listing.get(listing_key) is not ref:
+                return
+            self.remove_from_indexes(listing_key)
+            self.add_to_indexes(ref)
+
+    def find_by_indexes(self, kargs: dict) -> Optional[List[item_base.Item]]:
+        """
+        Narrow down the objects which may match the given search criteria with the help of the secondary indexes.
+        Wildcards, negations and non-string values can't be answered by an index and are skipped. The caller must hold
+        the collection lock and still has to check every candidate with
+        :meth:`~cobbler.items.item.Item.find_match`.
+
+        :param kargs: The already rekeyed search criteria.
+        :return: The candidates in listing order or None if no criterion could be answered by an index.
+        """
+        candidates: Optional[Set[str]] = None
+        for key, value in kargs.items():
+            if key != "name" and key not in self.indexes:
+                continue
+            if (
+                not isinstance(value, str)
+                or value == enums.VALUE_INHERITED
+                or value.startswith("~")
+                or any(char in value for char in "?*[")
+            ):
+                continue
+            if key == "name":
+                keys = {value.lower()} if value.lower() in self.listing else set()
+            else:
+                # An empty list would match every list-valued property, so only use the index if the search value
+                # yields at least one element.
+                try:
+                    elements = input_converters.input_string_or_list_no_inherit(value)
+                except ValueError:
+                    continue
+                if not elements:
+                    continue
+                index = self.indexes[key]
+                keys = set(index.get(value.lower(), set()))
+                keys.update(index.get(elements[0].lower(), set()))
+            candidates = keys if candidates is None else candidates & keys
+            if not candidates:
+                return []
+
+        if candidates is None:
+            return None
+        if len(candidates) == 1:
+            obj = self.listing.get(candidates.pop())
+            return [] if obj is None else [obj]
+        return [
+            obj
+            for key, obj in self.listing.items()
+            if key in candidates and obj is not None
+        ]
+
     def to_list(self) -> list:
         """
         Serialize the collection
@@ -196,15 +335,58 @@ class Collection:
 
     def from_list(self, _list: list):
         """
-        Create all collection object items from ``_list``.
+        Create all collection object items from ``_list``. If the setting ``serializer_lazy_load`` is enabled only stubs
+        of the items are created.
 
         :param _list: The list with all item dictionaries.
         """
         if _list is None:
             return
-        for item_dict in _list:
-            item = self.factory_produce(self.api, item_dict)
-            self.add(item)
+        if not self.api.settings().serializer_lazy_load:
+            for item_dict in _list:
+                item = self.factory_produce(self.api, item_dict)
+                self.add(item)
+            return
+        # Only stubs are created, they are validated when they are hydrated on first access. See
+        # :meth:`~cobbler.items.item.Item.create_stub`.
+        item_class = type(self.factory_produce(self.api, {}))
+        stubs = []
+        with self.lock:
+            for item_dict in _list:
+                stub = item_class.create_stub(self.api, item_dict)
+                listing_key = stub.name.lower()
+                self.listing[listing_key] = stub
+                self.remove_from_indexes(listing_key)
+                self.add_to_indexes(stub)
+                stubs.append(stub)
+        # The parents are looked up after all stubs are listed, because a subprofile may be listed before its parent.
+        for stub in stubs:
+            try:
+                parent = stub.stub_parent()
+            except Exception:
+                # Like a failing item without lazy loading, the invalid item isn't listed.
+                with self.lock:
+                    listing_key = stub.name.lower()
+                    self.listing.pop(listing_key, None)
+                    self.remove_from_indexes(listing_key)
+                raise
+            if parent is not None and stub.name not in parent.children:
+                parent.children.append(stub.name)
+
+    def discard_pending(self, pending: List[item_base.Item]):
+        """
+        Remove items which were created but will not be added from the children of their parents. Setting the parent
+        of an item registers it as a child right away.
+
+        :param pending: The items which are discarded.
+        """
+        for ref in pending:
+            parent = ref.parent
+            if parent is None or ref.name not in parent.children:
+                continue
+            existing = self.listing.get(ref.name.lower())
+            if existing is None or existing.parent is not parent:
+                parent.children.remove(ref.name)
 
     def copy(self, ref, newname):
         """
@@ -256,15 +438,19 @@ class Collection:
         # Save the old name
         oldname = ref.name
         # Reserve the new name
-        self.listing[newname] = None
+        self.listing[newname.lower()] = None
         # Delete the old item
         self.collection_mgr.serialize_delete_one_item(ref)
-        self.listing.pop(oldname)
+        with self.lock:
+            self.listing.pop(oldname.lower())
+            self.remove_from_indexes(oldname.lower())
         # Change the name of the object
         ref.name = newname
         # Save just this item
         self.collection_mgr.serialize_one_item(ref)
-        self.listing[newname] = ref
+        with self.lock:
+            self.listing[newname.lower()] = ref
+            self.add_to_indexes(ref)
 
         # for mgmt classes, update all objects that use it
         if ref.COLLECTION_TYPE == "mgmtclass":
@@ -423,6 +609,8 @@ class Collection:
 
         with self.lock:
             self.listing[ref.name.lower()] = ref
+            self.remove_from_indexes(ref.name.lower())
+            self.add_to_indexes(ref)
 
         # update children cache in parent object in case it is not in there already
         if ref.parent and ref.name not in ref.parent.children:
@@ -85,6 +85,7 @@ class Distros(collection.Collection):
                 lite_sync.remove_single_distro(name)
         with self.lock:
             del self.listing[name]
+            self.remove_from_indexes(name)
 
         self.collection_mgr.serialize_delete(self, obj)
 
@@ -18,6 +18,8 @@ class Images(collection.Collection):
     and repeatedly install.  It differs from a answer-file based installation.
     """
 
+    SEARCH_INDEXES = ("uid", "menu")
+
     @staticmethod
     def collection_type() -> str:
         return "image"
@@ -75,6 +77,7 @@ class Images(collection.Collection):
 
         with self.lock:
             del self.listing[name]
+            self.remove_from_indexes(name)
         self.collection_mgr.serialize_delete(self, obj)
 
         if with_delete:
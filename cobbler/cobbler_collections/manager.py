@@ -6,6 +6,8 @@ Repository of the Cobbler object model
 # SPDX-FileCopyrightText: Copyright 2006-2009, Red Hat, Inc and Others
 # SPDX-FileCopyrightText: Michael DeHaan <michael.dehaan AT gmail>
 
+import logging
+import time
 import weakref
 from typing import Union, Dict, Any
 
@@ -49,7 +51,10 @@ class CollectionManager:
         CollectionManager.has_loaded = True
 
         self.api = api
+        self.logger = logging.getLogger()
         self.__serializer = serializer.Serializer(api)
+        # Seconds needed to load each collection during the last deserialize(), keyed by the collection type.
+        self.load_timings: Dict[str, float] = {}
         self._distros = Distros(weakref.proxy(self))
         self._repos = Repos(weakref.proxy(self))
         self._profiles = Profiles(weakref.proxy(self))
@@ -135,6 +140,14 @@ class CollectionManager:
         self.__serializer.serialize(self._files)
         self.__serializer.serialize(self._menus)
 
+    def transaction(self):
+        """
+        Group multiple saves and deletes of items into one transaction of the serializer.
+
+        :return: A context manager, see :meth:`~cobbler.serializer.Serializer.transaction`.
+        """
+        return self.__serializer.transaction()
+
     def serialize_one_item(self, item):
         """
         Save a collection item to disk
@@ -191,6 +204,7 @@ class CollectionManager:
             self._packages,
             self._files,
         ):
+            start = time.time()
             try:
                 self.__serializer.deserialize(collection)
             except Exception as error:
@@ -198,6 +212,14 @@ class CollectionManager:
                     f"serializer: error loading collection {collection.collection_type()}: {error}."
                     f"Check your settings!"
                 ) from error
+            duration = time.time() - start
+            self.load_timings[collection.collection_type()] = duration
+            self.logger.info(
+                "Loaded %d %s in %.3f seconds",
+                len(collection),
+                collection.collection_types(),
+                duration,
+            )
 
     def get_items(
         self, collection_type: str
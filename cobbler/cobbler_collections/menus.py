@@ -16,6 +16,8 @@ class Menus(collection.Collection):
     A menu represents an element of the hierarchical boot menu.
     """
 
+    SEARCH_INDEXES = ("uid", "parent")
+
     @staticmethod
     def collection_type() -> str:
         return "menu"
@@ -80,6 +82,7 @@ class Menus(collection.Collection):
                 )
         with self.lock:
             del self.listing[name]
+            self.remove_from_indexes(name)
         self.collection_mgr.serialize_delete(self, obj)
         if with_delete:
             if with_triggers:
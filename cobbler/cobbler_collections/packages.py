@@ -58,6 +58,7 @@ class Packages(collection.Collection):
 
         with self.lock:
             del self.listing[name]
+            self.remove_from_indexes(name)
         self.collection_mgr.serialize_delete(self, obj)
 
         if with_delete:
@@ -17,6 +17,8 @@ class Profiles(collection.Collection):
     A profile represents a distro paired with an automatic OS installation template file.
     """
 
+    SEARCH_INDEXES = ("uid", "distro", "parent", "menu")
+
     @staticmethod
     def collection_type() -> str:
         return "profile"
@@ -88,6 +90,7 @@ class Profiles(collection.Collection):
 
         with self.lock:
             del self.listing[name]
+            self.remove_from_indexes(name)
         self.collection_mgr.serialize_delete(self, obj)
         if with_delete:
             if with_triggers:
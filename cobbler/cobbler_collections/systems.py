@@ -6,6 +6,8 @@ Cobbler module that at runtime holds all systems in Cobbler.
 # SPDX-FileCopyrightText: Copyright 2008-2009, Red Hat, Inc and Others
 # SPDX-FileCopyrightText: Michael DeHaan <michael.dehaan AT gmail>
 
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
 from cobbler.cobbler_collections import collection
 from cobbler.items import system as system
 from cobbler import utils
@@ -18,6 +20,24 @@ class Systems(collection.Collection):
     they belong to.
     """
 
+    SEARCH_INDEXES = (
+        "uid",
+        "profile",
+        "image",
+        "parent",
+        "mac_address",
+        "ip_address",
+        "dns_name",
+    )
+    INTERFACE_INDEXES = ("mac_address", "ip_address", "dns_name")
+    # Interface properties which must be unique, the setting which allows duplicates and the name used in messages.
+    UNIQUE_INTERFACE_PROPERTIES = (
+        ("mac_address", "allow_duplicate_macs", "MAC address"),
+        ("ip_address", "allow_duplicate_ips", "IP address"),
+        ("ipv6_address", "allow_duplicate_ips", "IPv6 address"),
+        ("dns_name", "allow_duplicate_hostnames", "DNS name"),
+    )
+
     @staticmethod
     def collection_type() -> str:
         return "system"
@@ -26,6 +46,115 @@ class Systems(collection.Collection):
     def collection_types() -> str:
         return "systems"
 
+    def _index_values(self, ref, key: str) -> Set[str]:
+        """
+        Interface properties are indexed with the values of all interfaces of a system. The interface names are added
+        as well because :meth:`~cobbler.items.item.Item.find_match` also accepts them as a match.
+
+        :param ref: The system to compute the index values for.
+        :param key: The name of the indexed property.
+        :return: The set of index values.
+        """
+        if key not in self.INTERFACE_INDEXES:
+            return super()._index_values(ref, key)
+        values = set()
+        if ref.is_stub:
+            for interface_name, interface in (
+                ref.stub_value("interfaces") or {}
+            ).items():
+                values.add(interface_name.lower())
+                values.add(str(interface.get(key, "")).lower())
+            return values
+        for interface_name, interface in ref.interfaces.items():
+            values.add(interface_name.lower())
+            values.add(getattr(interface, key).lower())
+        return values
+
+    @staticmethod
+    def __interface_values(ref, key: str) -> Iterator[str]:
+        """
+        Get the non-empty values of an interface property of all interfaces of a system.
+
+        :param ref: The system, which may be a stub.
+        :param key: The name of the interface property.
+        :return: The lowercase values.
+        """
+        if ref.is_stub:
+            values = (
+                str(interface.get(key, ""))
+                for interface in (ref.stub_value("interfaces") or {}).values()
+            )
+        else:
+            values = (getattr(interface, key) for interface in ref.interfaces.values())
+        for value in values:
+            if value:
+                yield value.lower()
+
+    def find_duplicates(
+        self,
+        pending: Optional[List[system.System]] = None,
+        removed: Optional[List[str]] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Find MAC addresses, IP addresses and DNS names which are used by more than one system in a single pass over all
+        interfaces. Properties for which duplicates are allowed by the settings are skipped. This is the counterpart of
+        :func:`~cobbler.items.system.defer_duplicate_checks`.
+
+        :param pending: Systems which are about to be added. They replace the systems in the collection with the same
+                        name or uid.
+        :param removed: The names of systems which are about to be removed.
+        :return: A human readable message per conflict with the names of the conflicting systems. The dict is empty if
+                 there are no conflicts.
+        """
+        if pending is None:
+            pending = []
+        settings = self.api.settings()
+        properties = {
+            key: label
+            for key, setting, label in self.UNIQUE_INTERFACE_PROPERTIES
+            if not getattr(settings, setting)
+        }
+        if not properties:
+            return {}
+        replaced_names = {ref.name.lower() for ref in pending}
+        replaced_names.update(name.lower() for name in removed or [])
+        replaced_uids = {ref.uid for ref in pending if ref.uid}
+        systems = [
+            ref
+            for listing_key, ref in list(self.listing.items())
+            if listing_key not in replaced_names
+            and (ref.stub_value("uid") if ref.is_stub else ref.uid) not in replaced_uids
+        ]
+        systems.extend(pending)
+
+        owners: Dict[Tuple[str, str], List[str]] = {}
+        for ref in systems:
+            for key in properties:
+                for value in set(self.__interface_values(ref, key)):
+                    owners.setdefault((key, value), []).append(ref.name)
+
+        duplicates: Dict[str, List[str]] = {}
+        for (key, value), names in owners.items():
+            if len(names) > 1:
+                conflicts = ", ".join(f'"{name}"' for name in names)
+                message = f'{properties[key]} duplicate found "{value}". Objects with the conflict have the names {conflicts}'
+                duplicates[message] = names
+        return duplicates
+
+    def from_list(self, _list: list):
+        """
+        Create all systems from ``_list``. The duplicate checks of the network interfaces are done once for all systems
+        after they were created.
+
+        :param _list: The list with all item dictionaries.
+        :raises ValueError: Raised with all conflicts in case network interfaces of different systems are duplicates.
+        """
+        with system.defer_duplicate_checks():
+            super().from_list(_list)
+        duplicates = self.find_duplicates()
+        if duplicates:
+            raise ValueError("\n".join(duplicates))
+
     def factory_produce(self, api, item_dict):
         """
         Return a Distro forged from item_dict
@@ -74,6 +203,7 @@ class Systems(collection.Collection):
 
         with self.lock:
             del self.listing[name]
+            self.remove_from_indexes(name)
         self.collection_mgr.serialize_delete(self, obj)
         if with_delete:
             if with_triggers:
@@ -32,6 +32,7 @@ def core(cobbler_api: CobblerAPI):
     xmlrpc_port = settings.xmlrpc_port
 
     regen_ss_file()
+    cobbler_api.power_status_poller.start()
     do_xmlrpc_rw(cobbler_api, xmlrpc_port)
 
 
@@ -57,7 +57,7 @@ class Distro(item.Item):
     def __getattr__(self, name):
         if name == "ks_meta":
             return self.autoinstall_meta
-        raise AttributeError(f'Attribute "{name}" did not exist on object type Distro.')
+        return super().__getattr__(name)
 
     #
     # override some base class methods first (item.Item)
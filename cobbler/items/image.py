@@ -55,7 +55,7 @@ class Image(item.Item):
     def __getattr__(self, name):
         if name == "kickstart":
             return self.autoinstall
-        raise AttributeError(f'Attribute "{name}" did not exist on object type Image.')
+        return super().__getattr__(name)
 
     #
     # override some base class methods first (item.Item)
@@ -496,6 +496,7 @@ class Image(item.Item):
             if not menu_list.find(name=menu):
                 raise CX(f"menu {menu} not found")
         self._menu = menu
+        self.api.images().update_indexes(self)
 
     @property
     def display_name(self) -> str:
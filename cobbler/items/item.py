@@ -12,8 +12,9 @@ import fnmatch
 import logging
 import pprint
 import re
+import threading
 import uuid
-from typing import Any, List, Type, Union
+from typing import Any, Dict, List, Optional, Type, Union
 
 import yaml
 
@@ -34,6 +35,110 @@ class Item:
     TYPE_NAME = "generic"
     COLLECTION_TYPE = "generic"
 
+    # Attributes which don't count as a modification of the item. See :meth:`~cobbler.items.item.Item.__setattr__`.
+    _CACHE_ATTRIBUTES = (
+        "_cached_dict",
+        "_conceptual_parent",
+        "_last_cached_mtime",
+    )
+    # Serializes the hydration of stubs. See :meth:`~cobbler.items.item.Item.create_stub`.
+    __hydrate_lock = threading.RLock()
+
+    @classmethod
+    def create_stub(cls, api, dictionary: dict) -> "Item":
+        """
+        Create a lightweight item which only knows its name and children. All other attributes are set from
+        ``dictionary`` on the first access to one of them, so the setters and validation only run for items which are
+        actually used.
+
+        :param api: The Cobbler API object which is used for resolving information.
+        :param dictionary: The serialized item as it would be passed to
+                           :meth:`~cobbler.items.item.Item.from_dict`.
+        :return: The stub of the item.
+        """
+        stub = cls.__new__(cls)
+        stub.__dict__.update(
+            {
+                "api": api,
+                "_name": dictionary["name"],
+                # The stubs of the children are registered here, see :meth:`~cobbler.items.item.Item.stub_parent`.
+                "_children": list(dictionary.get("children", [])),
+                "_Item__stub_dict": dictionary,
+            }
+        )
+        return stub
+
+    @property
+    def is_stub(self) -> bool:
+        """
+        Whether this item is a stub which was not hydrated yet.
+
+        :getter: True if the item only knows its name.
+        """
+        return "_Item__stub_dict" in self.__dict__
+
+    def stub_value(self, key: str) -> Any:
+        """
+        Get a raw value of a stub without hydrating it.
+
+        :param key: The key in the serialized item.
+        :return: The serialized value or None if the item is no stub or the key is missing.
+        """
+        return self.__dict__.get("_Item__stub_dict", {}).get(key)
+
+    def stub_parent(self) -> Optional["Item"]:
+        """
+        Look up the parent of a stub from its raw values without hydrating it. The stub must be registered in the
+        children of its parent, because the parent setters which do this only run during the hydration.
+
+        :return: The parent or None if the item has no parent.
+        """
+        return None
+
+    def hydrate(self):
+        """
+        Turn a stub into a complete item. This does nothing for items which are no stubs.
+
+        :raises CX: In case the stored values of the item are invalid. The item stays a stub in this case.
+        """
+        with Item.__hydrate_lock:
+            stub_dict = self.__dict__.get("_Item__stub_dict")
+            # Attributes which are accessed while the item is hydrated must not trigger another hydration.
+            if stub_dict is None or self.__dict__.get("_Item__hydrating", False):
+                return
+            stub_state = dict(self.__dict__)
+            self.__dict__["_Item__hydrating"] = True
+            try:
+                type(self).__init__(self, self.__dict__["api"])
+                self.from_dict(stub_dict)
+            except Exception as error:
+                self.__dict__.clear()
+                self.__dict__.update(stub_state)
+                raise CX(
+                    f'{self.TYPE_NAME} "{stub_dict["name"]}" could not be loaded: {error}'
+                ) from error
+            # Children which were registered with the stub may be missing in the stored list.
+            self.__dict__["_children"] = stub_state["_children"]
+            self.__dict__.pop("_Item__stub_dict")
+            self.__dict__.pop("_Item__hydrating")
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Only called for attributes which are not present. Stubs are hydrated in that case and the attribute is looked
+        up again.
+
+        :param name: The name of the attribute.
+        :return: The value of the attribute.
+        :raises AttributeError: In case the item has no such attribute.
+        """
+        if not name.startswith("__") and "_Item__stub_dict" in self.__dict__:
+            self.hydrate()
+            if "_Item__stub_dict" not in self.__dict__:
+                return object.__getattribute__(self, name)
+        raise AttributeError(
+            f'Attribute "{name}" did not exist on object type {type(self).__name__}.'
+        )
+
     @classmethod
     def __find_compare(
         cls,
@@ -129,9 +234,9 @@ class Item:
         self._fetchable_files: Union[dict, str] = {}
         self._boot_files: Union[dict, str] = {}
         self._template_files = {}
-        self._last_cached_mtime = 0
+        self._last_cached_mtime: tuple = ()
         self._owners: Union[list, str] = enums.VALUE_INHERITED
-        self._cached_dict = ""
+        self._cached_dict: Dict[str, Any] = {}
         self._mgmt_classes: Union[list, str] = []
         self._mgmt_parameters: Union[dict, str] = {}
         self._conceptual_parent = None
@@ -151,11 +256,59 @@ class Item:
             return self._uid == other.uid
         return False
 
+    def __setattr__(self, name: str, value: Any):
+        """
+        Set an attribute and record that the item was modified, so that cached resolved values of the item and its
+        children are invalidated.
+
+        :param name: The name of the attribute.
+        :param value: The new value of the attribute.
+        """
+        super().__setattr__(name, value)
+        if name not in self._CACHE_ATTRIBUTES:
+            self.__dict__["_Item__modification_count"] = (
+                self.__dict__.get("_Item__modification_count", 0) + 1
+            )
+
+    def resolve_cache_key(self) -> tuple:
+        """
+        Compute the key under which data derived from this item and its parents is valid. It consists of the uid, mtime
+        and modification count of the item and all of its parents as well as the modification count of the settings.
+
+        :return: The cache key.
+        """
+        settings = self.api.settings()
+        key = [(id(settings), settings.modification_count)]
+        node = self
+        while node is not None:
+            key.append(
+                (
+                    node.uid,
+                    node.mtime,
+                    node.__dict__.get("_Item__modification_count", 0),
+                )
+            )
+            node = node.parent
+        return tuple(key)
+
+    def _get_resolve_cache(self) -> Dict[str, Any]:
+        """
+        Get the cache for resolved values of this item. The cache is emptied if the item, one of its parents or the
+        settings changed since the values were cached.
+
+        :return: The dictionary with the property names as keys and the resolved values as values.
+        """
+        key = self.resolve_cache_key()
+        if key != self._last_cached_mtime:
+            self._cached_dict = {}
+            self._last_cached_mtime = key
+        return self._cached_dict
+
     def _resolve(self, property_name: str) -> Any:
         """
         Resolve the ``property_name`` value in the object tree. This function traverses the tree from the object to its
         topmost parent and returns the first value that is not inherited. If the the tree does not contain a value the
-        settings are consulted.
+        settings are consulted. Resolved values are cached until the item, one of its parents or the settings change.
 
         :param property_name: The property name to resolve.
         :raises AttributeError: In case one of the objects try to inherit from a parent that does not have
@@ -175,20 +328,27 @@ class Item:
             )
 
         attribute_value = getattr(self, attribute)
-        settings = self.api.settings()
+        if attribute_value != enums.VALUE_INHERITED:
+            return attribute_value
 
-        if attribute_value == enums.VALUE_INHERITED:
-            if self.parent is not None and hasattr(self.parent, property_name):
-                return getattr(self.parent, property_name)
-            if hasattr(settings, settings_name):
-                return getattr(settings, settings_name)
-            if hasattr(settings, f"default_{settings_name}"):
-                return getattr(settings, f"default_{settings_name}")
+        cache = self._get_resolve_cache()
+        if property_name in cache:
+            return cache[property_name]
+
+        settings = self.api.settings()
+        parent = self.parent
+        if parent is not None and hasattr(parent, property_name):
+            attribute_value = getattr(parent, property_name)
+        elif hasattr(settings, settings_name):
+            attribute_value = getattr(settings, settings_name)
+        elif hasattr(settings, f"default_{settings_name}"):
+            attribute_value = getattr(settings, f"default_{settings_name}")
+        else:
             AttributeError(
                 f'{type(self)} "{self.name}" inherits property "{property_name}", but neither its parent nor'
                 f"settings have it"
             )
-
+        cache[property_name] = attribute_value
         return attribute_value
 
     def _resolve_enum(
@@ -206,29 +366,39 @@ class Item:
             )
 
         attribute_value = getattr(self, attribute)
-        settings = self.api.settings()
-
-        if (
+        if not (
             isinstance(attribute_value, enums.ConvertableEnum)
             and attribute_value.value == enums.VALUE_INHERITED
         ):
-            if self.parent is not None and hasattr(self.parent, property_name):
-                return getattr(self.parent, property_name)
-            if hasattr(settings, settings_name):
-                return enum_type.to_enum(getattr(settings, settings_name))
-            if hasattr(settings, f"default_{settings_name}"):
-                return enum_type.to_enum(getattr(settings, f"default_{settings_name}"))
+            return attribute_value
+
+        cache = self._get_resolve_cache()
+        if property_name in cache:
+            return cache[property_name]
+
+        settings = self.api.settings()
+        parent = self.parent
+        if parent is not None and hasattr(parent, property_name):
+            attribute_value = getattr(parent, property_name)
+        elif hasattr(settings, settings_name):
+            attribute_value = enum_type.to_enum(getattr(settings, settings_name))
+        elif hasattr(settings, f"default_{settings_name}"):
+            attribute_value = enum_type.to_enum(
+                getattr(settings, f"default_{settings_name}")
+            )
+        else:
             AttributeError(
                 f'{type(self)} "{self.name}" inherits property "{property_name}", but neither its parent nor'
                 "settings have it"
             )
-
+        cache[property_name] = attribute_value
         return attribute_value
 
     def _resolve_dict(self, property_name: str) -> dict:
         """
         Merge the ``property_name`` dictionary of the object with the ``property_name`` of all its parents. The value
-        of the child takes precedence over the value of the parent.
+        of the child takes precedence over the value of the parent. The merged dictionary is not cached, because the
+        dictionaries can be changed in place without the items noticing it.
 
         :param property_name: The property name to resolve.
         :return: The merged dictionary.
@@ -243,11 +413,11 @@ class Item:
 
         attribute_value = getattr(self, attribute)
         settings = self.api.settings()
-
+        parent = self.parent
         merged_dict = {}
 
-        if self.parent is not None and hasattr(self.parent, property_name):
-            merged_dict.update(getattr(self.parent, property_name))
+        if parent is not None and hasattr(parent, property_name):
+            merged_dict.update(getattr(parent, property_name))
         elif hasattr(settings, property_name):
             merged_dict.update(getattr(settings, property_name))
 
@@ -746,13 +916,22 @@ class Item:
 
     def sort_key(self, sort_fields: list):
         """
-        Convert the item to a dict and sort the data after specific given fields.
+        Get the values of the given fields as they would appear in :meth:`~cobbler.items.item.Item.to_dict`, to sort
+        items after them. Only the requested attributes are read.
 
         :param sort_fields: The fields to sort the data after.
         :return: The sorted data.
         """
-        data = self.to_dict()
-        return [data.get(x, "") for x in sort_fields]
+        if any(field != "name" for field in sort_fields):
+            self.hydrate()
+        result = []
+        for field in sort_fields:
+            field = {"kickstart": "autoinstall", "ks_meta": "autoinstall_meta"}.get(
+                field, field
+            )
+            value = self.__dict__.get("_" + field, "")
+            result.append(value.value if isinstance(value, enum.Enum) else value)
+        return result
 
     def find_match(self, kwargs, no_errors=False):
         """
@@ -905,22 +1084,38 @@ class Item:
                 f"The following keys supplied could not be set: {result.keys()}"
             )
 
-    def to_dict(self, resolved: bool = False) -> dict:
+    def to_dict(
+        self, resolved: bool = False, fields: Optional[List[str]] = None
+    ) -> dict:
         """
         This converts everything in this object to a dictionary.
 
         :param resolved: If this is True, Cobbler will resolve the values to its final form, rather than give you the
                      objects raw value.
+        :param fields: If given, only these keys are converted and returned. Unknown keys are ignored.
         :return: A dictionary with all values present in this object.
         """
+        # The attributes are read from __dict__ directly, so a stub has to be hydrated explicitly.
+        self.hydrate()
+        wanted = None
+        if fields is not None:
+            wanted = {"_" + field for field in fields}
+            # The aliases are added from the values of the attributes below.
+            if "kickstart" in fields:
+                wanted.add("_autoinstall")
+            if "ks_meta" in fields:
+                wanted.add("_autoinstall_meta")
         value = {}
         for key, key_value in self.__dict__.items():
+            if wanted is not None and key not in wanted:
+                continue
             if key.startswith("_") and not key.startswith("__"):
                 if key in (
                     "_conceptual_parent",
                     "_last_cached_mtime",
                     "_cached_dict",
                     "_supported_boot_loaders",
+                    "_Item__modification_count",
                 ):
                     continue
                 new_key = key[1:].lower()
@@ -954,6 +1149,8 @@ class Item:
             value.update({"kickstart": value["autoinstall"]})
         if "autoinstall_meta" in value:
             value.update({"ks_meta": value["autoinstall_meta"]})
+        if fields is not None:
+            value = {key: value[key] for key in fields if key in value}
         return value
 
     def serialize(self) -> dict:
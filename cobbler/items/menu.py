@@ -78,6 +78,7 @@ class Menu(item.Item):
             old_parent.children.remove(self.name)
         if not value:
             self._parent = ""
+            self.api.menus().update_indexes(self)
             return
         if value == self.name:
             # check must be done in two places as the parent setter could be called before/after setting the name...
@@ -90,6 +91,7 @@ class Menu(item.Item):
         new_parent = self._parent
         if isinstance(new_parent, Menu) and self.name not in new_parent.children:
             new_parent.children.append(self.name)
+        self.api.menus().update_indexes(self)
 
     @property
     def children(self) -> List[str]:
@@ -79,9 +79,7 @@ class Profile(item.Item):
             return self.autoinstall
         if name == "ks_meta":
             return self.autoinstall_meta
-        raise AttributeError(
-            f'Attribute "{name}" did not exist on object type Profile.'
-        )
+        return super().__getattr__(name)
 
     #
     # override some base class methods first (item.Item)
@@ -128,6 +126,27 @@ class Profile(item.Item):
         self._remove_depreacted_dict_keys(dictionary)
         super().from_dict(dictionary)
 
+    def stub_parent(self) -> Optional[item.Item]:
+        """
+        See :meth:`~cobbler.items.item.Item.stub_parent`
+
+        :raises CX: In case the parent profile could not be found.
+        :raises ValueError: In case the distro could not be found.
+        """
+        parent_name = self.stub_value("parent")
+        if parent_name:
+            found = self.api.profiles().find(name=parent_name)
+            if found is None:
+                raise CX(f'profile "{parent_name}" not found, inheritance not possible')
+            return found
+        distro_name = self.stub_value("distro")
+        if distro_name:
+            found = self.api.distros().find(name=distro_name)
+            if found is None:
+                raise ValueError(f'distribution "{distro_name}" not found')
+            return found
+        return None
+
     #
     # specific methods for item.Profile
     #
@@ -170,6 +189,7 @@ class Profile(item.Item):
             old_parent.children.remove(self.name)
         if not parent:
             self._parent = ""
+            self.api.profiles().update_indexes(self)
             return
         if parent == self.name:
             # check must be done in two places as setting parent could be called before/after setting name...
@@ -182,6 +202,7 @@ class Profile(item.Item):
         new_parent = self.parent
         if isinstance(new_parent, item.Item) and self.name not in new_parent.children:
             new_parent.children.append(self.name)
+        self.api.profiles().update_indexes(self)
 
     @property
     def arch(self):
@@ -220,6 +241,7 @@ class Profile(item.Item):
             raise TypeError("distro_name needs to be of type str")
         if not distro_name:
             self._distro = ""
+            self.api.profiles().update_indexes(self)
             return
         distro = self.api.distros().find(name=distro_name)
         if distro is None:
@@ -233,6 +255,7 @@ class Profile(item.Item):
         )  # reset depth if previously a subprofile and now top-level
         if self.name not in distro.children:
             distro.children.append(self.name)
+        self.api.profiles().update_indexes(self)
 
     @InheritableProperty
     def name_servers(self) -> list:
@@ -789,6 +812,7 @@ class Profile(item.Item):
             if not menu_list.find(name=menu):
                 raise CX(f"menu {menu} not found")
         self._menu = menu
+        self.api.profiles().update_indexes(self)
 
     @property
     def display_name(self) -> str:
@@ -5,10 +5,13 @@ All code belonging to Cobbler systems. This includes network interfaces.
 # SPDX-FileCopyrightText: Copyright 2006-2008, Red Hat, Inc and Others
 # SPDX-FileCopyrightText: Michael DeHaan <michael.dehaan AT gmail>
 
+import contextlib
 import enum
 import logging
+import threading
 import uuid
-from typing import Any, Dict, List, Optional, Union
+import weakref
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 from ipaddress import AddressValueError
 
@@ -18,20 +21,52 @@ from cobbler.cexceptions import CX
 from cobbler.items.item import Item
 from cobbler.decorator import InheritableProperty
 
+# Per thread flag which disables the duplicate checks of the network interfaces, see defer_duplicate_checks().
+_deferred_checks = threading.local()
+
+
+@contextlib.contextmanager
+def defer_duplicate_checks() -> Iterator[None]:
+    """
+    Skip the checks for duplicate MAC addresses, IP addresses and DNS names of network interfaces in the current thread
+    while the context is active. Every check searches all systems, so creating many systems in a row is quadratic. The
+    caller is responsible to check all created systems at once with
+    :meth:`~cobbler.cobbler_collections.systems.Systems.find_duplicates` afterwards.
+    """
+    outer = getattr(_deferred_checks, "active", False)
+    _deferred_checks.active = True
+    try:
+        yield
+    finally:
+        _deferred_checks.active = outer
+
+
+def _duplicate_checks_deferred() -> bool:
+    """
+    Check if the duplicate checks are disabled in the current thread by ``defer_duplicate_checks()``.
+
+    :return: True if the checks must be skipped.
+    """
+    return getattr(_deferred_checks, "active", False)
+
 
 class NetworkInterface:
     """
     A subobject of a Cobbler System which represents the network interfaces
     """
 
-    def __init__(self, api):
+    def __init__(self, api, system: Optional["System"] = None):
         """
         Constructor.
 
         :param api: The Cobbler API object which is used for resolving information.
+        :param system: The system this interface belongs to. See :meth:`attach_to_system`.
         """
         self.__logger = logging.getLogger()
         self.__api = api
+        self.__system: Optional[weakref.ReferenceType] = None
+        if system is not None:
+            self.attach_to_system(system)
         self._bonding_opts = ""
         self._bridge_opts = ""
         self._cnames = []
@@ -101,6 +136,26 @@ class NetworkInterface:
                     result[new_key] = key_value
         return result
 
+    def attach_to_system(self, system: "System"):
+        """
+        Remember the system this interface belongs to. This is required to keep the secondary indexes of the systems
+        collection up to date when the MAC address, IP address or DNS name of the interface is changed. Only a weak
+        reference is kept.
+
+        :param system: The system this interface belongs to.
+        """
+        self.__system = weakref.ref(system)
+
+    def __update_system_indexes(self):
+        """
+        Refresh the secondary indexes of the systems collection in case this interface belongs to a stored system.
+        """
+        if self.__system is None:
+            return
+        system = self.__system()
+        if system is not None:
+            self.__api.systems().update_indexes(system)
+
     # These two methods are currently not used, but we do want to use them in the future, so let's define them.
     def serialize(self):
         """
@@ -249,7 +304,11 @@ class NetworkInterface:
         :raises ValueError: In case the DNS name is already existing inside Cobbler
         """
         dns_name = validate.hostname(dns_name)
-        if dns_name != "" and not self.__api.settings().allow_duplicate_hostnames:
+        if (
+            dns_name != ""
+            and not self.__api.settings().allow_duplicate_hostnames
+            and not _duplicate_checks_deferred()
+        ):
             matched = self.__api.find_items("system", {"dns_name": dns_name})
             for match in matched:
                 if self in match.interfaces.values():
@@ -258,6 +317,7 @@ class NetworkInterface:
                     f'DNS name duplicate found "{dns_name}". Object with the conflict has the name "{match.name}"'
                 )
         self._dns_name = dns_name
+        self.__update_system_indexes()
 
     @property
     def ip_address(self) -> str:
@@ -278,7 +338,11 @@ class NetworkInterface:
         :raises ValueError: In case the IP address is already existing inside Cobbler.
         """
         address = validate.ipv4_address(address)
-        if address != "" and not self.__api.settings().allow_duplicate_ips:
+        if (
+            address != ""
+            and not self.__api.settings().allow_duplicate_ips
+            and not _duplicate_checks_deferred()
+        ):
             matched = self.__api.find_items("system", {"ip_address": address})
             for match in matched:
                 if self in match.interfaces.values():
@@ -287,6 +351,7 @@ class NetworkInterface:
                     f'IP address duplicate found "{address}". Object with the conflict has the name "{match.name}"'
                 )
         self._ip_address = address
+        self.__update_system_indexes()
 
     @property
     def mac_address(self) -> str:
@@ -310,7 +375,11 @@ class NetworkInterface:
         if address == "random":
             # FIXME: Pass virt_type of system
             address = utils.get_random_mac(self.__api)
-        if address != "" and not self.__api.settings().allow_duplicate_macs:
+        if (
+            address != ""
+            and not self.__api.settings().allow_duplicate_macs
+            and not _duplicate_checks_deferred()
+        ):
             matched = self.__api.find_items("system", {"mac_address": address})
             for match in matched:
                 if self in match.interfaces.values():
@@ -319,6 +388,7 @@ class NetworkInterface:
                     f'MAC address duplicate found "{address}". Object with the conflict has the name "{match.name}"'
                 )
         self._mac_address = address
+        self.__update_system_indexes()
 
     @property
     def netmask(self) -> str:
@@ -518,7 +588,11 @@ class NetworkInterface:
         :raises ValueError: IN case the IP is duplicated
         """
         address = validate.ipv6_address(address)
-        if address != "" and not self.__api.settings().allow_duplicate_ips:
+        if (
+            address != ""
+            and not self.__api.settings().allow_duplicate_ips
+            and not _duplicate_checks_deferred()
+        ):
             matched = self.__api.find_items("system", {"ipv6_address": address})
             for match in matched:
                 if self in match.interfaces.values():
@@ -825,7 +899,7 @@ class System(Item):
             return self.autoinstall
         if name == "ks_meta":
             return self.autoinstall_meta
-        raise AttributeError(f'Attribute "{name}" did not exist on object type System.')
+        return super().__getattr__(name)
 
     #
     # override some base class methods first (item.Item)
@@ -855,6 +929,28 @@ class System(Item):
         self._remove_depreacted_dict_keys(dictionary)
         super().from_dict(dictionary)
 
+    def stub_parent(self) -> Optional[Item]:
+        """
+        See :meth:`~cobbler.items.item.Item.stub_parent`
+
+        :raises ValueError: In case the profile or image could not be found.
+        """
+        profile_name = self.stub_value("profile")
+        if profile_name:
+            found = self.api.profiles().find(name=profile_name)
+            if found is None:
+                raise ValueError(
+                    f'Profile with the name "{profile_name}" is not existing'
+                )
+            return found
+        image_name = self.stub_value("image")
+        if image_name:
+            found = self.api.images().find(name=image_name)
+            if found is None:
+                raise ValueError(f'Image with the name "{image_name}" is not existing')
+            return found
+        return None
+
     @property
     def parent(self) -> Optional[Item]:
         """
@@ -886,6 +982,7 @@ class System(Item):
             raise TypeError("The name of the parent must be of type str.")
         if not value:
             self._parent = ""
+            self.api.systems().update_indexes(self)
             return
         # FIXME: Add an exists method so we don't need to play try-catch here.
         try:
@@ -903,6 +1000,7 @@ class System(Item):
                 f'Neither a system, profile or image could be found with the name "{value}".'
             ) from value_error
         self._parent = value
+        self.api.systems().update_indexes(self)
 
     def check_if_valid(self):
         """
@@ -945,13 +1043,17 @@ class System(Item):
             raise TypeError("interfaces must be of type dict")
         dict_values = list(value.values())
         if all(isinstance(x, NetworkInterface) for x in dict_values):
+            for network_iface in dict_values:
+                network_iface.attach_to_system(self)
             self._interfaces = value
+            self.api.systems().update_indexes(self)
             return
         if all(isinstance(x, dict) for x in dict_values):
             for key in value:
-                network_iface = NetworkInterface(self.api)
+                network_iface = NetworkInterface(self.api, self)
                 network_iface.from_dict(value[key])
                 self._interfaces[key] = network_iface
+            self.api.systems().update_indexes(self)
             return
         raise ValueError(
             "The values of the interfaces must be fully of type dict (one level with values) or "
@@ -979,10 +1081,12 @@ class System(Item):
                 return
             if name in self.interfaces:
                 self.interfaces.pop(name)
+                self.api.systems().update_indexes(self)
                 return
         if isinstance(name, dict):
             interface_name = name.get("interface", "")
             self.interfaces.pop(interface_name)
+            self.api.systems().update_indexes(self)
             return
         raise TypeError("The name of the interface must be of type str or dict")
 
@@ -1003,6 +1107,7 @@ class System(Item):
             raise ValueError(f'Interface "{new_name}" already exists')
         self.interfaces[new_name] = self.interfaces[old_name]
         del self.interfaces[old_name]
+        self.api.systems().update_indexes(self)
 
     @property
     def hostname(self) -> str:
@@ -1303,7 +1408,8 @@ class System(Item):
 
         :param interface: The name of the interface
         """
-        self.interfaces[interface] = NetworkInterface(self.api)
+        self.interfaces[interface] = NetworkInterface(self.api, self)
+        self.api.systems().update_indexes(self)
 
     def __get_interface(self, interface_name: str = "default") -> NetworkInterface:
         """
@@ -1483,6 +1589,7 @@ class System(Item):
 
         if profile_name in ["delete", "None", "~", ""]:
             self._profile = ""
+            self.api.systems().update_indexes(self)
             return
 
         profile = self.api.profiles().find(name=profile_name)
@@ -1512,6 +1619,7 @@ class System(Item):
         new_parent = self.parent
         if isinstance(new_parent, Item) and self.name not in new_parent.children:
             new_parent.children.append(self.name)
+        self.api.systems().update_indexes(self)
 
     @property
     def image(self) -> str:
@@ -1538,6 +1646,7 @@ class System(Item):
 
         if image_name in ["delete", "None", "~", ""]:
             self._image = ""
+            self.api.systems().update_indexes(self)
             return
 
         img = self.api.images().find(name=image_name)
@@ -1567,6 +1676,7 @@ class System(Item):
         new_parent = self.parent
         if isinstance(new_parent, Item) and self.name not in new_parent.children:
             new_parent.children.append(self.name)
+        self.api.systems().update_indexes(self)
 
     @InheritableProperty
     def virt_cpus(self) -> int:
@@ -42,6 +42,9 @@ class ManagerModule:
         self.settings = self.api.settings()
         self.repos = self.api.repos()
         self.templar = templar.Templar(self.api)
+        # Set if a config file changed since the service was last restarted. Modules which don't track their files
+        # always restart the service.
+        self.restart_pending = True
 
     def write_configs(self):
         """
@@ -7,9 +7,14 @@ This is some of the code behind 'cobbler sync'.
 # SPDX-FileCopyrightText: Michael DeHaan <michael.dehaan AT gmail>
 # SPDX-FileCopyrightText: John Eckersberg <jeckersb@redhat.com>
 
+import hashlib
+import ipaddress
+import json
+import os
 import re
 import socket
 import time
+from typing import Dict, List, Optional, Set, Tuple
 
 from cobbler import utils
 from cobbler.cexceptions import CX
@@ -40,6 +45,12 @@ class _BindManager(ManagerModule):
 
         self.settings_file = utils.namedconf_location()
         self.zonefile_base = self.settings.bind_zonefile_path + "/"
+        # this could be a config option too
+        self.serial_file = "/var/lib/cobbler/bind_serial"
+        # The DNS records per system uid together with the cache key they were built for.
+        self.fragment_cache: Dict[str, tuple] = {}
+        # The digest of the inputs of each zone file when it was last rendered.
+        self.zone_digests: Dict[str, str] = {}
 
     def regen_hosts(self):
         """
@@ -85,170 +96,249 @@ class _BindManager(ManagerModule):
             expanded_address = expanded_address[:-1]
         return expanded_address
 
-    def __forward_zones(self):
+    def __configured_zones(self) -> Tuple[List[str], List[str]]:
         """
-        Returns a map of zones and the records that belong in them
+        Get the forward and reverse zones which are managed by Cobbler.
+
+        :return: The forward zones and the reverse zones. IPv6 reverse zones are expanded to the format
+                 ``xxxx:xxxx:xxxx:xxxx``.
         """
-        zones = {}
         forward_zones = self.settings.manage_forward_zones
         if not isinstance(forward_zones, list):
             # Gracefully handle when user inputs only a single zone as a string instead of a list with only a single
             # item
             forward_zones = [forward_zones]
 
-        for zone in forward_zones:
-            zones[zone] = {}
+        reverse_zones = []
+        configured_reverse_zones = self.settings.manage_reverse_zones
+        if not isinstance(configured_reverse_zones, list):
+            # Gracefully handle when user inputs only a single zone as a string instead of a list with only a single
+            # item
+            configured_reverse_zones = [configured_reverse_zones]
+        for zone in configured_reverse_zones:
+            # expand and IPv6 zones
+            if ":" in zone:
+                zone = (self.__expand_ipv6(zone + "::1"))[:19]
+            reverse_zones.append(zone)
+
+        return list(forward_zones), reverse_zones
 
-        for system in self.systems:
-            for (_, interface) in system.interfaces.items():
-                host = interface.dns_name
-                ipv4 = interface.ip_address
-                ipv6 = interface.ipv6_address
-                ipv6_sec_addrs = interface.ipv6_secondaries
-                if not system.is_management_supported(cidr_ok=False):
-                    continue
-                if not host:
-                    # gotsta have some dns_name and ip or else!
-                    continue
-                if host.find(".") == -1:
-                    continue
+    def __reverse_v4_index(
+        self, reverse_zones: List[str]
+    ) -> Dict[ipaddress.IPv4Network, str]:
+        """
+        Map the networks of the IPv4 reverse zones to the zone names. The zone "192.168.1" is the network
+        192.168.1.0/24.
 
-                # Match the longest zone! E.g. if you have a host a.b.c.d.e
-                # if manage_forward_zones has:
-                # - c.d.e
-                # - b.c.d.e
-                # then a.b.c.d.e should go in b.c.d.e
-                best_match = ""
-                for zone in zones:
-                    if re.search(rf"\.{zone}$", host) and len(zone) > len(best_match):
-                        best_match = zone
-
-                # no match
-                if best_match == "":
-                    continue
+        :param reverse_zones: The configured reverse zones.
+        :return: The zone names by network.
+        """
+        index = {}
+        for zone in reverse_zones:
+            if ":" in zone:
+                continue
+            octets = zone.split(".")
+            try:
+                network = ipaddress.IPv4Network(
+                    (".".join(octets + ["0"] * (4 - len(octets))), 8 * len(octets))
+                )
+            except ValueError:
+                self.logger.warning(
+                    'Reverse zone "%s" is not a prefix of an IPv4 address', zone
+                )
+                continue
+            index[network] = zone
+        return index
+
+    @staticmethod
+    def __match_forward_zone(host: str, forward_zones: Set[str]) -> Optional[str]:
+        """
+        Find the zone of a host. The longest zone wins, e.g. if ``manage_forward_zones`` contains "c.d.e" and "b.c.d.e"
+        then the host "a.b.c.d.e" goes in "b.c.d.e".
+
+        :param host: The fully qualified host name.
+        :param forward_zones: The configured forward zones.
+        :return: The matching zone or None.
+        """
+        labels = host.split(".")
+        for index in range(1, len(labels)):
+            zone = ".".join(labels[index:])
+            if zone in forward_zones:
+                return zone
+        return None
+
+    @staticmethod
+    def __match_reverse_v4_zone(
+        ip_address: str, index: Dict[ipaddress.IPv4Network, str]
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Find the reverse zone of an IPv4 address. The longest zone wins, e.g. if ``manage_reverse_zones`` contains "1.2"
+        and "1.2.3" then the address 1.2.3.4 goes in "1.2.3".
+
+        :param ip_address: The IPv4 address.
+        :param index: The zone names by network.
+        :return: The matching zone and the name of the record in the zone or None.
+        """
+        try:
+            address = ipaddress.IPv4Address(ip_address)
+        except ValueError:
+            return None
+        for prefix_length in sorted(
+            {network.prefixlen for network in index}, reverse=True
+        ):
+            zone = index.get(
+                ipaddress.IPv4Network(f"{address}/{prefix_length}", strict=False)
+            )
+            if zone is not None:
+                # the remaining octets are reversed
+                tokens = str(address).split(".")[prefix_length // 8 :]
+                tokens.reverse()
+                return zone, ".".join(tokens)
+        return None
+
+    def __build_records(
+        self,
+        system,
+        forward_zones: Set[str],
+        reverse_zones: Set[str],
+        reverse_v4_index: Dict[ipaddress.IPv4Network, str],
+    ) -> Tuple[List[tuple], List[tuple], str]:
+        """
+        Build the DNS records of a single system.
+
+        :param system: The system to build the records for.
+        :param forward_zones: The configured forward zones.
+        :param reverse_zones: The configured reverse zones.
+        :param reverse_v4_index: The IPv4 reverse zones by network.
+        :return: The forward records as tuples of zone, name and IP addresses, the reverse records as tuples of zone,
+                 name and host and the CNAME records.
+        """
+        forward_records = []
+        reverse_records = []
+        cname_records = ""
+        management_supported = system.is_management_supported(cidr_ok=False)
+
+        for (_, interface) in system.interfaces.items():
+            host = interface.dns_name
+            ipv4 = interface.ip_address
+            ipv6 = interface.ipv6_address
+            ipv6_sec_addrs = interface.ipv6_secondaries
+
+            # This warns and skips the host without dns_name instead of outright exiting which results in empty records
+            # without any warning to the users
+            if host == "":
+                self.logger.info(
+                    "Warning: dns_name unspecified in the system: %s, while writing host records",
+                    system.name,
+                )
+                self.logger.warning(
+                    'CNAME generation for system "%s" was skipped due to a missing dns_name entry while writing'
+                    "records!",
+                    system.name,
+                )
+            else:
+                dnsname = host.split(".")[0]
+                for cname in interface.cnames:
+                    cname_records += f"{cname.split('.')[0]}  CNAME  {dnsname};\n"
+
+            if not management_supported or not host:
+                # gotsta have some dns_name and ip or else!
+                continue
 
+            zone = self.__match_forward_zone(host, forward_zones)
+            if zone is not None:
                 # strip the zone off the dns_name
-                host = re.sub(rf"\.{best_match}$", "", host)
+                name = host[: -len(zone) - 1]
 
                 # if we are to manage ipmi hosts, add that too
-                if self.settings.bind_manage_ipmi:
-                    if system.power_address != "":
+                if self.settings.bind_manage_ipmi and system.power_address != "":
+                    # see if the power address is an IP
+                    try:
+                        socket.inet_aton(system.power_address)
+                        power_address_is_ip = True
+                    except socket.error:
                         power_address_is_ip = False
-                        # see if the power address is an IP
-                        try:
-                            socket.inet_aton(system.power_address)
-                            power_address_is_ip = True
-                        except socket.error:
-                            power_address_is_ip = False
-
-                        # if the power address is an IP, then add it to the DNS with the host suffix of "-ipmi"
-                        # TODO: Perhpas the suffix can be configurable through settings?
-                        if power_address_is_ip:
-                            ipmi_host = host + "-ipmi"
-                            ipmi_ips = []
-                            ipmi_ips.append(system.power_address)
-                            try:
-                                zones[best_match][ipmi_host] = (
-                                    ipmi_ips + zones[best_match][ipmi_host]
-                                )
-                            except KeyError:
-                                zones[best_match][ipmi_host] = ipmi_ips
+
+                    # if the power address is an IP, then add it to the DNS with the host suffix of "-ipmi"
+                    # TODO: Perhpas the suffix can be configurable through settings?
+                    if power_address_is_ip:
+                        forward_records.append(
+                            (zone, name + "-ipmi", [system.power_address])
+                        )
 
                 # Create a list of IP addresses for this host
                 ips = []
                 if ipv4:
                     ips.append(ipv4)
-
                 if ipv6:
                     ips.append(ipv6)
-
                 if ipv6_sec_addrs:
                     ips += ipv6_sec_addrs
-
                 if ips:
-                    try:
-                        zones[best_match][host] = ips + zones[best_match][host]
-                    except KeyError:
-                        zones[best_match][host] = ips
+                    forward_records.append((zone, name, ips))
+
+            if not ipv4 and not ipv6:
+                continue
+
+            if ipv4:
+                match = self.__match_reverse_v4_zone(ipv4, reverse_v4_index)
+                if match is not None:
+                    reverse_records.append((match[0], match[1], host + "."))
+
+            for each_ipv6 in ([ipv6] if ipv6 else []) + ipv6_sec_addrs:
+                # convert the IPv6 address to long format
+                long_ipv6 = self.__expand_ipv6(each_ipv6)
+                # All IPv6 zones are forced to have the format xxxx:xxxx:xxxx:xxxx
+                zone = long_ipv6[:19]
+                if zone not in reverse_zones:
+                    continue
+                tokens = list(long_ipv6[20:].replace(":", ""))
+                tokens.reverse()
+                reverse_records.append((zone, ".".join(tokens), host + "."))
 
-        return zones
+        return forward_records, reverse_records, cname_records
 
-    def __reverse_zones(self):
+    def __collect_records(self) -> Tuple[Dict[str, dict], Dict[str, dict], str]:
         """
-        Returns a map of zones and the records that belong in them
+        Collect the records of all systems and sort them into the configured zones. The records of a system are cached
+        and only rebuilt when the system, one of its parents or the settings changed.
 
-        :return: A dict with all zones.
+        :return: The forward zones and the reverse zones with their records and the CNAME records.
         """
-        zones = {}
-        reverse_zones = self.settings.manage_reverse_zones
-        if not isinstance(reverse_zones, list):
-            # Gracefully handle when user inputs only a single zone as a string instead of a list with only a single
-            # item
-            reverse_zones = [reverse_zones]
-
-        for zone in reverse_zones:
-            # expand and IPv6 zones
-            if ":" in zone:
-                zone = (self.__expand_ipv6(zone + "::1"))[:19]
-            zones[zone] = {}
+        forward_zones, reverse_zones = self.__configured_zones()
+        forward = {zone: {} for zone in forward_zones}
+        reverse = {zone: {} for zone in reverse_zones}
+        zone_index = (
+            set(forward_zones),
+            set(reverse_zones),
+            self.__reverse_v4_index(reverse_zones),
+        )
+        cname_records = []
+        fragments = {}
 
         for system in self.systems:
-            for (_, interface) in system.interfaces.items():
-                host = interface.dns_name
-                ip_address = interface.ip_address
-                ipv6 = interface.ipv6_address
-                ipv6_sec_addrs = interface.ipv6_secondaries
-                if not system.is_management_supported(cidr_ok=False):
-                    continue
-                if not host or ((not ip_address) and (not ipv6)):
-                    # gotta have some dns_name and ip or else!
-                    continue
-
-                if ip_address:
-                    # Match the longest zone! E.g. if you have an ip 1.2.3.4
-                    # if manage_reverse_zones has:
-                    # - 1.2
-                    # - 1.2.3
-                    # then 1.2.3.4 should go in 1.2.3
-                    best_match = ""
-                    for zone in zones:
-                        if re.search(rf"^{zone}\.", ip_address) and len(zone) > len(
-                            best_match
-                        ):
-                            best_match = zone
-
-                    if best_match != "":
-                        # strip the zone off the front of the ip reverse the rest of the octets append the remainder
-                        # + dns_name
-                        ip_address = ip_address.replace(best_match, "", 1)
-                        if ip_address[0] == ".":  # strip leading '.' if it's there
-                            ip_address = ip_address[1:]
-                        tokens = ip_address.split(".")
-                        tokens.reverse()
-                        ip_address = ".".join(tokens)
-                        zones[best_match][ip_address] = host + "."
-
-                if ipv6 or ipv6_sec_addrs:
-                    ip6s = []
-                    if ipv6:
-                        ip6s.append(ipv6)
-                    for each_ipv6 in ip6s + ipv6_sec_addrs:
-                        # convert the IPv6 address to long format
-                        long_ipv6 = self.__expand_ipv6(each_ipv6)
-                        # All IPv6 zones are forced to have the format xxxx:xxxx:xxxx:xxxx
-                        zone = long_ipv6[:19]
-                        ipv6_host_part = long_ipv6[20:]
-                        tokens = list(re.sub(":", "", ipv6_host_part))
-                        tokens.reverse()
-                        ip_address = ".".join(tokens)
-                        zones[zone][ip_address] = host + "."
-
-        return zones
-
-    def __write_named_conf(self):
+            key = system.resolve_cache_key()
+            fragment = self.fragment_cache.get(system.uid)
+            if fragment is None or fragment[0] != key:
+                fragment = (key, *self.__build_records(system, *zone_index))
+            fragments[system.uid] = fragment
+
+            for (zone, name, ips) in fragment[1]:
+                forward[zone][name] = ips + forward[zone].get(name, [])
+            for (zone, name, host) in fragment[2]:
+                reverse[zone][name] = host
+            cname_records.append(fragment[3])
+
+        # Systems which were removed are dropped from the cache.
+        self.fragment_cache = fragments
+        return forward, reverse, "".join(cname_records)
+
+    def __write_named_conf(self, forward_zones: List[str], reverse_zones: List[str]):
         """
         Write out the named.conf main config file from the template.
 
+        :param forward_zones: The managed forward zones.
+        :param reverse_zones: The managed reverse zones.
         :raises OSError
         """
         settings_file = self.settings.bind_chroot_path + self.settings_file
@@ -257,7 +347,7 @@ class _BindManager(ManagerModule):
         # reverse_zones = self.settings.manage_reverse_zones
 
         metadata = {
-            "forward_zones": self.__forward_zones().keys(),
+            "forward_zones": forward_zones,
             "reverse_zones": [],
             "zone_include": "",
         }
@@ -271,7 +361,7 @@ zone "{zone}." {{
 """
             metadata["zone_include"] = metadata["zone_include"] + txt
 
-        for zone in self.__reverse_zones():
+        for zone in reverse_zones:
             # IPv6 zones are : delimited
             if ":" in zone:
                 # if IPv6, assume xxxx:xxxx:xxxx:xxxx
@@ -309,9 +399,14 @@ zone "%(arpa)s." {
         self.logger.info("generating %s", settings_file)
         self.templar.render(template_data, metadata, settings_file)
 
-    def __write_secondary_conf(self):
+    def __write_secondary_conf(
+        self, forward_zones: List[str], reverse_zones: List[str]
+    ):
         """
         Write out the secondary.conf secondary config file from the template.
+
+        :param forward_zones: The managed forward zones.
+        :param reverse_zones: The managed reverse zones.
         """
         settings_file = self.settings.bind_chroot_path + "/etc/secondary.conf"
         template_file = "/etc/cobbler/secondary.template"
@@ -319,7 +414,7 @@ zone "%(arpa)s." {
         # reverse_zones = self.settings.manage_reverse_zones
 
         metadata = {
-            "forward_zones": self.__forward_zones().keys(),
+            "forward_zones": forward_zones,
             "reverse_zones": [],
             "zone_include": "",
         }
@@ -339,7 +434,7 @@ zone "%(zone)s." {
             }
             metadata["zone_include"] = metadata["zone_include"] + txt
 
-        for zone in self.__reverse_zones():
+        for zone in reverse_zones:
             # IPv6 zones are : delimited
             if ":" in zone:
                 # if IPv6, assume xxxx:xxxx:xxxx:xxxx for the zone
@@ -422,18 +517,6 @@ zone "%(arpa)s." {
         :param rclass: The record class.
         :return: A string with all pretty printed hosts.
         """
-
-        # Warns on hosts without dns_name, need to iterate over system to name the
-        # particular system
-
-        for system in self.systems:
-            for (name, interface) in system.interfaces.items():
-                if interface.dns_name == "":
-                    self.logger.info(
-                        "Warning: dns_name unspecified in the system: %s, while writing host records",
-                        system.name,
-                    )
-
         names = [k for k, v in hosts.items()]
         if not names:
             return ""  # zones with no hosts
@@ -465,68 +548,62 @@ zone "%(arpa)s." {
                 result += f"{my_name}  {rclass}  {my_rectype}  {my_host};\n"
         return result
 
-    def __pretty_print_cname_records(self, hosts, rectype: str = "CNAME"):
-        """
-        Format CNAMEs and with consistent indentation
-
-        :param hosts: This parameter is currently unused.
-        :param rectype: The type of record which shall be pretty printed.
-        :return: The pretty printed version of the cname records.
+    def __next_serial(self) -> str:
         """
-        result = ""
-
-        # This loop warns and skips the host without dns_name instead of outright exiting
-        # Which results in empty records without any warning to the users
-
-        for system in self.systems:
-            for (_, interface) in system.interfaces.items():
-                cnames = interface.cnames
-
-                try:
-                    if interface.dns_name != "":
-                        dnsname = interface.dns_name.split(".")[0]
-                        for cname in cnames:
-                            result += f"{cname.split('.')[0]}  {rectype}  {dnsname};\n"
-                    else:
-                        self.logger.warning(
-                            'CNAME generation for system "%s" was skipped due to a missing dns_name entry while writing'
-                            "records!",
-                            system.name,
-                        )
-                        continue
-                except Exception as exception:
-                    self.logger.exception(
-                        "Unspecified error during creation of CNAME for bind9 records!",
-                        exc_info=exception,
-                    )
-
-        return result
+        Compute the next serial of the zones. The serial has the format ``YYYYMMDDnn`` with a counter for the changes
+        on the same day.
 
-    def __write_zone_files(self):
-        """
-        Write out the forward and reverse zone files for all configured zones
+        :return: The new serial.
         """
-        default_template_file = "/etc/cobbler/zone.template"
-        cobbler_server = self.settings.server
-        # this could be a config option too
-        serial_filename = "/var/lib/cobbler/bind_serial"
-        # need a counter for new bind format
         serial = time.strftime("%Y%m%d00")
         try:
-            with open(serial_filename, "r", encoding="UTF-8") as serialfd:
+            with open(self.serial_file, "r", encoding="UTF-8") as serialfd:
                 old_serial = serialfd.readline()
                 # same date
                 if serial[0:8] == old_serial[0:8]:
                     if int(old_serial[8:10]) < 99:
-                        serial = f"{serial[0:8]}{int(old_serial[8:10]) + 1:.2d}"
+                        serial = f"{serial[0:8]}{int(old_serial[8:10]) + 1:02d}"
         except Exception:
             pass
+        return serial
 
-        with open(serial_filename, "w", encoding="UTF-8") as serialfd:
-            serialfd.write(serial)
+    def __zone_unchanged(
+        self, template_data: str, metadata: dict, zonefilename: str
+    ) -> bool:
+        """
+        Check if a zone file which was written before Cobbler was started has the content it would get with the current
+        serial.
+
+        :param template_data: The template of the zone file.
+        :param metadata: The metadata for the template without the serial.
+        :param zonefilename: The path of the zone file.
+        :return: True if the zone file doesn't need to be rewritten.
+        """
+        try:
+            with open(self.serial_file, "r", encoding="UTF-8") as serialfd:
+                serial = serialfd.readline().strip()
+            with open(zonefilename, "r", encoding="UTF-8") as zonefd:
+                zone_data = zonefd.read()
+        except OSError:
+            return False
+        return (
+            self.templar.render(template_data, dict(metadata, serial=serial), None)
+            == zone_data
+        )
+
+    def __write_zone_files(
+        self, forward: Dict[str, dict], reverse: Dict[str, dict], cname_records: str
+    ):
+        """
+        Write out the forward and reverse zone files for all configured zones. Only the zones whose records, template or
+        settings changed are rendered and get a new serial.
 
-        forward = self.__forward_zones()
-        reverse = self.__reverse_zones()
+        :param forward: The forward zones with their records.
+        :param reverse: The reverse zones with their records.
+        :param cname_records: The CNAME records which are added to all zones.
+        """
+        default_template_file = "/etc/cobbler/zone.template"
+        cobbler_server = self.settings.server
 
         try:
             with open(default_template_file, "r", encoding="UTF-8") as template_fd:
@@ -537,17 +614,9 @@ zone "%(arpa)s." {
             ) from error
 
         zonefileprefix = self.settings.bind_chroot_path + self.zonefile_base
+        zone_files = []
 
         for (zone, hosts) in forward.items():
-            metadata = {
-                "cobbler_server": cobbler_server,
-                "serial": serial,
-                "zonename": zone,
-                "zonetype": "forward",
-                "cname_record": "",
-                "host_record": "",
-            }
-
             if ":" in zone:
                 long_zone = (self.__expand_ipv6(zone + "::1"))[:19]
                 tokens = list(re.sub(":", "", long_zone))
@@ -578,23 +647,16 @@ zone "%(arpa)s." {
                 else:
                     template_data = default_template_data
 
-            metadata["cname_record"] = self.__pretty_print_cname_records(hosts)
-            metadata["host_record"] = self.__pretty_print_host_records(hosts)
-
-            zonefilename = zonefileprefix + zone
-            self.logger.info("generating (forward) %s", zonefilename)
-            self.templar.render(template_data, metadata, zonefilename)
-
-        for (zone, hosts) in reverse.items():
             metadata = {
                 "cobbler_server": cobbler_server,
-                "serial": serial,
                 "zonename": zone,
-                "zonetype": "reverse",
-                "cname_record": "",
-                "host_record": "",
+                "zonetype": "forward",
+                "cname_record": cname_records,
+                "host_record": self.__pretty_print_host_records(hosts),
             }
+            zone_files.append((zone, template_data, metadata))
 
+        for (zone, hosts) in reverse.items():
             # grab zone-specific template if it exists
             try:
                 with open(
@@ -604,23 +666,55 @@ zone "%(arpa)s." {
             except Exception:
                 template_data = default_template_data
 
-            metadata["cname_record"] = self.__pretty_print_cname_records(hosts)
-            metadata["host_record"] = self.__pretty_print_host_records(
-                hosts, rectype="PTR"
-            )
+            metadata = {
+                "cobbler_server": cobbler_server,
+                "zonename": zone,
+                "zonetype": "reverse",
+                "cname_record": cname_records,
+                "host_record": self.__pretty_print_host_records(hosts, rectype="PTR"),
+            }
+            zone_files.append((zone, template_data, metadata))
 
+        changed_zones = []
+        for (zone, template_data, metadata) in zone_files:
             zonefilename = zonefileprefix + zone
-            self.logger.info("generating (reverse) %s", zonefilename)
-            self.templar.render(template_data, metadata, zonefilename)
+            digest = hashlib.sha256(
+                json.dumps([template_data, metadata], sort_keys=True).encode("UTF-8")
+            ).hexdigest()
+            if zonefilename not in self.zone_digests and self.__zone_unchanged(
+                template_data, metadata, zonefilename
+            ):
+                self.zone_digests[zonefilename] = digest
+            if self.zone_digests.get(zonefilename) == digest and os.path.exists(
+                zonefilename
+            ):
+                continue
+            changed_zones.append((zonefilename, template_data, metadata, digest))
+
+        if not changed_zones:
+            self.logger.info("DNS zones are up to date")
+            return
+
+        # need a counter for new bind format
+        serial = self.__next_serial()
+        with open(self.serial_file, "w", encoding="UTF-8") as serialfd:
+            serialfd.write(serial)
+
+        for (zonefilename, template_data, metadata, digest) in changed_zones:
+            self.logger.info("generating (%s) %s", metadata["zonetype"], zonefilename)
+            self.templar.render(
+                template_data, dict(metadata, serial=serial), zonefilename
+            )
+            self.zone_digests[zonefilename] = digest
 
     def write_configs(self):
         """
         BIND files are written when ``manage_dns`` is set in our settings.
         """
-
-        self.__write_named_conf()
-        self.__write_secondary_conf()
-        self.__write_zone_files()
+        forward, reverse, cname_records = self.__collect_records()
+        self.__write_named_conf(list(forward.keys()), list(reverse.keys()))
+        self.__write_secondary_conf(list(forward.keys()), list(reverse.keys()))
+        self.__write_zone_files(forward, reverse, cname_records)
 
     def restart_service(self):
         """
@@ -7,9 +7,13 @@ This is some of the code behind 'cobbler sync'.
 # SPDX-FileCopyrightText: Michael DeHaan <michael.dehaan AT gmail>
 # SPDX-FileCopyrightText: John Eckersberg <jeckersb@redhat.com>
 
+import hashlib
+import json
+import os
 import time
+from typing import Callable, Dict, List, Optional, Tuple
 
-from cobbler.utils import process_management
+from cobbler.utils import filesystem_helpers, process_management
 from cobbler.manager import ManagerModule
 
 MANAGER = None
@@ -38,9 +42,86 @@ class _DnsmasqManager(ManagerModule):
         """
         return "dnsmasq"
 
+    def __init__(self, api):
+        super().__init__(api)
+        # The generated lines per file and system uid together with the cache key they were built for.
+        self.fragment_cache: Dict[str, Dict[str, tuple]] = {"dhcp": {}, "ethers": {}}
+        self.__rendered_digest: Optional[str] = None
+
+    def __collect_fragments(self, name: str, build_fragment: Callable) -> list:
+        """
+        Collect the fragments of all systems for one generated file. The fragment of a system is cached and only
+        rebuilt when the system, one of its parents or the settings changed.
+
+        :param name: The name of the fragment cache.
+        :param build_fragment: The method which builds the fragment of a single system.
+        :return: The fragments in the order of the systems.
+        """
+        cache = self.fragment_cache[name]
+        fragments = {}
+        for system in self.systems:
+            if not system.is_management_supported(cidr_ok=False):
+                continue
+            key = system.resolve_cache_key()
+            fragment = cache.get(system.uid)
+            if fragment is None or fragment[0] != key:
+                fragment = (key, build_fragment(system))
+            fragments[system.uid] = fragment
+        # Systems which were removed are dropped from the cache.
+        self.fragment_cache[name] = fragments
+        return [fragment[1] for fragment in fragments.values()]
+
+    @staticmethod
+    def __build_dhcp_hosts(system) -> List[Tuple[str, str]]:
+        """
+        Build the ``dhcp-host`` lines of a single system.
+
+        :param system: The system to build the lines for.
+        :return: The lines together with the DHCP tag of their interface.
+        """
+        lines = []
+        profile = system.get_conceptual_parent()
+        distro = profile.get_conceptual_parent()
+        for interface in system.interfaces.values():
+
+            mac = interface.mac_address
+            ip_address = interface.ip_address
+            host = interface.dns_name
+            ipv6 = interface.ipv6_address
+
+            if not mac:
+                # can't write a DHCP entry for this system
+                continue
+
+            # In many reallife situations there is a need to control the IP address and hostname for a specific
+            # client when only the MAC address is available. In addition to that in some scenarios there is a need
+            # to explicitly label a host with the applicable architecture in order to correctly handle situations
+            # where we need something other than ``pxelinux.0``. So we always write a dhcp-host entry with as much
+            # info as possible to allow maximum control and flexibility within the dnsmasq config.
+
+            systxt = "dhcp-host=net:" + distro.arch.value.lower() + "," + mac
+
+            if host != "":
+                systxt += "," + host
+
+            if ip_address != "":
+                systxt += "," + ip_address
+            if ipv6 != "":
+                systxt += f",[{ipv6}]"
+
+            systxt += "\n"
+
+            dhcp_tag = interface.dhcp_tag
+            if dhcp_tag == "":
+                dhcp_tag = "default"
+
+            lines.append((dhcp_tag, systxt))
+        return lines
+
     def write_configs(self):
         """
-        DHCP files are written when ``manage_dhcp`` is set in our settings.
+        DHCP files are written when ``manage_dhcp`` is set in our settings. The file is only rendered if one of the
+        systems, the template or the settings changed since it was last rendered.
 
         :raises OSError
         """
@@ -59,54 +140,18 @@ class _DnsmasqManager(ManagerModule):
         # we used to just loop through each system, but now we must loop
         # through each network interface of each system.
 
-        for system in self.systems:
-
-            if not system.is_management_supported(cidr_ok=False):
-                continue
-
-            profile = system.get_conceptual_parent()
-            distro = profile.get_conceptual_parent()
-            for interface in system.interfaces.values():
-
-                mac = interface.mac_address
-                ip_address = interface.ip_address
-                host = interface.dns_name
-                ipv6 = interface.ipv6_address
-
-                if not mac:
-                    # can't write a DHCP entry for this system
-                    continue
-
-                # In many reallife situations there is a need to control the IP address and hostname for a specific
-                # client when only the MAC address is available. In addition to that in some scenarios there is a need
-                # to explicitly label a host with the applicable architecture in order to correctly handle situations
-                # where we need something other than ``pxelinux.0``. So we always write a dhcp-host entry with as much
-                # info as possible to allow maximum control and flexibility within the dnsmasq config.
-
-                systxt = "dhcp-host=net:" + distro.arch.value.lower() + "," + mac
-
-                if host != "":
-                    systxt += "," + host
-
-                if ip_address != "":
-                    systxt += "," + ip_address
-                if ipv6 != "":
-                    systxt += f",[{ipv6}]"
-
-                systxt += "\n"
-
-                dhcp_tag = interface.dhcp_tag
-                if dhcp_tag == "":
-                    dhcp_tag = "default"
-
+        for lines in self.__collect_fragments("dhcp", self.__build_dhcp_hosts):
+            for (dhcp_tag, systxt) in lines:
                 if dhcp_tag not in system_definitions:
-                    system_definitions[dhcp_tag] = ""
-                system_definitions[dhcp_tag] = system_definitions[dhcp_tag] + systxt
+                    system_definitions[dhcp_tag] = []
+                system_definitions[dhcp_tag].append(systxt)
 
         # We are now done with the looping through each interface of each system.
 
         metadata = {
-            "insert_cobbler_system_definitions": system_definitions.get("default", ""),
+            "insert_cobbler_system_definitions": "".join(
+                system_definitions.get("default", [])
+            ),
             "date": time.asctime(time.gmtime()),
             "cobbler_server": self.settings.server,
             "next_server_v4": self.settings.next_server_v4,
@@ -117,11 +162,41 @@ class _DnsmasqManager(ManagerModule):
         for system in list(system_definitions.keys()):
             if system == "default":
                 continue
-            metadata[
-                f"insert_cobbler_system_definitions_{system}"
-            ] = system_definitions[system]
+            metadata[f"insert_cobbler_system_definitions_{system}"] = "".join(
+                system_definitions[system]
+            )
+
+        inputs = {key: value for key, value in metadata.items() if key != "date"}
+        digest = hashlib.sha256(
+            json.dumps([template_data, inputs], sort_keys=True).encode("UTF-8")
+        ).hexdigest()
+        if self.__rendered_digest == digest and os.path.exists(settings_file):
+            self.logger.info("%s is up to date", settings_file)
+            return
 
-        self.templar.render(template_data, metadata, settings_file)
+        data = self.templar.render(template_data, metadata, None)
+        if filesystem_helpers.write_file(settings_file, data):
+            self.restart_pending = True
+        self.__rendered_digest = digest
+
+    @staticmethod
+    def __build_ethers(system) -> str:
+        """
+        Build the lines of a single system in the ethers file.
+
+        :param system: The system to build the lines for.
+        :return: The lines of the system.
+        """
+        lines = []
+        for interface in system.interfaces.values():
+            mac = interface.mac_address
+            ip_address = interface.ip_address
+            if not mac:
+                # can't write this w/o a MAC address
+                continue
+            if ip_address is not None and ip_address != "":
+                lines.append(mac.upper() + "\t" + ip_address + "\n")
+        return "".join(lines)
 
     def regen_ethers(self):
         """
@@ -130,63 +205,54 @@ class _DnsmasqManager(ManagerModule):
         """
         # dnsmasq knows how to read this database of MACs -> IPs, so we'll keep it up to date every time we add a
         # system.
-        with open("/etc/ethers", "w+", encoding="UTF-8") as ethers_fh:
-            for system in self.systems:
-                if not system.is_management_supported(cidr_ok=False):
-                    continue
-                for interface in system.interfaces.values():
-                    mac = interface.mac_address
-                    ip_address = interface.ip_address
-                    if not mac:
-                        # can't write this w/o a MAC address
-                        continue
-                    if ip_address is not None and ip_address != "":
-                        ethers_fh.write(mac.upper() + "\t" + ip_address + "\n")
+        ethers = "".join(self.__collect_fragments("ethers", self.__build_ethers))
+        if filesystem_helpers.write_file("/etc/ethers", ethers):
+            self.restart_pending = True
 
     def regen_hosts(self):
         """
         This rewrites the hosts file and thus also rewrites the dns config.
         """
         # dnsmasq knows how to read this database for host info (other things may also make use of this later)
-        with open(
-            "/var/lib/cobbler/cobbler_hosts", "w+", encoding="UTF-8"
-        ) as regen_hosts_fd:
-            for system in self.systems:
-                if not system.is_management_supported(cidr_ok=False):
+        lines = []
+        for system in self.systems:
+            if not system.is_management_supported(cidr_ok=False):
+                continue
+            for (_, interface) in system.interfaces.items():
+                mac = interface.mac_address
+                host = interface.dns_name
+                ipv4 = interface.ip_address
+                ipv6 = interface.ipv6_address
+                if not mac:
                     continue
-                for (_, interface) in system.interfaces.items():
-                    mac = interface.mac_address
-                    host = interface.dns_name
-                    ipv4 = interface.ip_address
-                    ipv6 = interface.ipv6_address
-                    if not mac:
-                        continue
-                    if (
-                        host is not None
-                        and host != ""
-                        and ipv6 is not None
-                        and ipv6 != ""
-                    ):
-                        regen_hosts_fd.write(ipv6 + "\t" + host + "\n")
-                    elif (
-                        host is not None
-                        and host != ""
-                        and ipv4 is not None
-                        and ipv4 != ""
-                    ):
-                        regen_hosts_fd.write(ipv4 + "\t" + host + "\n")
+                if host is not None and host != "" and ipv6 is not None and ipv6 != "":
+                    lines.append(ipv6 + "\t" + host + "\n")
+                elif (
+                    host is not None and host != "" and ipv4 is not None and ipv4 != ""
+                ):
+                    lines.append(ipv4 + "\t" + host + "\n")
+        if filesystem_helpers.write_file(
+            "/var/lib/cobbler/cobbler_hosts", "".join(lines)
+        ):
+            self.restart_pending = True
 
     def restart_service(self):
         """
-        This restarts the dhcp server and thus applied the newly written config files.
+        This restarts the dhcp server and thus applied the newly written config files. The restart is skipped if none of
+        the files changed since the last restart.
         """
         service_name = "dnsmasq"
         if self.settings.restart_dhcp:
+            if not self.restart_pending:
+                self.logger.info("%s config unchanged, not restarting", service_name)
+                return 0
             return_code_service_restart = process_management.service_restart(
                 service_name
             )
             if return_code_service_restart != 0:
                 self.logger.error("%s service failed", service_name)
+            else:
+                self.restart_pending = False
             return return_code_service_restart
 
 
@@ -15,7 +15,7 @@ from cobbler import tftpgen
 
 from cobbler.cexceptions import CX
 from cobbler.manager import ManagerModule
-from cobbler.utils import filesystem_helpers
+from cobbler.utils import filesystem_helpers, thread
 
 MANAGER = None
 
@@ -158,17 +158,50 @@ class _InTftpdManager(ManagerModule):
             system_objs.append(system_obj)
 
         menu_items = self.tftpgen.get_menu_items()
-        for system in system_objs:
-            self.sync_single_system(system, menu_items)
+        thread.run_workers(
+            self.api,
+            lambda system: self.sync_single_system(system, menu_items),
+            system_objs,
+        )
 
         self.logger.info("generating PXE menu structure")
         self.tftpgen.make_pxe_menu()
 
-    def sync(self, verbose: bool = True):
+    def __sync_system_incremental(self, system, menu_items, manifest, shared_inputs):
+        """
+        Write out the files of a system unless its inputs did not change since the last sync.
+
+        :param system: The system to write the files for.
+        :param menu_items: The menu items to pass to the templates.
+        :param manifest: The manifest of the current sync.
+        :param shared_inputs: The fingerprint of the inputs all systems share.
+        :return: The key of the system in the manifest, the fingerprint of its inputs and the written files. The files
+                 are None if the system was up to date.
+        """
+        key = f"system:{system.name}"
+        # The blended data is not used, because it contains all other children of the parents. So every system would be
+        # regenerated if one of its siblings changed.
+        system_inputs = [system.to_dict()]
+        parent = system.parent
+        while parent is not None:
+            parent_inputs = parent.to_dict()
+            parent_inputs.pop("children", None)
+            system_inputs.append(parent_inputs)
+            parent = parent.parent
+        inputs = manifest.fingerprint([shared_inputs, system_inputs])
+        if manifest.is_current(key, inputs):
+            return key, inputs, None
+        with filesystem_helpers.track_writes() as files:
+            self.tftpgen.write_all_system_files(system, menu_items)
+        return key, inputs, files
+
+    def sync(self, verbose: bool = True, manifest=None):
         """
         Write out all files to /tftpdboot
 
         :param verbose: Whether the tftp server should log this verbose or not.
+        :param manifest: If given, the files of systems whose inputs did not change since the last sync are not
+                         written again and the written files are recorded in the manifest.
         """
         self.tftpgen.verbose = verbose
         self.logger.info("copying bootloaders")
@@ -179,20 +212,61 @@ class _InTftpdManager(ManagerModule):
         # Adding in the exception handling to not blow up if files have been moved (or the path references an NFS
         # directory that's no longer mounted)
         for distro in self.distros:
-            try:
-                self.logger.info("copying files for distro: %s", distro.name)
-                self.tftpgen.copy_single_distro_files(distro, self.bootloc, False)
-            except CX as cobbler_exception:
-                self.logger.error(cobbler_exception.value)
+            key = f"tftp_distro:{distro.name}"
+            with filesystem_helpers.track_writes() as files:
+                try:
+                    self.logger.info("copying files for distro: %s", distro.name)
+                    self.tftpgen.copy_single_distro_files(distro, self.bootloc, False)
+                except CX as cobbler_exception:
+                    self.logger.error(cobbler_exception.value)
+                    # Keep the files of the last successful copy.
+                    files = None
+            if manifest is None:
+                continue
+            if files is None:
+                manifest.keep(key)
+            else:
+                manifest.update(key, None, files)
 
         self.logger.info("copying images")
-        self.tftpgen.copy_images()
+        with filesystem_helpers.track_writes() as files:
+            self.tftpgen.copy_images()
+        if manifest is not None:
+            manifest.update("tftp_images", None, files)
 
         # the actual pxelinux.cfg files, for each interface
         self.logger.info("generating PXE configuration files")
+        # The menu is only built after all workers are done.
         menu_items = self.tftpgen.get_menu_items()
-        for system in self.systems:
-            self.tftpgen.write_all_system_files(system, menu_items)
+        if manifest is None:
+            thread.run_workers(
+                self.api,
+                lambda system: self.tftpgen.write_all_system_files(system, menu_items),
+                list(self.systems),
+            )
+        else:
+            templates = glob.glob(
+                os.path.join(self.settings.boot_loader_conf_template_dir, "*")
+            )
+            shared_inputs = manifest.fingerprint(
+                [
+                    menu_items,
+                    {template: os.path.getmtime(template) for template in templates},
+                    self.settings.to_dict(),
+                ]
+            )
+            results = thread.run_workers(
+                self.api,
+                lambda system: self.__sync_system_incremental(
+                    system, menu_items, manifest, shared_inputs
+                ),
+                list(self.systems),
+            )
+            for key, inputs, files in results:
+                if files is None:
+                    manifest.keep(key)
+                else:
+                    manifest.update(key, inputs, files)
 
         self.logger.info("generating PXE menu structure")
         self.tftpgen.make_pxe_menu()
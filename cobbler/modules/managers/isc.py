@@ -7,12 +7,16 @@ This is some of the code behind 'cobbler sync'.
 # SPDX-FileCopyrightText: Michael DeHaan <michael.dehaan AT gmail>
 # SPDX-FileCopyrightText: John Eckersberg <jeckersb@redhat.com>
 
+import hashlib
+import json
+import os
 import shutil
 import time
+from typing import Callable, Dict, List, Tuple
 
 from cobbler import utils
 from cobbler import enums
-from cobbler.utils import process_management
+from cobbler.utils import filesystem_helpers, process_management
 from cobbler.enums import Archs
 from cobbler.manager import ManagerModule
 
@@ -41,175 +45,270 @@ class _IscManager(ManagerModule):
 
         self.settings_file_v4 = utils.dhcpconf_location(enums.DHCP.V4)
         self.settings_file_v6 = utils.dhcpconf_location(enums.DHCP.V6)
+        # The host entries per DHCP version and system uid together with the cache key they were built for.
+        self.fragment_cache: Dict[enums.DHCP, Dict[str, tuple]] = {
+            enums.DHCP.V4: {},
+            enums.DHCP.V6: {},
+        }
+        self.__rendered_digest = {enums.DHCP.V4: None, enums.DHCP.V6: None}
 
-    def write_v4_config(self, template_file="/etc/cobbler/dhcp.template"):
+    def __collect_entries(
+        self, version: enums.DHCP, build_entries: Callable
+    ) -> Tuple[Dict[str, Dict[str, dict]], str]:
         """
-        DHCPv4 files are written when ``manage_dhcp_v4`` is set in our settings.
+        Collect the host entries of all systems for the config file of one DHCP version. The entries of a system are
+        cached and only rebuilt when the system, one of its parents or the settings changed.
 
-        :param template_file: The location of the DHCP template.
+        :param version: The DHCP version the entries are collected for.
+        :param build_entries: The method which builds the entries of a single system.
+        :return: The interfaces grouped by DHCP tag and MAC address and a digest of all entries.
         """
-
-        blender_cache = {}
-
-        with open(template_file, "r", encoding="UTF-8") as template_fd:
-            template_data = template_fd.read()
+        cache = self.fragment_cache[version]
+        fragments = {}
+        digest = hashlib.sha256()
 
         # Use a simple counter for generating generic names where a hostname is not available.
         counter = 0
 
         # We used to just loop through each system, but now we must loop through each network interface of each system.
-        dhcp_tags = {"default": {}}
-
-        # FIXME: ding should evolve into the new dhcp_tags dict
-        ding = {}
+        dhcp_tags: Dict[str, Dict[str, dict]] = {"default": {}}
         ignore_macs = []
 
         for system in self.systems:
             if not system.is_management_supported(cidr_ok=False):
                 continue
 
-            profile = system.get_conceptual_parent()
-            distro = profile.get_conceptual_parent()
+            key = system.resolve_cache_key()
+            fragment = cache.get(system.uid)
+            if fragment is None or fragment[0] != key:
+                entries, system_ignore_macs = build_entries(system)
+                fragment_digest = hashlib.sha256(
+                    json.dumps(
+                        [entries, system_ignore_macs], sort_keys=True, default=str
+                    ).encode("UTF-8")
+                ).hexdigest()
+                fragment = (key, fragment_digest, entries, system_ignore_macs)
+            fragments[system.uid] = fragment
+            digest.update(fragment[1].encode("UTF-8"))
+
+            for (mac, dhcp_tag, interface, generic_name) in fragment[2]:
+                counter = counter + 1
+                if dhcp_tag is None:
+                    continue
+                if generic_name:
+                    interface = dict(interface, name=f"generic{counter:d}")
+                dhcp_tags.setdefault(dhcp_tag, {})[mac] = interface
+            ignore_macs.extend(fragment[3])
 
-            # if distro is None then the profile is really an image record
-            for (name, system_interface) in list(system.interfaces.items()):
+        # Systems which were removed are dropped from the cache.
+        self.fragment_cache[version] = fragments
 
-                # We make a copy because we may modify it before adding it to the dhcp_tags and we don't want to affect
-                # the master copy.
-                interface = system_interface.to_dict()
+        # Remove macs from redundant slave interfaces from dhcp_tags otherwise you get duplicate ip's in the installer.
+        for dhcp_tag_key in list(dhcp_tags.keys()):
+            for mac in list(dhcp_tags[dhcp_tag_key].keys()):
+                if mac in ignore_macs:
+                    del dhcp_tags[dhcp_tag_key][mac]
 
-                if interface["if_gateway"]:
-                    interface["gateway"] = interface["if_gateway"]
-                else:
-                    interface["gateway"] = system.gateway
-
-                mac = interface["mac_address"]
-
-                if interface["interface_type"] in (
-                    "bond_slave",
-                    "bridge_slave",
-                    "bonded_bridge_slave",
-                ):
-
-                    if interface["interface_master"] not in system.interfaces:
-                        # Can't write DHCP entry; master interface does not exist
-                        continue
-
-                    # We may have multiple bonded interfaces, so we need a composite index into ding.
-                    name_master = f"{system.name}-{interface['interface_master']}"
-                    if name_master not in ding:
-                        ding[name_master] = {interface["interface_master"]: []}
-
-                    if len(ding[name_master][interface["interface_master"]]) == 0:
-                        ding[name_master][interface["interface_master"]].append(mac)
-                    else:
-                        ignore_macs.append(mac)
-
-                    ip_address = system.interfaces[
-                        interface["interface_master"]
-                    ].ip_address
-                    netmask = system.interfaces[interface["interface_master"]].netmask
-                    dhcp_tag = system.interfaces[interface["interface_master"]].dhcp_tag
-                    host = system.interfaces[interface["interface_master"]].dns_name
-
-                    if ip_address is None or ip_address == "":
-                        for (interface_name, interface_object) in list(
-                            system.interfaces.items()
-                        ):
-                            if (
-                                interface_name.startswith(
-                                    interface["interface_master"] + "."
-                                )
-                                and interface_object.ip_address is not None
-                                and interface_object.ip_address != ""
-                            ):
-                                ip_address = interface_object.ip_address
-                                break
-
-                    interface["ip_address"] = ip_address
-                    interface["netmask"] = netmask
-                else:
-                    ip_address = interface["ip_address"]
-                    netmask = interface["netmask"]
-                    dhcp_tag = interface["dhcp_tag"]
-                    host = interface["dns_name"]
+        return dhcp_tags, digest.hexdigest()
 
-                if distro is not None:
-                    interface["distro"] = distro.to_dict()
+    def __write_config(
+        self,
+        version: enums.DHCP,
+        template_data: str,
+        metadata: dict,
+        settings_file: str,
+        entries_digest: str,
+    ):
+        """
+        Render a DHCP config file. Rendering is skipped if neither the template, the metadata nor the host entries
+        changed since the file was last rendered. A restart of the DHCP server is only flagged if the content of the
+        file changed.
+
+        :param version: The DHCP version of the config file.
+        :param template_data: The template of the config file.
+        :param metadata: The metadata for the template.
+        :param settings_file: The path of the config file.
+        :param entries_digest: The digest of the host entries in ``metadata``.
+        """
+        inputs = {
+            key: value
+            for key, value in metadata.items()
+            if key not in ("date", "dhcp_tags")
+        }
+        digest = hashlib.sha256(
+            json.dumps(
+                [template_data, inputs, entries_digest], sort_keys=True, default=str
+            ).encode("UTF-8")
+        ).hexdigest()
+        if self.__rendered_digest[version] == digest and os.path.exists(settings_file):
+            self.logger.info("%s is up to date", settings_file)
+            return
+
+        self.logger.info("generating %s", settings_file)
+        data = self.templar.render(template_data, metadata, None)
+        if filesystem_helpers.write_file(settings_file, data):
+            self.restart_pending = True
+        self.__rendered_digest[version] = digest
+
+    def __build_v4_entries(self, system) -> Tuple[List[tuple], List[str]]:
+        """
+        Build the DHCPv4 host entries of a single system.
 
-                if mac is None or mac == "":
-                    # can't write a DHCP entry for this system
+        :param system: The system to build the entries for.
+        :return: The entries as tuples of MAC address, DHCP tag (``None`` if the entry is not written), interface and
+                 whether the interface needs a generic name, and the MAC addresses of redundant slave interfaces.
+        """
+        profile = system.get_conceptual_parent()
+        distro = profile.get_conceptual_parent()
+        blended_system = None
+        entries = []
+
+        # FIXME: ding should evolve into the new dhcp_tags dict
+        ding = {}
+        ignore_macs = []
+
+        # if distro is None then the profile is really an image record
+        for (name, system_interface) in list(system.interfaces.items()):
+
+            # We make a copy because we may modify it before adding it to the dhcp_tags and we don't want to affect
+            # the master copy.
+            interface = system_interface.to_dict()
+
+            if interface["if_gateway"]:
+                interface["gateway"] = interface["if_gateway"]
+            else:
+                interface["gateway"] = system.gateway
+
+            mac = interface["mac_address"]
+
+            if interface["interface_type"] in (
+                "bond_slave",
+                "bridge_slave",
+                "bonded_bridge_slave",
+            ):
+
+                if interface["interface_master"] not in system.interfaces:
+                    # Can't write DHCP entry; master interface does not exist
                     continue
 
-                counter = counter + 1
+                # We may have multiple bonded interfaces, so we need a composite index into ding.
+                name_master = f"{system.name}-{interface['interface_master']}"
+                if name_master not in ding:
+                    ding[name_master] = {interface["interface_master"]: []}
 
-                # the label the entry after the hostname if possible
-                if host is not None and host != "":
-                    if name != "eth0":
-                        interface["name"] = f"{host}-{name}"
-                    else:
-                        interface["name"] = host
+                if len(ding[name_master][interface["interface_master"]]) == 0:
+                    ding[name_master][interface["interface_master"]].append(mac)
                 else:
-                    interface["name"] = f"generic{counter:d}"
+                    ignore_macs.append(mac)
+
+                ip_address = system.interfaces[interface["interface_master"]].ip_address
+                netmask = system.interfaces[interface["interface_master"]].netmask
+                dhcp_tag = system.interfaces[interface["interface_master"]].dhcp_tag
+                host = system.interfaces[interface["interface_master"]].dns_name
+
+                if ip_address is None or ip_address == "":
+                    for (interface_name, interface_object) in list(
+                        system.interfaces.items()
+                    ):
+                        if (
+                            interface_name.startswith(
+                                interface["interface_master"] + "."
+                            )
+                            and interface_object.ip_address is not None
+                            and interface_object.ip_address != ""
+                        ):
+                            ip_address = interface_object.ip_address
+                            break
+
+                interface["ip_address"] = ip_address
+                interface["netmask"] = netmask
+            else:
+                ip_address = interface["ip_address"]
+                netmask = interface["netmask"]
+                dhcp_tag = interface["dhcp_tag"]
+                host = interface["dns_name"]
+
+            if distro is not None:
+                interface["distro"] = distro.to_dict()
+
+            if mac is None or mac == "":
+                # can't write a DHCP entry for this system
+                continue
 
-                # add references to the system, profile, and distro for use in the template
-                if system.name in blender_cache:
-                    blended_system = blender_cache[system.name]
+            # the label the entry after the hostname if possible, generic names are assigned when the entries of all
+            # systems are collected
+            generic_name = False
+            if host is not None and host != "":
+                if name != "eth0":
+                    interface["name"] = f"{host}-{name}"
                 else:
-                    blended_system = utils.blender(self.api, False, system)
-                    blender_cache[system.name] = blended_system
-
-                interface["next_server_v4"] = blended_system["next_server_v4"]
-                interface["filename"] = blended_system.get("filename")
-                interface["netboot_enabled"] = blended_system["netboot_enabled"]
-                interface["hostname"] = blended_system["hostname"]
-                interface["owner"] = blended_system["name"]
-                interface["enable_ipxe"] = blended_system["enable_ipxe"]
-                interface["name_servers"] = blended_system["name_servers"]
-                interface["mgmt_parameters"] = blended_system["mgmt_parameters"]
-
-                # For esxi/UEFI export filename_esxi as path to efi bootloader
-                if distro and distro.os_version.startswith("esxi"):
-                    interface["filename_esxi"] = "/".join(
-                        [
-                            "esxi/system",
-                            system.get_config_filename(interface=name, loader="pxe"),
-                            "mboot.efi",
-                        ]
-                    )
-
-                # Explicitly declare filename for other (non x86) archs as in DHCP discover package mostly the
-                # architecture cannot be differed due to missing bits...
-                if distro is not None and not interface.get("filename"):
-                    if distro.arch in [
-                        Archs.PPC,
-                        Archs.PPC64,
-                        Archs.PPC64LE,
-                        Archs.PPC64EL,
-                    ]:
-                        interface["filename"] = "grub/grub.ppc64le"
-                    elif distro.arch == Archs.AARCH64:
-                        interface["filename"] = "grub/grubaa64.efi"
-
-                if not self.settings.always_write_dhcp_entries:
-                    if not interface["netboot_enabled"] and interface["static"]:
-                        continue
+                    interface["name"] = host
+            else:
+                generic_name = True
+
+            # add references to the system, profile, and distro for use in the template
+            if blended_system is None:
+                blended_system = utils.blender(self.api, False, system)
+
+            interface["next_server_v4"] = blended_system["next_server_v4"]
+            interface["filename"] = blended_system.get("filename")
+            interface["netboot_enabled"] = blended_system["netboot_enabled"]
+            interface["hostname"] = blended_system["hostname"]
+            interface["owner"] = blended_system["name"]
+            interface["enable_ipxe"] = blended_system["enable_ipxe"]
+            interface["name_servers"] = blended_system["name_servers"]
+            interface["mgmt_parameters"] = blended_system["mgmt_parameters"]
+
+            # For esxi/UEFI export filename_esxi as path to efi bootloader
+            if distro and distro.os_version.startswith("esxi"):
+                interface["filename_esxi"] = "/".join(
+                    [
+                        "esxi/system",
+                        system.get_config_filename(interface=name, loader="pxe"),
+                        "mboot.efi",
+                    ]
+                )
+
+            # Explicitly declare filename for other (non x86) archs as in DHCP discover package mostly the
+            # architecture cannot be differed due to missing bits...
+            if distro is not None and not interface.get("filename"):
+                if distro.arch in [
+                    Archs.PPC,
+                    Archs.PPC64,
+                    Archs.PPC64LE,
+                    Archs.PPC64EL,
+                ]:
+                    interface["filename"] = "grub/grub.ppc64le"
+                elif distro.arch == Archs.AARCH64:
+                    interface["filename"] = "grub/grubaa64.efi"
+
+            if not self.settings.always_write_dhcp_entries:
+                if not interface["netboot_enabled"] and interface["static"]:
+                    entries.append((mac, None, interface, generic_name))
+                    continue
 
+            if dhcp_tag == "":
+                dhcp_tag = blended_system.get("dhcp_tag", "")
                 if dhcp_tag == "":
-                    dhcp_tag = blended_system.get("dhcp_tag", "")
-                    if dhcp_tag == "":
-                        dhcp_tag = "default"
+                    dhcp_tag = "default"
 
-                if dhcp_tag not in dhcp_tags:
-                    dhcp_tags[dhcp_tag] = {mac: interface}
-                else:
-                    dhcp_tags[dhcp_tag][mac] = interface
+            entries.append((mac, dhcp_tag, interface, generic_name))
 
-        # Remove macs from redundant slave interfaces from dhcp_tags otherwise you get duplicate ip's in the installer.
-        for dhcp_tag_key in list(dhcp_tags.keys()):
-            for mac in list(dhcp_tags[dhcp_tag_key].keys()):
-                if mac in ignore_macs:
-                    del dhcp_tags[dhcp_tag_key][mac]
+        return entries, ignore_macs
+
+    def write_v4_config(self, template_file="/etc/cobbler/dhcp.template"):
+        """
+        DHCPv4 files are written when ``manage_dhcp_v4`` is set in our settings.
+
+        :param template_file: The location of the DHCP template.
+        """
+
+        with open(template_file, "r", encoding="UTF-8") as template_fd:
+            template_data = template_fd.read()
+
+        dhcp_tags, entries_digest = self.__collect_entries(
+            enums.DHCP.V4, self.__build_v4_entries
+        )
 
         # we are now done with the looping through each interface of each system
         metadata = {
@@ -219,162 +318,159 @@ class _IscManager(ManagerModule):
             "dhcp_tags": dhcp_tags,
         }
 
-        self.logger.info("generating %s", self.settings_file_v4)
-        self.templar.render(template_data, metadata, self.settings_file_v4)
+        self.__write_config(
+            enums.DHCP.V4,
+            template_data,
+            metadata,
+            self.settings_file_v4,
+            entries_digest,
+        )
 
-    def write_v6_config(self, template_file="/etc/cobbler/dhcp6.template"):
+    def __build_v6_entries(self, system) -> Tuple[List[tuple], List[str]]:
         """
-        DHCPv6 files are written when ``manage_dhcp_v6`` is set in our settings.
+        Build the DHCPv6 host entries of a single system.
 
-        :param template_file: The location of the DHCP template.
+        :param system: The system to build the entries for.
+        :return: The entries as tuples of MAC address, DHCP tag (``None`` if the entry is not written), interface and
+                 whether the interface needs a generic name, and the MAC addresses of redundant slave interfaces.
         """
-
-        blender_cache = {}
-
-        with open(template_file, "r", encoding="UTF-8") as template_fd:
-            template_data = template_fd.read()
-
-        # Use a simple counter for generating generic names where a hostname is not available.
-        counter = 0
-
-        # We used to just loop through each system, but now we must loop through each network interface of each system.
-        dhcp_tags = {"default": {}}
+        profile = system.get_conceptual_parent()
+        distro = profile.get_conceptual_parent()
+        blended_system = None
+        entries = []
 
         # FIXME: ding should evolve into the new dhcp_tags dict
         ding = {}
         ignore_macs = []
 
-        for system in self.systems:
-            if not system.is_management_supported(cidr_ok=False):
-                continue
+        # if distro is None then the profile is really an image record
+        for (name, system_interface) in list(system.interfaces.items()):
+
+            # We make a copy because we may modify it before adding it to the dhcp_tags and we don't want to affect
+            # the master copy.
+            interface = system_interface.to_dict()
+
+            if interface["if_gateway"]:
+                interface["gateway"] = interface["if_gateway"]
+            else:
+                interface["gateway"] = system.gateway
 
-            profile = system.get_conceptual_parent()
-            distro = profile.get_conceptual_parent()
+            mac = interface["mac_address"]
 
-            # if distro is None then the profile is really an image record
-            for (name, system_interface) in list(system.interfaces.items()):
+            if interface["interface_type"] in (
+                "bond_slave",
+                "bridge_slave",
+                "bonded_bridge_slave",
+            ):
 
-                # We make a copy because we may modify it before adding it to the dhcp_tags and we don't want to affect
-                # the master copy.
-                interface = system_interface.to_dict()
+                if interface["interface_master"] not in system.interfaces:
+                    # Can't write DHCP entry; master interface does not exist
+                    continue
+
+                # We may have multiple bonded interfaces, so we need a composite index into ding.
+                name_master = f"{system.name}-{interface['interface_master']}"
+                if name_master not in ding:
+                    ding[name_master] = {interface["interface_master"]: []}
 
-                if interface["if_gateway"]:
-                    interface["gateway"] = interface["if_gateway"]
+                if len(ding[name_master][interface["interface_master"]]) == 0:
+                    ding[name_master][interface["interface_master"]].append(mac)
                 else:
-                    interface["gateway"] = system.gateway
-
-                mac = interface["mac_address"]
-
-                if interface["interface_type"] in (
-                    "bond_slave",
-                    "bridge_slave",
-                    "bonded_bridge_slave",
-                ):
-
-                    if interface["interface_master"] not in system.interfaces:
-                        # Can't write DHCP entry; master interface does not exist
-                        continue
-
-                    # We may have multiple bonded interfaces, so we need a composite index into ding.
-                    name_master = f"{system.name}-{interface['interface_master']}"
-                    if name_master not in ding:
-                        ding[name_master] = {interface["interface_master"]: []}
-
-                    if len(ding[name_master][interface["interface_master"]]) == 0:
-                        ding[name_master][interface["interface_master"]].append(mac)
-                    else:
-                        ignore_macs.append(mac)
-
-                    ip_v6 = system.interfaces[
-                        interface["interface_master"]
-                    ].ipv6_address
-                    dhcp_tag = system.interfaces[interface["interface_master"]].dhcp_tag
-                    host = system.interfaces[interface["interface_master"]].dns_name
-
-                    if not ip_v6:
-                        for (interface_name, interface_object) in list(
-                            system.interfaces.items()
+                    ignore_macs.append(mac)
+
+                ip_v6 = system.interfaces[interface["interface_master"]].ipv6_address
+                dhcp_tag = system.interfaces[interface["interface_master"]].dhcp_tag
+                host = system.interfaces[interface["interface_master"]].dns_name
+
+                if not ip_v6:
+                    for (interface_name, interface_object) in list(
+                        system.interfaces.items()
+                    ):
+                        if (
+                            interface_name.startswith(
+                                interface["interface_master"] + "."
+                            )
+                            and interface_object.ipv6_address is not None
+                            and interface_object.ipv6_address != ""
                         ):
-                            if (
-                                interface_name.startswith(
-                                    interface["interface_master"] + "."
-                                )
-                                and interface_object.ipv6_address is not None
-                                and interface_object.ipv6_address != ""
-                            ):
-                                ip_v6 = interface_object.ipv6_address
-                                break
-
-                    interface["ipv6_address"] = ip_v6
-                else:
-                    ip_v6 = interface["ipv6_address"]
-                    dhcp_tag = interface["dhcp_tag"]
-                    host = interface["dns_name"]
+                            ip_v6 = interface_object.ipv6_address
+                            break
 
-                if distro is not None:
-                    interface["distro"] = distro.to_dict()
+                interface["ipv6_address"] = ip_v6
+            else:
+                ip_v6 = interface["ipv6_address"]
+                dhcp_tag = interface["dhcp_tag"]
+                host = interface["dns_name"]
 
-                if not mac or not ip_v6:
-                    # can't write a DHCP entry for this system
-                    self.logger.warning("%s has no IPv6 or MAC address", system.name)
-                    continue
-                counter = counter + 1
+            if distro is not None:
+                interface["distro"] = distro.to_dict()
 
-                # the label the entry after the hostname if possible
-                if host:
-                    if name != "eth0":
-                        interface["name"] = f"{host}-{name}"
-                    else:
-                        interface["name"] = host
-                else:
-                    interface["name"] = f"generic{counter:d}"
+            if not mac or not ip_v6:
+                # can't write a DHCP entry for this system
+                self.logger.warning("%s has no IPv6 or MAC address", system.name)
+                continue
 
-                # add references to the system, profile, and distro for use in the template
-                if system.name in blender_cache:
-                    blended_system = blender_cache[system.name]
+            # the label the entry after the hostname if possible, generic names are assigned when the entries of all
+            # systems are collected
+            generic_name = False
+            if host:
+                if name != "eth0":
+                    interface["name"] = f"{host}-{name}"
                 else:
-                    blended_system = utils.blender(self.api, False, system)
-                    blender_cache[system.name] = blended_system
-
-                interface["next_server_v6"] = blended_system["next_server_v6"]
-                interface["filename"] = blended_system.get("filename")
-                interface["netboot_enabled"] = blended_system["netboot_enabled"]
-                interface["hostname"] = blended_system["hostname"]
-                interface["owner"] = blended_system["name"]
-                interface["name_servers"] = blended_system["name_servers"]
-                interface["mgmt_parameters"] = blended_system["mgmt_parameters"]
-
-                # Explicitly declare filename for other (non x86) archs as in DHCP discover package mostly the
-                # architecture cannot be differed due to missing bits...
-                if distro is not None and not interface.get("filename"):
-                    if distro.arch == Archs.PPC:
-                        interface["filename"] = "grub/grub.ppc"
-                    elif distro.arch == Archs.PPC64:
-                        interface["filename"] = "grub/grub.ppc64"
-                    elif distro.arch == Archs.PPC64LE:
-                        interface["filename"] = "grub/grub.ppc64le"
-                    elif distro.arch == Archs.AARCH64:
-                        interface["filename"] = "grub/grubaa64.efi"
-
-                if not self.settings.always_write_dhcp_entries:
-                    if not interface["netboot_enabled"] and interface["static"]:
-                        continue
+                    interface["name"] = host
+            else:
+                generic_name = True
+
+            # add references to the system, profile, and distro for use in the template
+            if blended_system is None:
+                blended_system = utils.blender(self.api, False, system)
+
+            interface["next_server_v6"] = blended_system["next_server_v6"]
+            interface["filename"] = blended_system.get("filename")
+            interface["netboot_enabled"] = blended_system["netboot_enabled"]
+            interface["hostname"] = blended_system["hostname"]
+            interface["owner"] = blended_system["name"]
+            interface["name_servers"] = blended_system["name_servers"]
+            interface["mgmt_parameters"] = blended_system["mgmt_parameters"]
+
+            # Explicitly declare filename for other (non x86) archs as in DHCP discover package mostly the
+            # architecture cannot be differed due to missing bits...
+            if distro is not None and not interface.get("filename"):
+                if distro.arch == Archs.PPC:
+                    interface["filename"] = "grub/grub.ppc"
+                elif distro.arch == Archs.PPC64:
+                    interface["filename"] = "grub/grub.ppc64"
+                elif distro.arch == Archs.PPC64LE:
+                    interface["filename"] = "grub/grub.ppc64le"
+                elif distro.arch == Archs.AARCH64:
+                    interface["filename"] = "grub/grubaa64.efi"
+
+            if not self.settings.always_write_dhcp_entries:
+                if not interface["netboot_enabled"] and interface["static"]:
+                    entries.append((mac, None, interface, generic_name))
+                    continue
 
+            if dhcp_tag == "":
+                dhcp_tag = blended_system.get("dhcp_tag", "")
                 if dhcp_tag == "":
-                    dhcp_tag = blended_system.get("dhcp_tag", "")
-                    if dhcp_tag == "":
-                        dhcp_tag = "default"
+                    dhcp_tag = "default"
 
-                if dhcp_tag not in dhcp_tags:
-                    dhcp_tags[dhcp_tag] = {mac: interface}
-                else:
-                    dhcp_tags[dhcp_tag][mac] = interface
+            entries.append((mac, dhcp_tag, interface, generic_name))
 
-        # Remove macs from redundant slave interfaces from dhcp_tags otherwise you get duplicate ip's in the installer.
-        for dhcp_tag_key in list(dhcp_tags.keys()):
-            for mac_address in list(dhcp_tags[dhcp_tag_key].keys()):
-                if mac_address in ignore_macs:
-                    del dhcp_tags[dhcp_tag_key][mac_address]
+        return entries, ignore_macs
+
+    def write_v6_config(self, template_file="/etc/cobbler/dhcp6.template"):
+        """
+        DHCPv6 files are written when ``manage_dhcp_v6`` is set in our settings.
+
+        :param template_file: The location of the DHCP template.
+        """
+
+        with open(template_file, "r", encoding="UTF-8") as template_fd:
+            template_data = template_fd.read()
+
+        dhcp_tags, entries_digest = self.__collect_entries(
+            enums.DHCP.V6, self.__build_v6_entries
+        )
 
         # we are now done with the looping through each interface of each system
         metadata = {
@@ -383,9 +479,13 @@ class _IscManager(ManagerModule):
             "dhcp_tags": dhcp_tags,
         }
 
-        if self.logger is not None:
-            self.logger.info("generating %s", self.settings_file_v6)
-        self.templar.render(template_data, metadata, self.settings_file_v6)
+        self.__write_config(
+            enums.DHCP.V6,
+            template_data,
+            metadata,
+            self.settings_file_v6,
+            entries_digest,
+        )
 
     def restart_dhcp(self, service_name: str) -> int:
         """
@@ -414,6 +514,9 @@ class _IscManager(ManagerModule):
     def restart_service(self) -> int:
         if not self.settings.restart_dhcp:
             return 0
+        if not self.restart_pending:
+            self.logger.info("DHCP config unchanged, not restarting the DHCP server")
+            return 0
 
         # Even if one fails, try both and return an error
         ret = 0
@@ -423,6 +526,8 @@ class _IscManager(ManagerModule):
         if self.settings.manage_dhcp_v6:
             # TODO: Fix hard coded string
             ret |= self.restart_dhcp("dhcpd6")
+        if ret == 0:
+            self.restart_pending = False
         return ret
 
 
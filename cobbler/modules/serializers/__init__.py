@@ -3,6 +3,9 @@ This module contains code to persist the in memory state of Cobbler on a target.
 name of the Python file. Cobbler is currently only tested against the file serializer.
 """
 
+import contextlib
+from typing import Iterator
+
 
 class StorageBase:
     """
@@ -34,6 +37,14 @@ class StorageBase:
             "The implementation for the configured serializer is missing!"
         )
 
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group the writes done in the context. Serializers which support transactions write all of them at once or none
+        at all, all others write each item immediately.
+        """
+        yield
+
     def serialize(self, collection):
         """
         Save a collection to database
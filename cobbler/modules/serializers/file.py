@@ -11,6 +11,7 @@ It uses multiple JSON files in /var/lib/cobbler/collections/distros, profiles, e
 import os
 import glob
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 import cobbler.api as capi
 from cobbler import settings
@@ -32,6 +33,17 @@ def what() -> str:
     return "serializer/file"
 
 
+def _read_json_file(filename: str) -> dict:
+    """
+    Read and parse a single JSON file.
+
+    :param filename: The file to read.
+    :return: The parsed content.
+    """
+    with open(filename, encoding="UTF-8") as file_descriptor:
+        return json.loads(file_descriptor.read())
+
+
 def _find_double_json_files(filename: str):
     """
     Finds a file with duplicate .json ending and renames it.
@@ -94,17 +106,15 @@ class FileSerializer(StorageBase):
         if collection_type == "settings":
             return settings.read_settings_file()
 
-        results = []
-
         path = os.path.join(self.libpath, collection_type)
         all_files = glob.glob(f"{path}/*.json")
 
-        for file in all_files:
-            with open(file, encoding="UTF-8") as file_descriptor:
-                json_data = file_descriptor.read()
-                _dict = json.loads(json_data)
-                results.append(_dict)
-        return results
+        workers = self.api.settings().serializer_load_workers
+        if workers <= 1 or len(all_files) <= 1:
+            return [_read_json_file(file) for file in all_files]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() keeps the order of the files
+            return list(executor.map(_read_json_file, all_files))
 
     def deserialize(self, collection, topological: bool = True):
         datastruct = self.deserialize_raw(collection.collection_types())
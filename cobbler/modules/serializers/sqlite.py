@@ -0,0 +1,257 @@
+"""
+Cobbler's SQLite based object serializer.
+All items are stored as JSON documents in a single SQLite database, one row per item. The name, uid and mtime of the
+items are stored in indexed columns. The database runs in WAL mode, so readers are not blocked by a writer.
+"""
+
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import argparse
+import contextlib
+import glob
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from typing import Iterator, List, Optional
+
+from cobbler import settings
+from cobbler.cexceptions import CX
+from cobbler.modules.serializers import StorageBase
+
+DATABASE_FILE = "/var/lib/cobbler/cobbler.db"
+COLLECTIONS_PATH = "/var/lib/cobbler/collections"
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS items (
+        collection TEXT NOT NULL,
+        name TEXT NOT NULL,
+        uid TEXT NOT NULL,
+        mtime REAL NOT NULL,
+        depth INTEGER NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (collection, name)
+    )""",
+    "CREATE INDEX IF NOT EXISTS items_uid ON items (collection, uid)",
+    "CREATE INDEX IF NOT EXISTS items_mtime ON items (collection, mtime)",
+)
+
+
+def register() -> str:
+    """
+    The mandatory Cobbler module registration hook.
+    """
+    return "serializer"
+
+
+def what() -> str:
+    """
+    Module identification function
+    """
+    return "serializer/sqlite"
+
+
+class SQLiteSerializer(StorageBase):
+    """
+    Serializer which stores the items in a SQLite database.
+    """
+
+    def __init__(self, api):
+        super().__init__(api)
+        self.logger = logging.getLogger()
+        self.database_file = DATABASE_FILE
+        self.__connection: Optional[sqlite3.Connection] = None
+        self.__lock = threading.RLock()
+        self.__transaction_depth = 0
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+        Open the database on first use and create the schema if required.
+
+        :return: The connection to the database.
+        :raises CX: Raised in case the database can't be opened.
+        """
+        if self.__connection is None:
+            try:
+                # Transactions are handled explicitly in transaction().
+                connection = sqlite3.connect(
+                    self.database_file, isolation_level=None, check_same_thread=False
+                )
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                for statement in SCHEMA:
+                    connection.execute(statement)
+            except sqlite3.Error as error:
+                raise CX(
+                    f'Unable to open SQLite database "{self.database_file}".'
+                ) from error
+            self.__connection = connection
+        return self.__connection
+
+    def close(self):
+        """
+        Close the connection to the database. It is reopened on the next access.
+        """
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group all writes in the context into one database transaction. Transactions may be nested, only the outermost
+        one commits. If the context is left with an exception all writes are rolled back.
+        """
+        with self.__lock:
+            connection = self.__connect()
+            if self.__transaction_depth == 0:
+                connection.execute("BEGIN IMMEDIATE")
+            self.__transaction_depth += 1
+            try:
+                yield
+                if self.__transaction_depth == 1:
+                    connection.execute("COMMIT")
+            except BaseException:
+                # A failed COMMIT may leave the transaction open, it must not leak into the next one.
+                if self.__transaction_depth == 1 and connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+            finally:
+                self.__transaction_depth -= 1
+
+    def __write_item(self, collection_types: str, data: dict):
+        """
+        Insert or replace the row of an item. Must be called inside of a transaction.
+
+        :param collection_types: The name of the collection, e.g. "distros".
+        :param data: The serialized item.
+        """
+        self.__connect().execute(
+            "INSERT OR REPLACE INTO items (collection, name, uid, mtime, depth, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                collection_types,
+                data["name"],
+                data.get("uid", ""),
+                data.get("mtime", 0.0),
+                data.get("depth", 0),
+                json.dumps(data),
+            ),
+        )
+
+    def serialize_item(self, collection, item):
+        if not item.name:
+            raise CX("name unset for item!")
+
+        with self.transaction():
+            self.__write_item(collection.collection_types(), item.serialize())
+
+    def serialize_delete(self, collection, item):
+        with self.transaction():
+            self.__connect().execute(
+                "DELETE FROM items WHERE collection = ? AND name = ?",
+                (collection.collection_types(), item.name),
+            )
+
+    def serialize(self, collection):
+        # do not serialize settings
+        if collection.collection_type() != "setting":
+            with self.transaction():
+                for item in collection:
+                    self.serialize_item(collection, item)
+
+    def deserialize_raw(self, collection_type: str):
+        if collection_type == "settings":
+            return settings.read_settings_file()
+
+        with self.__lock:
+            rows = (
+                self.__connect()
+                .execute(
+                    "SELECT data FROM items WHERE collection = ?", (collection_type,)
+                )
+                .fetchall()
+            )
+        return [json.loads(data) for (data,) in rows]
+
+    def deserialize(self, collection, topological: bool = True):
+        datastruct = self.deserialize_raw(collection.collection_types())
+        if topological and isinstance(datastruct, list):
+            datastruct.sort(key=lambda x: x.get("depth", 1))
+        if isinstance(datastruct, dict):
+            collection.from_dict(datastruct)
+        elif isinstance(datastruct, list):
+            collection.from_list(datastruct)
+
+    def import_collections(self, libpath: str = COLLECTIONS_PATH) -> int:
+        """
+        Import the items stored by the file serializer into the database. Existing rows for the same items are
+        replaced. All items are imported in a single transaction.
+
+        :param libpath: The directory of the file serializer which contains one directory per collection.
+        :return: The number of imported items.
+        """
+        count = 0
+        with self.transaction():
+            for collection_path in sorted(glob.glob(os.path.join(libpath, "*"))):
+                if not os.path.isdir(collection_path):
+                    continue
+                collection_types = os.path.basename(collection_path)
+                for item_file in sorted(glob.glob(f"{collection_path}/*.json")):
+                    with open(item_file, encoding="UTF-8") as file_descriptor:
+                        self.__write_item(
+                            collection_types, json.loads(file_descriptor.read())
+                        )
+                    count += 1
+        return count
+
+
+def storage_factory(api):
+    """
+    Create the serializer which stores the Cobbler items in the SQLite database. The connection to the database is
+    opened on first use.
+
+    :param api: The API to resolve all information with.
+    :return: An instance of the SQLite serializer.
+    """
+    return SQLiteSerializer(api)
+
+
+def main(args: List[str]) -> int:
+    """
+    Migrate the items stored by the file serializer into a SQLite database. Cobbler must not be running while the
+    items are migrated.
+
+    :param args: The command line arguments, including the program name.
+    :return: The exit code.
+    """
+    parser = argparse.ArgumentParser(
+        description="Import the items of Cobbler's file serializer into a SQLite database."
+    )
+    parser.add_argument(
+        "--source",
+        help="The directory of the file serializer.",
+        default=COLLECTIONS_PATH,
+    )
+    parser.add_argument(
+        "--database", help="The SQLite database to write.", default=DATABASE_FILE
+    )
+    parsed_args = parser.parse_args(args[1:])
+
+    serializer = SQLiteSerializer(None)
+    serializer.database_file = parsed_args.database
+    try:
+        count = serializer.import_collections(parsed_args.source)
+    except (CX, OSError, ValueError) as error:
+        print(f"Migration failed: {error}")
+        return 1
+    finally:
+        serializer.close()
+    print(f"Imported {count} items into {parsed_args.database}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -41,18 +41,30 @@ def run(api, args) -> int:
     ret_code = 0
     if settings.manage_dhcp:
         if which_dhcp_module == "managers.isc":
-            if settings.restart_dhcp:
+            dhcp_manager = api.get_module_from_file(
+                "dhcp", "module", "managers.isc"
+            ).get_manager(api)
+            # The manager only flags a restart if one of its config files changed since the last restart.
+            if settings.restart_dhcp and dhcp_manager.restart_pending:
                 ret_code = utils.subprocess_call(["dhcpd", "-t", "-q"], shell=False)
                 if ret_code != 0:
                     logger.error("dhcpd -t failed")
                     return 1
                 dhcp_service_name = utils.dhcp_service_name()
                 ret_code = process_management.service_restart(dhcp_service_name)
+                if ret_code == 0:
+                    dhcp_manager.restart_pending = False
         elif which_dhcp_module == "managers.dnsmasq":
-            if settings.restart_dhcp:
+            dhcp_manager = api.get_module_from_file(
+                "dhcp", "module", "managers.dnsmasq"
+            ).get_manager(api)
+            if settings.restart_dhcp and dhcp_manager.restart_pending:
                 service_name = "dnsmasq"
                 ret_code = process_management.service_restart(service_name)
-                has_restarted_dnsmasq = True
+                if ret_code == 0:
+                    dhcp_manager.restart_pending = False
+            # The hosts file for DNS is tracked by the same manager, so it needs no separate restart.
+            has_restarted_dnsmasq = settings.restart_dhcp
         else:
             logger.error("unknown DHCP engine: %s", which_dhcp_module)
             ret_code = 411
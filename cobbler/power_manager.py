@@ -7,21 +7,65 @@ to remember different power management tools syntaxes.  This makes rebooting a s
 # SPDX-FileCopyrightText: Copyright 2008-2009, Red Hat, Inc and Others
 # SPDX-FileCopyrightText: Michael DeHaan <michael.dehaan AT gmail>
 
+import contextlib
 import json
 import glob
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import stat
 import re
+import subprocess
+import threading
 import time
-from typing import Optional
+from typing import Dict, Iterator, List, Optional
 
 from cobbler.cexceptions import CX
 from cobbler import utils
 
 # Try the power command 3 times before giving up. Some power switches are flaky.
 POWER_RETRIES = 3
+# Seconds to wait before the first retry. The delay is doubled for every further retry.
+POWER_RETRY_DELAY = 1.0
+
+
+class _BmcSlot:
+    """
+    Serializes the commands sent to a single BMC or power switch.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_used = 0.0
+
+
+_bmc_slots: Dict[str, _BmcSlot] = {}
+_bmc_slots_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def bmc_slot(address: str, interval: float) -> Iterator[None]:
+    """
+    Run one command at a time against a power address and keep at least ``interval`` seconds between the commands.
+    Many BMCs and power switches can't handle concurrent sessions, so this is enforced for all threads of the process.
+
+    :param address: The power address of a system. Commands without an address are not limited.
+    :param interval: The minimum number of seconds between two commands.
+    """
+    if not address:
+        yield
+        return
+    with _bmc_slots_lock:
+        slot = _bmc_slots.setdefault(address, _BmcSlot())
+    with slot.lock:
+        delay = slot.last_used + interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            yield
+        finally:
+            slot.last_used = time.monotonic()
 
 
 def get_power_types() -> list:
@@ -208,10 +252,24 @@ class PowerManager:
 
         return_code = -1
 
-        for _ in range(0, POWER_RETRIES):
-            output, return_code = utils.subprocess_sp(
-                power_command, shell=False, process_input=power_input
-            )
+        for attempt in range(0, POWER_RETRIES):
+            if attempt > 0:
+                time.sleep(POWER_RETRY_DELAY * 2 ** (attempt - 1))
+            try:
+                with bmc_slot(system.power_address, self.settings.power_bmc_interval):
+                    output, return_code = utils.subprocess_sp(
+                        power_command,
+                        shell=False,
+                        process_input=power_input,
+                        timeout=self.settings.power_timeout,
+                    )
+            except subprocess.TimeoutExpired:
+                self.logger.warning(
+                    "power command timed out after %s seconds",
+                    self.settings.power_timeout,
+                )
+                return_code = -1
+                continue
             # Allowed return codes: 0, 1, 2
             # pylint: disable-next=line-too-long
             # Source: https://github.com/ClusterLabs/fence-agents/blob/0d8826a0e83ca11dc7be95564c8566aaef6a6ecb/doc/FenceAgentAPI.md#agent-operations-and-return-values
@@ -233,7 +291,6 @@ class PowerManager:
                     error_msg = f"command succeeded (rc={return_code}), but output ('{output}') was not understood"
                     utils.die(error_msg)
                     raise CX(error_msg)
-            time.sleep(2)
 
         if not return_code == 0:
             error_msg = f"command failed (rc={return_code}), please validate the physical setup and cobbler config"
@@ -281,9 +338,35 @@ class PowerManager:
         """
 
         self.power_off(system, user, password)
-        time.sleep(5)
+        self._wait_for_power_off(system, user, password)
         self.power_on(system, user, password)
 
+    def _wait_for_power_off(
+        self, system, user: Optional[str] = None, password: Optional[str] = None
+    ):
+        """
+        Wait until a system reports that it is powered off. The status is polled with an increasing delay. Power types
+        which can't report the status are given a single delay.
+
+        :param system: Cobbler system
+        :type system: System
+        :param user: power management user
+        :param password: power management password
+        """
+        for attempt in range(0, POWER_RETRIES):
+            try:
+                if not self.get_power_status(system, user, password):
+                    return
+            except CX:
+                self.logger.info(
+                    "power status of %s unknown, waiting before powering on",
+                    system.name,
+                )
+                time.sleep(POWER_RETRY_DELAY)
+                return
+            time.sleep(POWER_RETRY_DELAY * 2**attempt)
+        self.logger.warning("%s is still powered on, powering on anyway", system.name)
+
     def get_power_status(
         self, system, user: Optional[str] = None, password: Optional[str] = None
     ) -> Optional[bool]:
@@ -298,3 +381,152 @@ class PowerManager:
         """
 
         return self._power(system, "status", user, password)
+
+    def power_systems(
+        self,
+        systems: list,
+        power_operation: str,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+    ) -> Dict[str, dict]:
+        """
+        Run a power operation on many systems at once. The fence agents run on a pool of ``power_workers`` threads, the
+        commands to a single power address are still sent one at a time. A failure of one system doesn't stop the
+        others.
+
+        :param systems: The Cobbler systems.
+        :param power_operation: power operation. Valid values: on, off, reboot, status
+        :param user: power management user
+        :param password: power management password
+        :return: The result per system name. Each result has the keys "success", "status" (the power status of the
+                 system for the operation "status", otherwise None) and "error" (empty on success).
+        :raise CX: if the power operation is invalid
+        """
+        operations = {
+            "on": self.power_on,
+            "off": self.power_off,
+            "reboot": self.reboot,
+            "status": self.get_power_status,
+        }
+        if power_operation not in operations:
+            raise CX("invalid power operation")
+        operation = operations[power_operation]
+
+        def run(system) -> dict:
+            try:
+                status = operation(system, user, password)
+            except Exception as error:
+                self.logger.warning(
+                    "power %s of %s failed: %s", power_operation, system.name, error
+                )
+                return {"success": False, "status": None, "error": str(error)}
+            return {"success": True, "status": status, "error": ""}
+
+        workers = max(1, min(self.settings.power_workers, len(systems)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results: List[dict] = list(executor.map(run, systems))
+        return {system.name: result for system, result in zip(systems, results)}
+
+
+class PowerStatusPoller:
+    """
+    Polls the power status of all systems with a power address in the background and keeps the results in memory, so
+    the power states of many systems can be read without running a fence agent for each of them.
+    """
+
+    def __init__(self, api):
+        """
+        Constructor
+
+        :param api: Cobbler API
+        """
+        self.api = api
+        self.settings = api.settings()
+        self.logger = logging.getLogger()
+        self.states: Dict[str, dict] = {}
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """
+        Start the polling thread. Nothing is started if ``power_poll_interval`` is not positive or the thread is already
+        running.
+        """
+        if self.settings.power_poll_interval <= 0:
+            return
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(
+            target=self.__run, name="PowerStatusPoller", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stop the polling thread after the running poll has finished.
+        """
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def __run(self):
+        """
+        The loop of the polling thread. The interval is read again after every poll, setting it to 0 ends the loop.
+        """
+        while not self.__stop.is_set():
+            try:
+                self.poll()
+            except Exception as error:
+                self.logger.error("polling the power status failed: %s", error)
+            interval = self.settings.power_poll_interval
+            if interval <= 0:
+                break
+            self.__stop.wait(interval)
+
+    def poll(self):
+        """
+        Refresh the power status of all systems that have a power address and a fence agent for their power type. The
+        states of systems which no longer qualify are dropped.
+        """
+        systems = [
+            system
+            for system in self.api.systems()
+            if system.power_address and get_power_command(system.power_type)
+        ]
+        results = PowerManager(self.api).power_systems(systems, "status")
+        now = time.time()
+        states = {}
+        for system_name, result in results.items():
+            status = "unknown"
+            if result["success"] and result["status"] is not None:
+                status = "on" if result["status"] else "off"
+            states[system_name] = {
+                "status": status,
+                "timestamp": now,
+                "error": result["error"],
+            }
+        with self.__lock:
+            self.states = states
+
+    def get_states(self, names: Optional[List[str]] = None) -> Dict[str, dict]:
+        """
+        Get the cached power states.
+
+        :param names: The names of the systems. If None, the states of all polled systems are returned.
+        :return: The state per system name with the keys "status" ("on", "off" or "unknown"), "timestamp" (the time of
+                 the poll, 0.0 if the system was not polled yet) and "error" (empty if the poll succeeded).
+        """
+        with self.__lock:
+            states = self.states
+        if names is None:
+            return {name: dict(state) for name, state in states.items()}
+        result = {}
+        for name in names:
+            state = states.get(name)
+            if state is None:
+                state = {"status": "unknown", "timestamp": 0.0, "error": ""}
+            result[name] = dict(state)
+        return result
@@ -9,6 +9,7 @@ This module contains all code related to the Cobbler XML-RPC API.
 import base64
 import errno
 import fcntl
+import heapq
 import keyword
 import logging
 import os
@@ -18,7 +19,7 @@ import time
 import re
 import xmlrpc.server
 from socketserver import ThreadingMixIn
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 from xmlrpc.server import SimpleXMLRPCRequestHandler
 
 from cobbler import enums
@@ -138,7 +139,7 @@ class CobblerXMLRPCInterface:
         """
         Run a full Cobbler sync in the background.
 
-        :param options: Possible options: verbose, dhcp, dns
+        :param options: Possible options: verbose, dhcp, dns, incremental
         :param token: The API-token obtained via the login() method. The API-token obtained via the login() method.
         :return: The id of the task which was started.
         """
@@ -149,7 +150,11 @@ class CobblerXMLRPCInterface:
                 what.append("dhcp")
             if self.options.get("dns", False):
                 what.append("dns")
-            self.remote.api.sync(self.options.get("verbose", False), what=what)
+            self.remote.api.sync(
+                self.options.get("verbose", False),
+                what=what,
+                incremental=self.options.get("incremental", False),
+            )
 
         return self.__start_task(runner, token, "sync", "Sync", options)
 
@@ -173,13 +178,13 @@ class CobblerXMLRPCInterface:
         """
         Hardlink all files as a background task.
 
-        :param options: Not known what this parameter does.
+        :param options: If "dry_run" is set, only the space which could be reclaimed is reported.
         :param token: The API-token obtained via the login() method. The API-token obtained via the login() method.
         :return: The id of the task which was started.
         """
 
         def runner(self):
-            self.remote.api.hardlink()
+            self.remote.api.hardlink(dry_run=self.options.get("dry_run", False))
 
         return self.__start_task(runner, token, "hardlink", "Hardlink", options)
 
@@ -229,6 +234,7 @@ class CobblerXMLRPCInterface:
                 self.options.get("omit_data", False),
                 self.options.get("sync_all", False),
                 self.options.get("use_ssl", False),
+                self.options.get("incremental", False),
             )
 
         return self.__start_task(runner, token, "replicate", "Replicate", options)
@@ -295,18 +301,34 @@ class CobblerXMLRPCInterface:
         """
 
         def runner(self):
+            systems = []
             for system_name in self.options.get("systems", []):
-                try:
-                    system_obj = self.remote.api.find_system(name=system_name)
-                    if system_obj is None:
-                        raise ValueError(f'System with name "{system_name}" not found')
-                    self.remote.api.power_system(
-                        system_obj, self.options.get("power", "")
+                system_obj = self.remote.api.find_system(name=system_name)
+                if system_obj is None:
+                    self.logger.warning(
+                        f'failed to execute power task on {system_name}, exception: System with name "{system_name}" '
+                        "not found"
                     )
-                except Exception as error:
+                    continue
+                systems.append(system_obj)
+            results = self.remote.api.power_systems(
+                systems, self.options.get("power", "")
+            )
+            for system_name, result in results.items():
+                if result["success"]:
+                    if result["status"] is not None:
+                        status = "on" if result["status"] else "off"
+                        self.logger.info(f"{system_name}: power is {status}")
+                else:
                     self.logger.warning(
-                        f"failed to execute power task on {str(system_name)}, exception: {str(error)}"
+                        f"failed to execute power task on {system_name}, exception: {result['error']}"
                     )
+            succeeded = len(
+                [result for result in results.values() if result["success"]]
+            )
+            self.logger.info(
+                f"power task succeeded for {succeeded} of {len(results)} systems"
+            )
 
         self.check_access(token, "power_system")
         return self.__start_task(
@@ -335,6 +357,39 @@ class CobblerXMLRPCInterface:
         result = self.api.power_system(system_obj, power)
         return True if result is None else result
 
+    def power_systems(self, system_names: List[str], power: str, token: str) -> dict:
+        """
+        Execute a power task on many systems concurrently and wait for all of them.
+
+        :param system_names: The names of the systems.
+        :param power: power operation (on/off/status/reboot)
+        :param token: The API-token obtained via the login() method.
+        :return: The result per system name with the keys "success", "status" (only set for the operation "status")
+                 and "error".
+        :raises ValueError: In case a system does not exist.
+        """
+        systems = []
+        for system_name in system_names:
+            system_obj = self.api.find_system(name=system_name)
+            if system_obj is None:
+                raise ValueError(f'System with name "{system_name}" not found')
+            self.check_access(token, "power_system", system_obj)
+            systems.append(system_obj)
+        return self.xmlrpc_hacks(self.api.power_systems(systems, power))
+
+    def get_power_states(self, system_names: List[str], token: str) -> dict:
+        """
+        Get the power states of systems as last polled by cobblerd. This doesn't run any fence agent, so it is cheap
+        even for many systems. Polling is configured with the setting ``power_poll_interval``.
+
+        :param system_names: The names of the systems. An empty list returns the states of all polled systems.
+        :param token: The API-token obtained via the login() method.
+        :return: The state per system name with the keys "status" ("on", "off" or "unknown"), "timestamp" (the time of
+                 the poll, 0.0 if the system was not polled yet) and "error".
+        """
+        self.check_access(token, "get_power_states")
+        return self.xmlrpc_hacks(self.api.get_power_states(system_names or None))
+
     def background_signature_update(self, options: dict, token: str) -> str:
         """
         Run a signature update in the background.
@@ -577,12 +632,44 @@ class CobblerXMLRPCInterface:
                 sort_field = sort_field[1:]
                 sort_rev = True
             sort_fields.insert(0, sort_field)
-        sortdata = [(x.sort_key(sort_fields), x) for x in data]
-        if sort_rev:
-            sortdata.sort(reverse=True)
-        else:
-            sortdata.sort()
-        return [x for (key, x) in sortdata]
+        return sorted(data, key=lambda x: x.sort_key(sort_fields), reverse=sort_rev)
+
+    @staticmethod
+    def __is_page_argument(value) -> bool:
+        """
+        Helper function to decide if a ``page`` or ``results_per_page`` argument was really given. Older clients pass
+        their token as first positional argument, which ends up in ``page``.
+
+        :param value: The argument to check.
+        :return: True if the value is a positive number.
+        """
+        try:
+            return int(value) > 0
+        except (TypeError, ValueError):
+            return False
+
+    def __get_items_page(
+        self, what: str, page=None, results_per_page=None, fields=None
+    ) -> list:
+        """
+        Helper function for the methods which list all items of a type. If a page or the number of results per page is
+        given, only the items of this page are returned, ordered by name. A page past the last one is empty.
+
+        :param what: The object type to list.
+        :param page: The page to return.
+        :param results_per_page: The number of items per page.
+        :param fields: If given, only these attributes of the items are returned.
+        :return: A list of dicts.
+        """
+        items = list(self.api.get_items(what))
+        if self.__is_page_argument(page) or self.__is_page_argument(results_per_page):
+            (items, pageinfo) = self.__paginate(
+                self.__sort(items), page, results_per_page
+            )
+            # __paginate() clamps the page to the last one
+            if self.__is_page_argument(page) and int(page) > pageinfo["num_pages"]:
+                items = []
+        return self.xmlrpc_hacks([x.to_dict(fields=fields or None) for x in items])
 
     def __paginate(self, data, page=1, items_per_page=25, token=None):
         """
@@ -898,14 +985,15 @@ class CobblerXMLRPCInterface:
         """
         return self.get_item("menu", name, flatten=flatten, resolved=resolved)
 
-    def get_items(self, what: str):
+    def get_items(self, what: str, fields: Optional[List[str]] = None):
         """
         Individual list elements are the same for get_item.
 
         :param what: is the name of a Cobbler object type, as described for get_item.
+        :param fields: If given, only these attributes of the items are returned.
         :return: This returns a list of dicts.
         """
-        items = [x.to_dict() for x in self.api.get_items(what)]
+        items = [x.to_dict(fields=fields or None) for x in self.api.get_items(what)]
         return self.xmlrpc_hacks(items)
 
     def get_item_names(self, what: str):
@@ -917,113 +1005,150 @@ class CobblerXMLRPCInterface:
         """
         return [x.name for x in self.api.get_items(what)]
 
-    def get_distros(self, page=None, results_per_page=None, token=None, **rest):
+    def get_item_uids(self, what: str) -> List[str]:
+        """
+        This is just like get_item_names, but returns the uids. It is used to detect deleted objects without
+        transferring all objects.
+
+        :param what: is the name of a Cobbler object type, as described for get_item.
+        :return: Returns a list of object uids for the given object type.
+        """
+        return [x.uid for x in self.api.get_items(what)]
+
+    def get_distros(
+        self, page=None, results_per_page=None, token=None, fields=None, **rest
+    ):
         """
         This returns all distributions.
 
-        :param page: This parameter is not used currently.
-        :param results_per_page: This parameter is not used currently.
+        :param page: If given, only this page of the items ordered by name is returned.
+        :param results_per_page: The number of items per page. Defaults to 25 if only ``page`` is given.
         :param token: The API-token obtained via the login() method. The API-token obtained via the login() method.
+        :param fields: If given, only these attributes of the items are returned.
         :param rest: This parameter is not used currently.
         :return: The list with all distros.
         """
-        return self.get_items("distro")
+        return self.__get_items_page("distro", page, results_per_page, fields)
 
-    def get_profiles(self, page=None, results_per_page=None, token=None, **rest):
+    def get_profiles(
+        self, page=None, results_per_page=None, token=None, fields=None, **rest
+    ):
         """
         This returns all profiles.
 
-        :param page: This parameter is not used currently.
-        :param results_per_page: This parameter is not used currently.
+        :param page: If given, only this page of the items ordered by name is returned.
+        :param results_per_page: The number of items per page. Defaults to 25 if only ``page`` is given.
         :param token: The API-token obtained via the login() method. The API-token obtained via the login() method.
+        :param fields: If given, only these attributes of the items are returned.
         :param rest: This parameter is not used currently.
         :return: The list with all profiles.
         """
-        return self.get_items("profile")
+        return self.__get_items_page("profile", page, results_per_page, fields)
 
-    def get_systems(self, page=None, results_per_page=None, token=None, **rest):
+    def get_systems(
+        self, page=None, results_per_page=None, token=None, fields=None, **rest
+    ):
         """
         This returns all Systems.
 
-        :param page: This parameter is not used currently.
-        :param results_per_page: This parameter is not used currently.
+        :param page: If given, only this page of the items ordered by name is returned.
+        :param results_per_page: The number of items per page. Defaults to 25 if only ``page`` is given.
         :param token: The API-token obtained via the login() method. The API-token obtained via the login() method.
+        :param fields: If given, only these attributes of the items are returned.
         :param rest: This parameter is not used currently.
         :return: The list of all systems.
         """
-        return self.get_items("system")
+        return self.__get_items_page("system", page, results_per_page, fields)
 
-    def get_repos(self, page=None, results_per_page=None, token=None, **rest):
+    def get_repos(
+        self, page=None, results_per_page=None, token=None, fields=None, **rest
+    ):
         """
         This returns all repositories.
 
-        :param page: This parameter is not used currently.
-        :param results_per_page: This parameter is not used currently.
+        :param page: If given, only this page of the items ordered by name is returned.
+        :param results_per_page: The number of items per page. Defaults to 25 if only ``page`` is given.
         :param token: The API-token obtained via the login() method. The API-token obtained via the login() method.
+        :param fields: If given, only these attributes of the items are returned.
         :param rest: This parameter is not used currently.
         :return: The list of all repositories.
         """
-        return self.get_items("repo")
+        return self.__get_items_page("repo", page, results_per_page, fields)
 
-    def get_images(self, page=None, results_per_page=None, token=None, **rest):
+    def get_images(
+        self, page=None, results_per_page=None, token=None, fields=None, **rest
+    ):
         """
         This returns all images.
 
-        :param page: This parameter is not used currently.
-        :param results_per_page: This parameter is not used currently.
+        :param page: If given, only this page of the items ordered by name is returned.
+        :param results_per_page: The number of items per page. Defaults to 25 if only ``page`` is given.
         :param token: The API-token obtained via the login() method. The API-token obtained via the login() method.
+        :param fields: If given, only these attributes of the items are returned.
         :param rest: This parameter is not used currently.
         :return: The list of all images.
         """
-        return self.get_items("image")
+        return self.__get_items_page("image", page, results_per_page, fields)
 
-    def get_mgmtclasses(self, page=None, results_per_page=None, token=None, **rest):
+    def get_mgmtclasses(
+        self, page=None, results_per_page=None, token=None, fields=None, **rest
+    ):
         """
         This returns all managementclasses.
 
-        :param page: This parameter is not used currently.
-        :param results_per_page: This parameter is not used currently.
+        :param page: If given, only this page of the items ordered by name is returned.
+        :param results_per_page: The number of items per page. Defaults to 25 if only ``page`` is given.
         :param token: The API-token obtained via the login() method. The API-token obtained via the login() method.
+        :param fields: If given, only these attributes of the items are returned.
         :param rest: This parameter is not used currently.
         :return: The list of all managementclasses.
         """
-        return self.get_items("mgmtclass")
+        return self.__get_items_page("mgmtclass", page, results_per_page, fields)
 
-    def get_packages(self, page=None, results_per_page=None, token=None, **rest):
+    def get_packages(
+        self, page=None, results_per_page=None, token=None, fields=None, **rest
+    ):
         """
         This returns all packages.
 
-        :param page: This parameter is not used currently.
-        :param results_per_page: This parameter is not used currently.
+        :param page: If given, only this page of the items ordered by name is returned.
+        :param results_per_page: The number of items per page. Defaults to 25 if only ``page`` is given.
         :param token: The API-token obtained via the login() method. The API-token obtained via the login() method.
+        :param fields: If given, only these attributes of the items are returned.
         :param rest: This parameter is not used currently.
         :return: The list of all packages tracked in Cobbler.
         """
-        return self.get_items("package")
+        return self.__get_items_page("package", page, results_per_page, fields)
 
-    def get_files(self, page=None, results_per_page=None, token=None, **rest):
+    def get_files(
+        self, page=None, results_per_page=None, token=None, fields=None, **rest
+    ):
         """
         This returns all files.
 
-        :param page: This parameter is not used currently.
-        :param results_per_page: This parameter is not used currently.
+        :param page: If given, only this page of the items ordered by name is returned.
+        :param results_per_page: The number of items per page. Defaults to 25 if only ``page`` is given.
         :param token: The API-token obtained via the login() method.
+        :param fields: If given, only these attributes of the items are returned.
         :param rest: This parameter is not used currently.
         :return: The list of all files.
         """
-        return self.get_items("file")
+        return self.__get_items_page("file", page, results_per_page, fields)
 
-    def get_menus(self, page=None, results_per_page=None, token=None, **rest):
+    def get_menus(
+        self, page=None, results_per_page=None, token=None, fields=None, **rest
+    ):
         """
         This returns all menus.
 
-        :param page: This parameter is not used currently.
-        :param results_per_page: This parameter is not used currently.
+        :param page: If given, only this page of the items ordered by name is returned.
+        :param results_per_page: The number of items per page. Defaults to 25 if only ``page`` is given.
         :param token: The API-token obtained via the login() method.
+        :param fields: If given, only these attributes of the items are returned.
         :param rest: This parameter is not used currently.
         :return: The list of all files.
         """
-        return self.get_items("menu")
+        return self.__get_items_page("menu", page, results_per_page, fields)
 
     def find_items(
         self,
@@ -1032,6 +1157,7 @@ class CobblerXMLRPCInterface:
         sort_field=None,
         expand: bool = True,
         resolved: bool = False,
+        fields: Optional[List[str]] = None,
     ) -> list:
         """Works like get_items but also accepts criteria as a dict to search on.
 
@@ -1045,6 +1171,8 @@ class CobblerXMLRPCInterface:
         :param expand: Not only get the names but also the complete object in form of a dict.
         :param resolved: This only has an effect when ``expand = True``. It returns the resolved representation of the
                          object instead of the raw data.
+        :param fields: This only has an effect when ``expand = True``. If given, only these attributes of the items are
+                       returned.
         :returns: A list of dicts.
         """
         if criteria is None:
@@ -1059,7 +1187,7 @@ class CobblerXMLRPCInterface:
         if not expand:
             items = [x.name for x in items]
         else:
-            items = [x.to_dict(resolved=resolved) for x in items]
+            items = [x.to_dict(resolved=resolved, fields=fields or None) for x in items]
         return self.xmlrpc_hacks(items)
 
     def find_distro(
@@ -1260,6 +1388,7 @@ class CobblerXMLRPCInterface:
         items_per_page=25,
         resolved: bool = False,
         token: Optional[str] = None,
+        fields: Optional[List[str]] = None,
     ):
         """
         Returns a list of dicts as with find_items but additionally supports returning just a portion of the total
@@ -1273,6 +1402,7 @@ class CobblerXMLRPCInterface:
         :param resolved: This only has an effect when ``expand = True``. It returns the resolved representation of the
                          object instead of the raw data.
         :param token: The API-token obtained via the login() method.
+        :param fields: If given, only these attributes of the items are returned.
         :return: The found items.
         """
         self._log(
@@ -1285,9 +1415,57 @@ class CobblerXMLRPCInterface:
             items = self.api.find_items(what, criteria=criteria)
         items = self.__sort(items, sort_field)
         (items, pageinfo) = self.__paginate(items, page, items_per_page)
-        items = [x.to_dict(resolved=resolved) for x in items]
+        items = [x.to_dict(resolved=resolved, fields=fields or None) for x in items]
         return self.xmlrpc_hacks({"items": items, "pageinfo": pageinfo})
 
+    def iterate_items(
+        self,
+        what: str,
+        cursor: str = "",
+        count: int = 100,
+        criteria: Optional[dict] = None,
+        fields: Optional[List[str]] = None,
+        resolved: bool = False,
+        token: Optional[str] = None,
+    ) -> dict:
+        """
+        Walk through a possibly very large collection in chunks ordered by name. The first call passes an empty cursor,
+        every further call the cursor returned by the previous one. No state is kept on the server: items added or
+        removed in the meantime are returned or skipped depending on their name, but no item is returned twice.
+
+        :param what: The object type to walk through.
+        :param cursor: The cursor returned by the previous call or an empty string to start at the beginning.
+        :param count: The maximum number of items to return.
+        :param criteria: The criteria the items need to match.
+        :param fields: If given, only these attributes of the items are returned.
+        :param resolved: Return the resolved representation of the items instead of the raw data.
+        :param token: The API-token obtained via the login() method.
+        :return: A dict with the list of item dicts as "items" and the cursor for the next call as "cursor". The cursor
+                 is empty after the last chunk.
+        """
+        self._log(f"iterate_items({what}); cursor({cursor})", token=token)
+        if not self.__is_page_argument(count):
+            count = 100
+        count = int(count)
+        if criteria:
+            items = self.api.find_items(what, criteria=criteria)
+        else:
+            items = self.api.get_items(what)
+        # Only the next chunk is selected and sorted, not the whole collection.
+        chunk = heapq.nsmallest(
+            count + 1, (x for x in items if x.name > cursor), key=lambda x: x.name
+        )
+        next_cursor = chunk[count - 1].name if len(chunk) > count else ""
+        return self.xmlrpc_hacks(
+            {
+                "items": [
+                    x.to_dict(resolved=resolved, fields=fields or None)
+                    for x in chunk[:count]
+                ],
+                "cursor": next_cursor,
+            }
+        )
+
     def has_item(self, what: str, name: str, token: Optional[str] = None):
         """
         Returns True if a given collection has an item with a given name, otherwise returns False.
@@ -1886,7 +2064,20 @@ class CobblerXMLRPCInterface:
         )
         obj = self.__get_object(object_id)
         self.check_access(token, f"modify_{what}", obj, attribute)
+        return self.__modify_object(what, obj, attribute, arg)
 
+    @staticmethod
+    def __modify_object(what: str, obj, attribute: str, arg) -> bool:
+        """
+        Set a single attribute of an object. Systems additionally support the pseudo attributes ``modify_interface``,
+        ``delete_interface`` and ``rename_interface``.
+
+        :param what: The type of the object.
+        :param obj: The object to modify.
+        :param attribute: The attribute name which shall be edited.
+        :param arg: The new value for the argument.
+        :return: True if the attribute exists. Otherwise False.
+        """
         if what == "system":
             if attribute == "modify_interface":
                 obj.modify_interface(arg)
@@ -2267,7 +2458,7 @@ class CobblerXMLRPCInterface:
             interface = system_to_edit.interfaces.get(interface_name)
             if interface is None:
                 # If the interface is not existing, create a new one.
-                interface = system.NetworkInterface(self.api)
+                interface = system.NetworkInterface(self.api, system_to_edit)
             for attribute_key in attributes:
                 if self.__is_interface_field(attribute_key):
                     if hasattr(interface, attribute_key):
@@ -2293,6 +2484,154 @@ class CobblerXMLRPCInterface:
                 attributes.get("interface", ""), attributes.get("rename_interface", "")
             )
 
+    def batch_edit(self, operations: List[dict], token: str) -> List[str]:
+        """
+        Add, edit and remove many objects with a single call. All operations are validated before anything is changed.
+        The changes are then saved in one transaction, the change triggers run once and a single sync covers all
+        affected systems.
+
+        Every operation is a dict with the following keys:
+
+        * ``action``: One of ``add``, ``edit`` or ``remove``.
+        * ``what``: The object type, e.g. ``system``.
+        * ``name``: The name of the object.
+        * ``attributes``: The attributes to set for ``add`` and ``edit``. Systems also accept ``modify_interface``,
+          ``delete_interface`` and ``rename_interface`` like ``modify_system()``.
+        * ``recursive``: If objects which depend on the object are removed as well. Defaults to False.
+
+        Parents of new objects must already exist before the batch is sent.
+
+        Ex: batch_edit([{"action": "add", "what": "system", "name": "node01", "attributes": {"profile": "el9",
+        "modify_interface": {"mac_address-default": "aa:bb:cc:dd:ee:ff"}}}], token)
+
+        :param operations: The operations to perform.
+        :param token: The API-token obtained via the login() method.
+        :return: The names of the synced systems.
+        :raises CX: Raised with the errors of all invalid operations. Nothing is changed in this case.
+        """
+        self._log("batch_edit", token=token)
+        for operation in operations:
+            self.check_access(token, f"xedit_{operation.get('what', '')}", token)
+
+        items = []
+        removals = []
+        errors = []
+        seen = set()
+        with system.defer_duplicate_checks():
+            for index, operation in enumerate(operations):
+                what = operation.get("what", "")
+                name = operation.get("name", "")
+                if (what, name.lower()) in seen:
+                    errors.append(f'operation {index}: {what} "{name}" is used twice')
+                    continue
+                seen.add((what, name.lower()))
+                try:
+                    if operation.get("action") == "remove":
+                        removals.append(self.__check_batch_removal(operation))
+                    else:
+                        items.append(self.__prepare_batch_item(operation))
+                except (CX, KeyError, TypeError, ValueError) as error:
+                    errors.append(f"operation {index}: {error}")
+
+        duplicates = self.api.systems().find_duplicates(
+            [ref for ref in items if ref.COLLECTION_TYPE == "system"],
+            [name for what, name, _ in removals if what == "system"],
+        )
+        errors.extend(duplicates)
+        if errors:
+            self.__discard_batch_items(items)
+            raise CX("\n".join(errors))
+
+        try:
+            return self.api.save_batch(items, removals)
+        except Exception:
+            # E.g. a failing pre trigger
+            self.__discard_batch_items(items)
+            raise
+
+    def __discard_batch_items(self, items: list):
+        """
+        Undo the changes to the children of the parents which were made while the objects of ``batch_edit()`` were
+        prepared. Setting the parent of an object registers it as a child of the new parent right away and removes it
+        from the children of the old parent. The latter also happens for the copies of existing objects.
+
+        :param items: The objects which were prepared.
+        """
+        for ref in items:
+            self.api.get_items(ref.COLLECTION_TYPE).discard_pending([ref])
+        for ref in items:
+            existing = self.api.get_item(ref.COLLECTION_TYPE, ref.name)
+            if existing is None:
+                continue
+            parent = existing.parent
+            if isinstance(parent, item.Item) and existing.name not in parent.children:
+                parent.children.append(existing.name)
+
+    def __check_batch_removal(self, operation: dict) -> Tuple[str, str, bool]:
+        """
+        Validate a ``remove`` operation of ``batch_edit()``.
+
+        :param operation: The operation.
+        :return: The type, name and recursive flag of the object to remove.
+        :raises ValueError: Raised in case the object does not exist or has children which would be left behind.
+        """
+        what = operation["what"]
+        name = operation["name"]
+        recursive = operation.get("recursive", False)
+        obj = self.api.get_item(what, name)
+        if obj is None:
+            raise ValueError(f'{what} "{name}" does not exist')
+        if not recursive and obj.children:
+            raise ValueError(
+                f'{what} "{name}" has {len(obj.children)} children and "recursive" is set to "False"'
+            )
+        return what, obj.name, recursive
+
+    def __prepare_batch_item(self, operation: dict):
+        """
+        Create the new or modified object of an ``add`` or ``edit`` operation of ``batch_edit()``. Existing objects are
+        modified on a copy, so they stay untouched if the batch fails.
+
+        :param operation: The operation.
+        :return: The object which is going to be saved.
+        :raises ValueError: Raised in case the operation or one of the attributes is invalid.
+        """
+        what = operation["what"]
+        name = operation["name"]
+        action = operation.get("action")
+        attributes = dict(operation.get("attributes", {}))
+        existing = self.api.get_item(what, name)
+        if action == "add":
+            if existing is not None:
+                raise ValueError(f'{what} "{name}" already exists, use "edit"')
+            if what == "system" and not (
+                "profile" in attributes or "image" in attributes
+            ):
+                raise ValueError(
+                    "You must specify a 'profile' or 'image' for new systems"
+                )
+            is_subobject = what == "profile" and "parent" in attributes
+            obj = self.api.new_item(what, is_subobject)
+            obj.name = name
+        elif action == "edit":
+            if existing is None:
+                raise ValueError(f'{what} "{name}" does not exist')
+            if "name" in attributes:
+                raise ValueError("objects can't be renamed in a batch")
+            obj = self.api.new_item(what, existing.is_subobject)
+            obj.from_dict(existing.serialize())
+        else:
+            raise ValueError(f'unknown action "{action}"')
+
+        # Same order as in xapi_object_edit(), the parent has to be known before the other attributes are validated.
+        for attribute in ("parent", "distro", "profile", "image"):
+            if attribute in attributes:
+                self.__modify_object(what, obj, attribute, attributes.pop(attribute))
+        for attribute, value in attributes.items():
+            if not self.__modify_object(what, obj, attribute, value):
+                raise ValueError(f'{what} has no attribute "{attribute}"')
+        return obj
+
     def save_item(self, what: str, object_id: str, token, editmode: str = "bypass"):
         """
         Saves a newly created or modified object to disk. Calling save is required for any changes to persist.
@@ -3116,6 +3455,9 @@ class CobblerXMLRPCInterface:
             f"/var/lib/cobbler/triggers/install/{mode}/*",
             additional=[objtype, name, ip],
         )
+        if mode in ("pre", "post"):
+            # The pre_log and post_log triggers appended to the install log, keep the status index current.
+            self.api.install_status.refresh()
         return True
 
     def version(self, token=None, **rest):
@@ -3293,6 +3635,32 @@ class CobblerXMLRPCInterface:
             return {}
         return self.get_system_as_rendered(system.name)
 
+    def find_system_by_mac(self, mac_address: str) -> List[str]:
+        """
+        Find the systems which have an interface with the given MAC address. The lookup is answered by the secondary
+        index of the systems collection. This is used by the autodetection of the web services.
+
+        :param mac_address: The MAC address to search for.
+        :return: The names of the matching systems.
+        """
+        if not mac_address:
+            return []
+        systems = self.api.find_system(mac_address=mac_address, return_list=True)
+        return [system.name for system in systems]
+
+    def find_system_by_ip(self, ip_address: str) -> List[str]:
+        """
+        Find the systems which have an interface with the given IP address. The lookup is answered by the secondary
+        index of the systems collection. This is used by the autodetection of the web services.
+
+        :param ip_address: The IP address to search for.
+        :return: The names of the matching systems.
+        """
+        if not ip_address:
+            return []
+        systems = self.api.find_system(ip_address=ip_address, return_list=True)
+        return [system.name for system in systems]
+
     def get_distro_as_rendered(self, name: str, token: Optional[str] = None, **rest):
         """
         Get distribution after passing through Cobbler's inheritance engine.
@@ -3934,11 +4302,15 @@ class RequestHandler(SimpleXMLRPCRequestHandler):
     TODO
     """
 
+    # Keep the connections of clients open between requests, e.g. for the web services.
+    protocol_version = "HTTP/1.1"
+
     def do_OPTIONS(self):
         """
         TODO
         """
         self.send_response(200)
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
     # Add these headers to all responses
@@ -3967,6 +4339,8 @@ class CobblerXMLRPCServer(ThreadingMixIn, xmlrpc.server.SimpleXMLRPCServer):
         :param args: Arguments which are handed to the Python XMLRPC server.
         """
         self.allow_reuse_address = True
+        # Idle keep-alive connections must not block the shutdown of the server.
+        self.daemon_threads = True
         xmlrpc.server.SimpleXMLRPCServer.__init__(
             self, args, requestHandler=RequestHandler
         )
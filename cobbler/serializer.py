@@ -6,12 +6,15 @@ Serializer code for Cobbler
 # SPDX-FileCopyrightText: Copyright 2006-2009, Red Hat, Inc and Others
 # SPDX-FileCopyrightText: Michael DeHaan <michael.dehaan AT gmail>
 
+import contextlib
 import fcntl
 import logging
 import os
 import pathlib
 import sys
+import threading
 import time
+from typing import Iterator
 
 
 class Serializer:
@@ -30,6 +33,7 @@ class Serializer:
         self.lock_enabled = True
         self.lock_handle = None
         self.lock_file_location = "/var/lib/cobbler/lock"
+        self.__transaction = threading.local()
         self.storage_module = self.__get_storage_module()
         self.storage_object = self.storage_module.storage_factory(api)
 
@@ -67,6 +71,34 @@ class Serializer:
             fcntl.flock(self.lock_handle.fileno(), fcntl.LOCK_UN)
             self.lock_handle.close()
 
+    def __in_transaction(self) -> bool:
+        """
+        Check if the current thread is inside of ``transaction()``.
+
+        :return: True if a transaction is active for the current thread.
+        """
+        return getattr(self.__transaction, "active", False)
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group multiple ``serialize_item()`` and ``serialize_delete()`` calls. The lock is only taken once, the storage
+        module writes all changes in one transaction (if it supports transactions) and the modification time is only
+        updated once at the end. Nested calls are part of the outermost transaction.
+        """
+        if self.__in_transaction():
+            yield
+            return
+
+        self.__grab_lock()
+        self.__transaction.active = True
+        try:
+            with self.storage_object.transaction():
+                yield
+        finally:
+            self.__transaction.active = False
+            self.__release_lock(with_changes=True)
+
     def serialize(self, collection):
         """
         Save a collection to disk
@@ -74,6 +106,9 @@ class Serializer:
         :param collection: The collection to serialize.
         """
 
+        if self.__in_transaction():
+            self.storage_object.serialize(collection)
+            return
         self.__grab_lock()
         self.storage_object.serialize(collection)
         self.__release_lock()
@@ -86,6 +121,9 @@ class Serializer:
         :param item: The collection item to serialize.
         """
 
+        if self.__in_transaction():
+            self.storage_object.serialize_item(collection, item)
+            return
         self.__grab_lock()
         self.storage_object.serialize_item(collection, item)
         self.__release_lock(with_changes=True)
@@ -98,6 +136,9 @@ class Serializer:
         :param item: The collection item to delete.
         """
 
+        if self.__in_transaction():
+            self.storage_object.serialize_delete(collection, item)
+            return
         self.__grab_lock()
         self.storage_object.serialize_delete(collection, item)
         self.__release_lock(with_changes=True)
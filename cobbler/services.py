@@ -7,6 +7,8 @@ Mod Python service functions for Cobbler's public interface (aka cool stuff that
 # SPDX-FileCopyrightText: additions: 2007-2009 Michael DeHaan <michael.dehaan AT gmail>
 
 import json
+import os
+import threading
 import time
 import urllib
 import xmlrpc.client
@@ -14,6 +16,12 @@ import yaml
 
 from cobbler import download_manager
 
+SETTINGS_FILE = "/etc/cobbler/settings.yaml"
+
+# The service of the current thread of a worker process together with the modification time of the settings file it was
+# created with.
+__local = threading.local()
+
 
 class CobblerSvc:
     """
@@ -298,34 +306,27 @@ class CobblerSvc:
         :return: The name of the possible object or an error message.
         """
         self.__xmlrpc_setup()
-        systems = self.remote.get_systems()
 
         # If kssendmac was in the kernel options line, see if a system can be found matching the MAC address. This is
-        # more specific than an IP match.
+        # more specific than an IP match. The values look like "eth0 XX:XX:XX:XX:XX:XX".
 
-        macinput = [mac.split(" ").lower() for mac in rest["REMOTE_MACS"]]
+        macinput = [mac.split(" ")[-1].lower() for mac in rest["REMOTE_MACS"]]
 
         ip_address = rest["REMOTE_ADDR"]
 
-        candidates = []
+        candidates = set()
 
-        for system in systems:
-            for interface in system["interfaces"]:
-                if system["interfaces"][interface]["mac_address"].lower() in macinput:
-                    candidates.append(system)
+        for mac in macinput:
+            candidates.update(self.remote.find_system_by_mac(mac))
 
-        if len(candidates) == 0:
-            for system in systems:
-                for interface in system["interfaces"]:
-                    if system["interfaces"][interface]["ip_address"] == ip_address:
-                        candidates.append(system)
+        if len(candidates) == 0 and ip_address:
+            candidates.update(self.remote.find_system_by_ip(ip_address))
 
         if len(candidates) == 0:
             return f"FAILED: no match ({ip_address},{macinput})"
         if len(candidates) > 1:
             return "FAILED: multiple matches"
-        if len(candidates) == 1:
-            return candidates[0]["name"]
+        return candidates.pop()
 
     def find_autoinstall(self, system=None, profile=None, **rest):
         """
@@ -478,6 +479,27 @@ def __generate_remote_mac_list(environ: dict) -> list:
     return remote_macs
 
 
+def __get_service() -> CobblerSvc:
+    """
+    Get the service for the current thread of the worker. The settings file is only read again, and a new connection to
+    the XML-RPC server is only opened, if the settings file was modified. Otherwise the service and its connection are
+    reused between requests.
+
+    :return: The service to handle the request with.
+    """
+    mtime = os.stat(SETTINGS_FILE).st_mtime
+    if getattr(__local, "mtime", None) != mtime:
+        # Read config for the XMLRPC port to connect to:
+        with open(SETTINGS_FILE, encoding="UTF-8") as main_settingsfile:
+            ydata = yaml.safe_load(main_settingsfile)
+        # Instantiate a CobblerWeb object
+        __local.service = CobblerSvc(
+            server=f'http://127.0.0.1:{ydata.get("xmlrpc_port", 25151)}'
+        )
+        __local.mtime = mtime
+    return __local.service
+
+
 def application(environ, start_response):
     """
     UWSGI entrypoint for Gunicorn
@@ -495,12 +517,7 @@ def application(environ, start_response):
     # REMOTE_ADDR isn't a required wsgi attribute so it may be naive to assume it's always present in this context.
     form["REMOTE_ADDR"] = environ.get("REMOTE_ADDR", None)
 
-    # Read config for the XMLRPC port to connect to:
-    with open("/etc/cobbler/settings.yaml", encoding="UTF-8") as main_settingsfile:
-        ydata = yaml.safe_load(main_settingsfile)
-
-    # Instantiate a CobblerWeb object
-    http_api = CobblerSvc(server=f'http://127.0.0.1:{ydata.get("xmlrpc_port", 25151)}')
+    http_api = __get_service()
 
     # Check for a valid path/mode; handle invalid paths gracefully
     mode = form.get("op", "index")
@@ -526,7 +543,7 @@ def application(environ, start_response):
         ):
             print(f"content not found: {my_uri}")
             status = "404 NOT FOUND"
-    except xmlrpc.server.Fault as err:
+    except xmlrpc.client.Fault as err:
         status = "500 SERVER ERROR"
         content = err.faultString
 
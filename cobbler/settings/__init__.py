@@ -29,6 +29,9 @@ class Settings:
     This class contains all app-wide settings of Cobbler. It should only exist once in a Cobbler instance.
     """
 
+    # Incremented whenever a setting is changed. This is kept outside of the instance dict to not serialize it.
+    __modification_count = 0
+
     @staticmethod
     def collection_type() -> str:
         """
@@ -174,6 +177,7 @@ class Settings:
         self.grub2_mod_dir = "/usr/share/grub2/"
         self.http_port = 80
         self.iso_template_dir = "/etc/cobbler/iso"
+        self.jinja2_bytecode_cache_dir = ""
         self.jinja2_includedir = "/var/lib/cobbler/jinja2"
         self.kernel_options = {}
         self.ldap_anonymous_bind = True
@@ -221,7 +225,11 @@ class Settings:
         self.nsupdate_log = "/var/log/cobbler/nsupdate.log"
         self.nsupdate_tsig_algorithm = "hmac-sha512"
         self.nsupdate_tsig_key = []
+        self.power_bmc_interval = 1.0
         self.power_management_default_type = "ipmilanplus"
+        self.power_poll_interval = 0
+        self.power_timeout = 60
+        self.power_workers = 16
         self.proxies = []
         self.proxy_url_ext = ""
         self.proxy_url_int = ""
@@ -248,11 +256,14 @@ class Settings:
         self.scm_track_mode = "git"
         self.scm_track_author = "cobbler <cobbler@localhost>"
         self.scm_push_script = "/bin/true"
+        self.serializer_lazy_load = False
+        self.serializer_load_workers = 4
         self.serializer_pretty_json = False
         self.server = "127.0.0.1"
         self.sign_puppet_certs_automatically = False
         self.signature_path = "/var/lib/cobbler/distro_signatures.json"
         self.signature_url = "https://cobbler.github.io/signatures/3.0.x/latest.json"
+        self.sync_workers = 1
         self.syslinux_dir = "/usr/share/syslinux"
         self.syslinux_memdisk_folder = "/usr/share/syslinux"
         self.syslinux_pxelinux_folder = "/usr/share/syslinux"
@@ -283,6 +294,26 @@ class Settings:
         self.windows_template_dir = "/etc/cobbler/windows"
         self.samba_distro_share = "DISTRO"
 
+    def __setattr__(self, name: str, value: Any):
+        """
+        Set a setting and record that the settings were modified.
+
+        :param name: The name of the setting.
+        :param value: The new value of the setting.
+        """
+        super().__setattr__(name, value)
+        Settings.__modification_count += 1
+
+    @property
+    def modification_count(self) -> int:
+        """
+        Counter which is incremented whenever a setting is changed. Items use it to invalidate their cached resolved
+        values.
+
+        :getter: The number of modifications of the settings.
+        """
+        return Settings.__modification_count
+
     def to_string(self) -> str:
         """
         Returns the kernel options as a string.
@@ -322,6 +353,7 @@ class Settings:
 
         old_settings = self.__dict__
         self.__dict__.update(new_values)
+        Settings.__modification_count += 1
 
         if not self.is_valid():
             self.__dict__ = old_settings
@@ -73,6 +73,7 @@ schema = Schema(
         Optional("extra_settings_list"): [str],
         Optional("http_port"): int,
         Optional("iso_template_dir"): str,
+        Optional("jinja2_bytecode_cache_dir"): str,
         Optional("jinja2_includedir"): str,
         Optional("kernel_options"): dict,
         Optional("ldap_anonymous_bind"): bool,
@@ -108,7 +109,11 @@ schema = Schema(
         Optional("nsupdate_log"): str,
         Optional("nsupdate_tsig_algorithm"): str,
         Optional("nsupdate_tsig_key"): [str],
+        Optional("power_bmc_interval"): float,
         Optional("power_management_default_type"): str,
+        Optional("power_poll_interval"): int,
+        Optional("power_timeout"): int,
+        Optional("power_workers"): int,
         Optional("proxies"): [str],
         Optional("proxy_url_ext"): str,
         Optional("proxy_url_int"): str,
@@ -135,11 +140,14 @@ schema = Schema(
         Optional("scm_track_mode"): str,
         Optional("scm_track_author"): str,
         Optional("scm_push_script"): str,
+        Optional("serializer_lazy_load"): bool,
+        Optional("serializer_load_workers"): int,
         Optional("serializer_pretty_json"): bool,
         Optional("server"): str,
         Optional("sign_puppet_certs_automatically"): bool,
         Optional("signature_path"): str,
         Optional("signature_url"): str,
+        Optional("sync_workers"): int,
         Optional("tftpboot_location"): str,
         Optional("virt_auto_boot"): bool,
         Optional("webdir"): str,
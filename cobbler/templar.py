@@ -7,12 +7,15 @@ snippets/etc. (And it's not spelled wrong!)
 # SPDX-FileCopyrightText: Copyright 2006-2009, Red Hat, Inc and Others
 # SPDX-FileCopyrightText: Michael DeHaan <michael.dehaan AT gmail>
 
+import hashlib
 import logging
 import os
 import os.path
 import pprint
 import re
-from typing import Optional, Union, TextIO
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, Union, TextIO
 
 from cobbler import utils
 from cobbler.cexceptions import CX
@@ -27,6 +30,111 @@ except ModuleNotFoundError:
     # FIXME: log a message here
     JINJA2_AVAILABLE = False
 
+# A placeholder which is nothing but a variable name, e.g. "$distro_name" or "${distro_name}".
+SIMPLE_PLACEHOLDER = re.compile(
+    r"\$(?:\{([A-Za-z_][A-Za-z0-9_]*)\}|([A-Za-z_][A-Za-z0-9_]*)(?![A-Za-z0-9_.\[(]))"
+)
+# Names which Cheetah resolves on the template object before it looks at the search table.
+_TEMPLATE_NAMES = frozenset(dir(CobblerTemplate)) | {"BuiltinTemplate"}
+# The number of renders which returned a literal unchanged, only substituted simple variables or ran the full
+# template engine.
+render_stats = {"literal": 0, "variables": 0, "cheetah": 0, "jinja2": 0}
+
+# The maximum number of compiled Jinja2 templates kept in memory.
+JINJA2_CACHE_SIZE = 256
+_jinja2_lock = threading.Lock()
+# The Jinja2 environment shared by all renders and the include and bytecode cache directories it was created for.
+_jinja2_environment = None
+_jinja2_environment_dirs: Optional[Tuple[str, str]] = None
+# Compiled Jinja2 templates by the hash of their source, least recently used first.
+_jinja2_templates: OrderedDict = OrderedDict()
+jinja2_cache_stats = {"hits": 0, "misses": 0}
+
+
+def clear_jinja2_cache():
+    """
+    Drop the shared Jinja2 environment and all compiled Jinja2 templates.
+    """
+    global _jinja2_environment, _jinja2_environment_dirs  # pylint: disable=global-statement
+    with _jinja2_lock:
+        _jinja2_environment = None
+        _jinja2_environment_dirs = None
+        _jinja2_templates.clear()
+        jinja2_cache_stats["hits"] = 0
+        jinja2_cache_stats["misses"] = 0
+
+
+def _create_jinja2_environment(includedir: str, bytecode_cache_dir: str):
+    """
+    Create a Jinja2 environment.
+
+    :param includedir: The directory which is searched for included templates or an empty string.
+    :param bytecode_cache_dir: The directory compiled templates are persisted in or an empty string.
+    :return: The new environment.
+    """
+    loader = jinja2.FileSystemLoader(includedir) if includedir else None
+    bytecode_cache = None
+    if bytecode_cache_dir:
+        try:
+            filesystem_helpers.mkdir(bytecode_cache_dir)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(bytecode_cache_dir)
+        except CX:
+            logging.getLogger().warning(
+                'Not caching compiled Jinja2 templates in "%s"', bytecode_cache_dir
+            )
+    return jinja2.Environment(loader=loader, bytecode_cache=bytecode_cache)
+
+
+def compile_jinja2(raw_data: str, includedir: str, bytecode_cache_dir: str):
+    """
+    Compile a Jinja2 template. The environment is shared by all calls and only recreated if one of the directories
+    changes. Compiled templates are kept in memory and, if a bytecode cache directory is set, on disk.
+
+    :param raw_data: The Jinja2 code to compile.
+    :param includedir: The directory which is searched for included templates or an empty string.
+    :param bytecode_cache_dir: The directory compiled templates are persisted in or an empty string.
+    :return: The compiled template.
+    """
+    global _jinja2_environment, _jinja2_environment_dirs  # pylint: disable=global-statement
+    key = hashlib.sha256(raw_data.encode("UTF-8", errors="surrogatepass")).hexdigest()
+    with _jinja2_lock:
+        if _jinja2_environment_dirs != (includedir, bytecode_cache_dir):
+            _jinja2_environment = _create_jinja2_environment(
+                includedir, bytecode_cache_dir
+            )
+            _jinja2_environment_dirs = (includedir, bytecode_cache_dir)
+            _jinja2_templates.clear()
+        environment = _jinja2_environment
+        cached = _jinja2_templates.get(key)
+        if cached is not None:
+            _jinja2_templates.move_to_end(key)
+            jinja2_cache_stats["hits"] += 1
+            return cached
+        jinja2_cache_stats["misses"] += 1
+
+    bytecode_cache = environment.bytecode_cache
+    bucket = None
+    code = None
+    if bytecode_cache is not None:
+        # The hash of the source is the name of the template, a string has no name of its own.
+        bucket = bytecode_cache.get_bucket(environment, key, None, raw_data)
+        code = bucket.code
+    if code is None:
+        code = environment.compile(raw_data)
+        if bucket is not None:
+            bucket.code = code
+            bytecode_cache.set_bucket(bucket)
+    template = environment.template_class.from_code(
+        environment, code, environment.make_globals(None)
+    )
+
+    with _jinja2_lock:
+        if environment is _jinja2_environment:
+            _jinja2_templates[key] = template
+            while len(_jinja2_templates) > JINJA2_CACHE_SIZE:
+                _jinja2_templates.popitem(last=False)
+    return template
+
 
 class Templar:
     """
@@ -110,10 +218,15 @@ class Templar:
             del lines[0]
             raw_data = "\n".join(lines)
 
+        data_out = None
         if template_type == "cheetah":
-            data_out = self.render_cheetah(raw_data, search_table)
+            data_out = self.render_simple(raw_data, search_table)
+            if data_out is None:
+                render_stats["cheetah"] += 1
+                data_out = self.render_cheetah(raw_data, search_table)
         elif template_type == "jinja2":
             if JINJA2_AVAILABLE:
+                render_stats["jinja2"] += 1
                 data_out = self.render_jinja2(raw_data, search_table)
             else:
                 return "# ERROR: JINJA2 NOT AVAILABLE. Maybe you need to install python-jinja2?\n"
@@ -131,13 +244,14 @@ class Templar:
         search_table["http_server"] = repstr
 
         # string replacements for @@xyz@@ in data_out with prior regex lookups of keys
-        regex = r"@@[\S]*?@@"
-        regex_matches = re.finditer(regex, data_out, re.MULTILINE)
-        matches = {
-            match.group() for match_num, match in enumerate(regex_matches, start=1)
-        }
-        for match in matches:
-            data_out = data_out.replace(match, search_table[match.strip("@@")])
+        if "@@" in data_out:
+            regex = r"@@[\S]*?@@"
+            regex_matches = re.finditer(regex, data_out, re.MULTILINE)
+            matches = {
+                match.group() for match_num, match in enumerate(regex_matches, start=1)
+            }
+            for match in matches:
+                data_out = data_out.replace(match, search_table[match.strip("@@")])
 
         # remove leading newlines which apparently breaks AutoYAST ?
         if data_out.startswith("\n"):
@@ -146,11 +260,51 @@ class Templar:
         # if requested, write the data out to a file
         if out_path is not None:
             filesystem_helpers.mkdir(os.path.dirname(out_path))
-            with open(out_path, "w+", encoding="UTF-8") as file_descriptor:
-                file_descriptor.write(data_out)
+            filesystem_helpers.write_file(out_path, data_out)
 
         return data_out
 
+    def render_simple(self, raw_data: str, search_table: dict) -> Optional[str]:
+        """
+        Render Cheetah code without compiling it, if it is a literal or only contains simple ``$var`` placeholders.
+        This is the case for most paths, e.g. the sources and destinations of the template files.
+
+        :param raw_data: The Cheetah code to render.
+        :param search_table: is a dict of metadata keys and values.
+        :return: The rendered string or None if the code needs the full template engine.
+        """
+        if any(syntax in raw_data for syntax in ("#", "\\", "TEMPLATE::", "SNIPPET::")):
+            return None
+        if "--url" in raw_data and str(search_table.get("tree", "")).startswith(
+            "nfs://"
+        ):
+            # render_cheetah() rewrites the url directive for NFS trees.
+            return None
+        if "$" not in raw_data:
+            render_stats["literal"] += 1
+            self.last_errors = []
+            return raw_data
+
+        matches = list(SIMPLE_PLACEHOLDER.finditer(raw_data))
+        if len(matches) != raw_data.count("$"):
+            return None
+        values = {}
+        for match in matches:
+            name = match.group(1) or match.group(2)
+            if name in _TEMPLATE_NAMES or name not in search_table:
+                return None
+            value = search_table[name]
+            if callable(value):
+                # Cheetah would call it.
+                return None
+            values[name] = "" if value is None else str(value)
+
+        render_stats["variables"] += 1
+        self.last_errors = []
+        return SIMPLE_PLACEHOLDER.sub(
+            lambda match: values[match.group(1) or match.group(2)], raw_data
+        )
+
     def render_cheetah(self, raw_data, search_table: dict) -> str:
         """
         Render data_input back into a file.
@@ -231,12 +385,14 @@ class Templar:
         """
 
         try:
-            if self.settings and self.settings.jinja2_includedir:
-                template = jinja2.Environment(
-                    loader=jinja2.FileSystemLoader(self.settings.jinja2_includedir)
-                ).from_string(raw_data)
+            if self.settings:
+                template = compile_jinja2(
+                    raw_data,
+                    self.settings.jinja2_includedir,
+                    self.settings.jinja2_bytecode_cache_dir,
+                )
             else:
-                template = jinja2.Template(raw_data)
+                template = compile_jinja2(raw_data, "", "")
             data_out = template.render(search_table)
         except Exception as exc:
             self.logger.warning("errors were encountered rendering the template")
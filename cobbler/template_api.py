@@ -8,10 +8,15 @@ such function and is now used to implement Cobbler's SNIPPET:: syntax.
 # SPDX-FileCopyrightText: Contributions by Michael DeHaan <michael.dehaan AT gmail>
 # SPDX-FileCopyrightText: US Government work; No explicit copyright attached to this file.
 
+import contextlib
+import hashlib
 import logging
 import os.path
 import re
-from typing import Match, Optional, TextIO, Tuple, Union
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, Match, Optional, TextIO, Tuple, Union
 
 from Cheetah.Template import Template
 
@@ -23,6 +28,20 @@ from cobbler import utils
 
 logger = logging.getLogger()
 
+# Per thread record of the snippet files looked up while rendering, see track_snippets().
+_snippet_reads = threading.local()
+
+# The maximum number of compiled template classes kept by CobblerTemplate.compile().
+COMPILE_CACHE_SIZE = 256
+# Compiled template classes by a hash of their source and compiler arguments, least recently used first.
+_compiled_templates: "OrderedDict[str, type]" = OrderedDict()
+_compiled_templates_lock = threading.Lock()
+compile_cache_stats = {"hits": 0, "misses": 0}
+
+# Contents of local snippet files by path, together with the fingerprint of the file they were read from.
+_snippet_contents: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_snippet_contents_lock = threading.Lock()
+
 
 def read_macro_file(location="/etc/cobbler/cheetah_macros"):
     """
@@ -55,6 +74,116 @@ def generate_cheetah_macros():
         return Template.compile(source="")
 
 
+def snippet_fingerprint(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Calculate the fingerprint of a snippet file as it is recorded by ``track_snippets()``.
+
+    :param path: The path of the snippet.
+    :return: The modification time in nanoseconds and the size of the file or None if the file does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@contextlib.contextmanager
+def track_snippets() -> Iterator[Dict[str, Optional[Tuple[int, int]]]]:
+    """
+    Record every snippet file which is looked up in the current thread while the context is active. Lookups of files
+    which do not exist are recorded as well, since creating such a file changes the rendered result. Remote snippets
+    can't be fingerprinted and are recorded with the fingerprint ``(-1, -1)``.
+
+    :return: A dict which is filled with the paths of the snippets and their fingerprints.
+    """
+    outer = getattr(_snippet_reads, "files", None)
+    files: Dict[str, Optional[Tuple[int, int]]] = {}
+    _snippet_reads.files = files
+    try:
+        yield files
+    finally:
+        _snippet_reads.files = outer
+        if outer is not None:
+            outer.update(files)
+
+
+def _record_snippet(path: str):
+    """
+    Add a snippet file to the files recorded by ``track_snippets()``.
+
+    :param path: The path or URL of the snippet.
+    """
+    files = getattr(_snippet_reads, "files", None)
+    if files is not None:
+        if path.startswith("/"):
+            files[path] = snippet_fingerprint(path)
+        else:
+            files[path] = (-1, -1)
+
+
+def clear_compile_cache():
+    """
+    Drop all compiled template classes and cached snippet contents.
+    """
+    with _compiled_templates_lock:
+        for template_class in _compiled_templates.values():
+            sys.modules.pop(template_class.__module__, None)
+        _compiled_templates.clear()
+        compile_cache_stats["hits"] = 0
+        compile_cache_stats["misses"] = 0
+    with _snippet_contents_lock:
+        _snippet_contents.clear()
+
+
+def _compile_cache_key(args: tuple, kwargs: dict) -> Optional[str]:
+    """
+    Calculate the key of a compiled template class in the compile cache.
+
+    :param args: The positional arguments of the compile call.
+    :param kwargs: The keyword arguments of the compile call.
+    :return: The key or None if the call can't be cached, e.g. because it compiles a file or returns code.
+    """
+    source = kwargs.get("source")
+    if (
+        args
+        or not isinstance(source, str)
+        or kwargs.get("file") is not None
+        or "preprocessors" in kwargs
+        or kwargs.get("returnAClass", True) is not True
+    ):
+        return None
+    settings = repr(
+        sorted((key, repr(value)) for key, value in kwargs.items() if key != "source")
+    )
+    return hashlib.sha256(
+        f"{settings}\0{source}".encode("UTF-8", errors="surrogatepass")
+    ).hexdigest()
+
+
+def read_snippet_file(path: str) -> str:
+    """
+    Read a snippet. The contents of local files are cached until their modification time or size changes.
+
+    :param path: The path or URL of the snippet.
+    :return: The contents of the snippet.
+    :raises FileNotFoundError: Raised in case the snippet does not exist.
+    """
+    if not path.startswith("/"):
+        return utils.read_file_contents(path, fetch_if_remote=True)
+    fingerprint = snippet_fingerprint(path)
+    if fingerprint is None:
+        raise FileNotFoundError(f"File {path} does not exist")
+    with _snippet_contents_lock:
+        cached = _snippet_contents.get(path)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    contents = utils.read_file_contents(path, fetch_if_remote=True)
+    with _snippet_contents_lock:
+        _snippet_contents[path] = (fingerprint, contents)
+    return contents
+
+
 class CobblerTemplate(generate_cheetah_macros()):
     """
     This class will allow us to include any pure python builtin functions.
@@ -62,6 +191,9 @@ class CobblerTemplate(generate_cheetah_macros()):
     builtins in the same base template. We don't need to override __init__
     """
 
+    # The compiled template which implements SNIPPET, it is the same for every instance.
+    _builtin_template = None
+
     def __init__(self, **kwargs):
         """
         Constructor for this derived class. We include two additional default templates.
@@ -81,21 +213,23 @@ class CobblerTemplate(generate_cheetah_macros()):
         # This follows all of the rules of snippets and advanced snippets. First it searches for a per-system snippet,
         # then a per-profile snippet, then a general snippet. If none is found, a comment explaining the error is
         # substituted.
-        self.BuiltinTemplate = Template.compile(
-            source="\n".join(
-                [
-                    "#def SNIPPET($file)",
-                    "#set $snippet = $read_snippet($file)",
-                    "#if $snippet",
-                    "#include source=$snippet",
-                    "#else",
-                    "# Error: no snippet data for $file",
-                    "#end if",
-                    "#end def",
-                ]
+        if CobblerTemplate._builtin_template is None:
+            CobblerTemplate._builtin_template = Template.compile(
+                source="\n".join(
+                    [
+                        "#def SNIPPET($file)",
+                        "#set $snippet = $read_snippet($file)",
+                        "#if $snippet",
+                        "#include source=$snippet",
+                        "#else",
+                        "# Error: no snippet data for $file",
+                        "#end if",
+                        "#end def",
+                    ]
+                )
+                + "\n"
             )
-            + "\n"
-        )
+        self.BuiltinTemplate = CobblerTemplate._builtin_template
         super().__init__(**kwargs)
 
     # OK, so this function gets called by Cheetah.Template.Template.__init__ to compile the template into a class. This
@@ -126,6 +260,7 @@ class CobblerTemplate(generate_cheetah_macros()):
                 if hasattr(file, "read"):
                     source = file.read()
                 else:
+                    _record_snippet(file)
                     if os.path.exists(file):
                         with open(file, "r", encoding="UTF-8") as snippet_fd:
                             source = "#errorCatcher Echo\n" + snippet_fd.read()
@@ -138,13 +273,33 @@ class CobblerTemplate(generate_cheetah_macros()):
             results = snippet_regex.sub(replacer, source)
             return results, file
 
+        # The preprocessing only depends on the source, so the compiled classes are cached before it runs.
+        cache_key = _compile_cache_key(args, kwargs)
+        if cache_key is not None:
+            with _compiled_templates_lock:
+                cached = _compiled_templates.get(cache_key)
+                if cached is not None:
+                    _compiled_templates.move_to_end(cache_key)
+                    compile_cache_stats["hits"] += 1
+                    return cached
+                compile_cache_stats["misses"] += 1
+            # Cheetah's own cache is unbounded, ours replaces it.
+            kwargs["cacheCompilationResults"] = False
+
         preprocessors = [preprocess]
         if "preprocessors" in kwargs:
             preprocessors.extend(kwargs["preprocessors"])
         kwargs["preprocessors"] = preprocessors
 
         # Now let Cheetah do the actual compilation
-        return super().compile(*args, **kwargs)
+        compiled = super().compile(*args, **kwargs)
+        if cache_key is not None:
+            with _compiled_templates_lock:
+                _compiled_templates[cache_key] = compiled
+                while len(_compiled_templates) > COMPILE_CACHE_SIZE:
+                    _, evicted = _compiled_templates.popitem(last=False)
+                    sys.modules.pop(evicted.__module__, None)
+        return compiled
 
     def read_snippet(self, file: str) -> Optional[str]:
         """
@@ -170,17 +325,16 @@ class CobblerTemplate(generate_cheetah_macros()):
                     f"{self.getVar('autoinstall_snippets_dir')}/per_{snippet_class}/{file}/"
                     f"{self.getVar(f'{snippet_class}_name')}"
                 )
+                _record_snippet(full_path)
                 try:
-                    contents = utils.read_file_contents(full_path, fetch_if_remote=True)
-                    return contents
+                    return read_snippet_file(full_path)
                 except FileNotFoundError:
                     pass
 
         try:
             full_path = f"{self.getVar('autoinstall_snippets_dir')}/{file}"
-            return "#errorCatcher ListErrors\n" + utils.read_file_contents(
-                full_path, fetch_if_remote=True
-            )
+            _record_snippet(full_path)
+            return "#errorCatcher ListErrors\n" + read_snippet_file(full_path)
         except FileNotFoundError:
             return None
 
@@ -10,18 +10,82 @@ This is the code behind 'cobbler sync'.
 import logging
 import os
 import os.path
-import pathlib
 import re
 import socket
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 
-from cobbler import enums, templar, utils
+from cobbler import enums, templar, template_api, utils
 from cobbler.cexceptions import CX
 from cobbler.enums import Archs, ImageTypes
 from cobbler.utils import input_converters
 from cobbler.validate import validate_autoinstall_script_name
 from cobbler.utils import filesystem_helpers
 
+# Rendered boot menu entries of profiles and images by (uid, boot loader). Each entry holds the cache key of the item,
+# the files it was rendered from with their fingerprints and the rendered entry.
+_menu_fragments: Dict[Tuple[str, str], Tuple[tuple, dict, Optional[str]]] = {}
+menu_fragment_stats = {"hits": 0, "misses": 0}
+
+
+def clear_menu_fragment_cache():
+    """
+    Drop all rendered boot menu entries and reset the hit and miss counters.
+    """
+    _menu_fragments.clear()
+    menu_fragment_stats["hits"] = 0
+    menu_fragment_stats["misses"] = 0
+
+
+class SystemRenderContext:
+    """
+    Data which is shared by all files rendered for one system. The system is blended once and the flattened and
+    unflattened views are derived from that, the settings are converted once for all interfaces and boot loaders.
+    """
+
+    def __init__(self, api):
+        """
+        Constructor
+
+        :param api: The API to resolve information with.
+        """
+        self.api = api
+        self.__settings: Optional[dict] = None
+        self.__blended: Dict[str, dict] = {}
+
+    def settings(self) -> dict:
+        """
+        Get the settings as they are passed to the templates.
+
+        :return: The settings. This is shared by all callers and must not be modified.
+        """
+        if self.__settings is None:
+            self.__settings = input_converters.input_string_or_dict(
+                self.api.settings().to_dict()
+            )
+        return self.__settings
+
+    def blend(self, obj, remove_dicts: bool) -> dict:
+        """
+        Get the result of ``utils.blender()`` for an object.
+
+        :param obj: The object to blend.
+        :param remove_dicts: Whether the dicts koan needs as strings should be converted.
+        :return: A copy of the blended data which the caller may modify.
+        """
+        blended = self.__blended.get(obj.uid)
+        if blended is None:
+            blended = utils.blender(self.api, False, obj)
+            self.__blended[obj.uid] = blended
+        # Callers modify the dicts and lists of the result, e.g. the kernel options, but not what is nested in them.
+        result = {
+            key: value.copy() if isinstance(value, (dict, list)) else value
+            for key, value in blended.items()
+        }
+        if remove_dicts:
+            utils.flatten(result)
+        return result
+
 
 class TFTPGen:
     """
@@ -43,6 +107,8 @@ class TFTPGen:
         self.menus = api.menus()
         self.templar = templar.Templar(self.api)
         self.bootloc = self.settings.tftpboot_location
+        # The render context of the system whose files the current thread writes, see write_all_system_files().
+        self.__local = threading.local()
 
     def copy_bootloaders(self, dest):
         """
@@ -150,13 +216,49 @@ class TFTPGen:
         newfile = os.path.join(images_dir, img.name)
         filesystem_helpers.linkfile(self.api, filename, newfile)
 
+    def __blend(self, obj, remove_dicts: bool) -> dict:
+        """
+        Blend an object. While the files of a system are written, the render context of the system is used.
+
+        :param obj: The object to blend.
+        :param remove_dicts: Whether the dicts koan needs as strings should be converted.
+        :return: The blended data.
+        """
+        context = getattr(self.__local, "context", None)
+        if context is None:
+            return utils.blender(self.api, remove_dicts, obj)
+        return context.blend(obj, remove_dicts)
+
+    def __settings_dict(self) -> dict:
+        """
+        Get the settings as they are passed to the templates. While the files of a system are written, the snapshot of
+        the render context of the system is used.
+
+        :return: The settings.
+        """
+        context = getattr(self.__local, "context", None)
+        if context is None:
+            return input_converters.input_string_or_dict(self.settings.to_dict())
+        return context.settings()
+
     def write_all_system_files(self, system, menu_items):
         """
         Writes all files for tftp for a given system with the menu items handed to this method. The system must have a
         profile attached. Otherwise this method throws an error.
 
         :param system: The system to generate files for.
-        :param menu_items: TODO
+        :param menu_items: The menu items as returned by get_menu_items(). They are passed to the boot loader
+                           templates as "menu_items".
+        """
+        self.__local.context = SystemRenderContext(self.api)
+        try:
+            self.__write_all_system_files(system, menu_items)
+        finally:
+            self.__local.context = None
+
+    def __write_all_system_files(self, system, menu_items):
+        """
+        Writes all files for tftp for a given system, see write_all_system_files() for the parameters.
         """
         profile = system.get_conceptual_parent()
         if profile is None:
@@ -190,7 +292,7 @@ class TFTPGen:
             parm_f = f"{pxe_f}_parm"
 
             self.logger.info("Files: (conf,param) - (%s,%s)", conf_f, parm_f)
-            blended = utils.blender(self.api, True, system)
+            blended = self.__blend(system, True)
             # FIXME: profiles also need this data!
             # gather default kernel_options and default kernel_options_s390x
             kernel_options = self.build_kernel_options(
@@ -229,17 +331,16 @@ class TFTPGen:
                     initrd_path = os.path.join(
                         "/images", distro.name, os.path.basename(distro.initrd)
                     )
-                    with open(pxe_f, "w", encoding="UTF-8") as out:
-                        out.write(kernel_path + "\n" + initrd_path + "\n")
-                    with open(parm_f, "w", encoding="UTF-8") as out:
-                        out.write(kopts_aligned)
+                    filesystem_helpers.write_file(
+                        pxe_f, kernel_path + "\n" + initrd_path + "\n"
+                    )
+                    filesystem_helpers.write_file(parm_f, kopts_aligned)
                     # Write conf file with one newline in it if netboot is enabled
-                    with open(conf_f, "w", encoding="UTF-8") as out:
-                        out.write("\n")
+                    filesystem_helpers.write_file(conf_f, "\n")
                 else:
                     self.logger.info("S390x: netboot_disabled")
                     # Write empty conf file if netboot is disabled
-                    pathlib.Path(conf_f).touch()
+                    filesystem_helpers.write_file(conf_f, "")
             else:
                 # ensure the files do exist
                 self.logger.info("S390x: management not supported")
@@ -325,9 +426,10 @@ class TFTPGen:
                         link_path = os.path.join(
                             self.bootloc, "grub", "system_link", system.name
                         )
-                        filesystem_helpers.rmfile(link_path)
                         filesystem_helpers.mkdir(os.path.dirname(link_path))
-                        os.symlink(os.path.join("..", "system", grub_name), link_path)
+                        filesystem_helpers.symlink(
+                            os.path.join("..", "system", grub_name), link_path
+                        )
                 else:
                     self.write_pxe_file(
                         pxe_path,
@@ -357,7 +459,12 @@ class TFTPGen:
             timeout_action = default.profile
 
         boot_menu = {}
-        metadata = self.get_menu_items()
+        # The menu fragments used by this call, the others are dropped afterwards.
+        used_fragments: set = set()
+        archs: List[Optional[enums.Archs]] = [None]
+        archs.extend(enums.Archs)
+        levels = self.get_menu_levels(None, archs, used_fragments)
+        metadata = levels[None]
         loader_metadata = metadata
         menu_items = metadata["menu_items"]
         menu_labels = metadata["menu_labels"]
@@ -368,36 +475,32 @@ class TFTPGen:
             loader_metadata["menu_items"] = menu_items["pxe"]
             loader_metadata["menu_labels"] = menu_labels["pxe"]
             outfile = os.path.join(self.bootloc, "pxelinux.cfg", "default")
-            with open(
+            template_data = template_api.read_snippet_file(
                 os.path.join(
                     self.settings.boot_loader_conf_template_dir, "pxe_menu.template"
-                ),
-                encoding="UTF-8",
-            ) as template_src:
-                template_data = template_src.read()
-                boot_menu["pxe"] = self.templar.render(
-                    template_data, loader_metadata, outfile
                 )
+            )
+            boot_menu["pxe"] = self.templar.render(
+                template_data, loader_metadata, outfile
+            )
 
         # Write the iPXE menu:
         if "ipxe" in menu_items:
             loader_metadata["menu_items"] = menu_items["ipxe"]
             loader_metadata["menu_labels"] = menu_labels["ipxe"]
             outfile = os.path.join(self.bootloc, "ipxe", "default.ipxe")
-            with open(
+            template_data = template_api.read_snippet_file(
                 os.path.join(
                     self.settings.boot_loader_conf_template_dir, "ipxe_menu.template"
-                ),
-                encoding="UTF-8",
-            ) as template_src:
-                template_data = template_src.read()
-                boot_menu["ipxe"] = self.templar.render(
-                    template_data, loader_metadata, outfile
                 )
+            )
+            boot_menu["ipxe"] = self.templar.render(
+                template_data, loader_metadata, outfile
+            )
 
         # Write the grub menu:
         for arch in enums.Archs:
-            arch_metadata = self.get_menu_items(arch)
+            arch_metadata = levels[arch]
             arch_menu_items = arch_metadata["menu_items"]
 
             if "grub" in arch_menu_items:
@@ -405,8 +508,11 @@ class TFTPGen:
                 outfile = os.path.join(
                     self.bootloc, "grub", f"{arch.value}_menu_items.cfg"
                 )
-                with open(outfile, "w+", encoding="UTF-8") as grub_arch_fd:
-                    grub_arch_fd.write(arch_menu_items["grub"])
+                filesystem_helpers.write_file(outfile, arch_menu_items["grub"])
+
+        # Entries of removed items are not needed anymore.
+        for key in set(_menu_fragments) - used_fragments:
+            _menu_fragments.pop(key, None)
         return boot_menu
 
     def get_menu_items(self, arch: Optional[enums.Archs] = None) -> dict:
@@ -419,13 +525,12 @@ class TFTPGen:
         """
         return self.get_menu_level(None, arch)
 
-    def get_submenus(self, menu, metadata: dict, arch: enums.Archs):
+    def get_child_menus(self, menu) -> list:
         """
-        Generates submenus metatdata for pxe, ipxe and grub.
+        Get the submenus of a menu.
 
-        :param menu: The menu for which boot files are generated. (Optional)
-        :param metadata: Pass additional parameters to the ones being collected during the method.
-        :param arch: The processor architecture to generate the menu items for. (Optional)
+        :param menu: The menu to get the submenus of. If None, the top-level menus are returned.
+        :return: The submenus sorted by name.
         """
         if menu:
             child_names = menu.get_children(sort_list=True)
@@ -436,13 +541,34 @@ class TFTPGen:
                     childs.append(child)
         else:
             childs = [child for child in self.menus if child.parent is None]
+        return childs
+
+    def get_submenus(
+        self,
+        menu,
+        metadata: dict,
+        arch: enums.Archs,
+        child_levels: Optional[list] = None,
+    ):
+        """
+        Generates submenus metatdata for pxe, ipxe and grub.
+
+        :param menu: The menu for which boot files are generated. (Optional)
+        :param metadata: Pass additional parameters to the ones being collected during the method.
+        :param arch: The processor architecture to generate the menu items for. (Optional)
+        :param child_levels: The submenus and their metadata for this arch. If not given, they are generated.
+        """
+        if child_levels is None:
+            child_levels = [
+                (child, self.get_menu_level(child, arch))
+                for child in self.get_child_menus(menu)
+            ]
 
         nested_menu_items = {}
         menu_labels = {}
         boot_loaders = utils.get_supported_system_boot_loaders()
 
-        for child in childs:
-            temp_metadata = self.get_menu_level(child, arch)
+        for child, temp_metadata in child_levels:
             temp_items = temp_metadata["menu_items"]
 
             for boot_loader in boot_loaders:
@@ -471,13 +597,20 @@ class TFTPGen:
         metadata["menu_items"] = nested_menu_items
         metadata["menu_labels"] = menu_labels
 
-    def get_profiles_menu(self, menu, metadata: dict, arch: enums.Archs):
+    def get_profiles_menu(
+        self,
+        menu,
+        metadata: dict,
+        arch: enums.Archs,
+        used_fragments: Optional[set] = None,
+    ):
         """
         Generates profiles metadata for pxe, ipxe and grub.
 
         :param menu: The menu for which boot files are generated. (Optional)
         :param metadata: Pass additional parameters to the ones being collected during the method.
         :param arch: The processor architecture to generate the menu items for. (Optional)
+        :param used_fragments: Collects the cache keys of the menu fragments that were used. (Optional)
         """
         if menu:
             profile_list = [
@@ -510,14 +643,8 @@ class TFTPGen:
             for boot_loader in boot_loaders:
                 if boot_loader not in profile.boot_loaders:
                     continue
-                contents = self.write_pxe_file(
-                    filename=None,
-                    system=None,
-                    profile=profile,
-                    distro=distro,
-                    arch=arch,
-                    image=None,
-                    bootloader_format=boot_loader,
+                contents = self.get_menu_fragment(
+                    profile, distro, arch, boot_loader, used_fragments
                 )
                 if contents and contents != "":
                     if boot_loader not in current_menu_items:
@@ -539,13 +666,20 @@ class TFTPGen:
         metadata["menu_items"] = current_menu_items
         metadata["menu_labels"] = menu_labels
 
-    def get_images_menu(self, menu, metadata: dict, arch: enums.Archs):
+    def get_images_menu(
+        self,
+        menu,
+        metadata: dict,
+        arch: enums.Archs,
+        used_fragments: Optional[set] = None,
+    ):
         """
         Generates profiles metadata for pxe, ipxe and grub.
 
         :param menu: The menu for which boot files are generated. (Optional)
         :param metadata: Pass additional parameters to the ones being collected during the method.
         :param arch: The processor architecture to generate the menu items for. (Optional)
+        :param used_fragments: Collects the cache keys of the menu fragments that were used. (Optional)
         """
         if menu:
             image_list = [image for image in self.images if image.menu == menu.name]
@@ -567,14 +701,8 @@ class TFTPGen:
                 for boot_loader in boot_loaders:
                     if boot_loader not in image.boot_loaders:
                         continue
-                    contents = self.write_pxe_file(
-                        filename=None,
-                        system=None,
-                        profile=None,
-                        distro=None,
-                        arch=arch,
-                        image=image,
-                        bootloader_format=boot_loader,
+                    contents = self.get_menu_fragment(
+                        image, None, arch, boot_loader, used_fragments
                     )
                     if contents and contents != "":
                         if boot_loader not in current_menu_items:
@@ -596,6 +724,66 @@ class TFTPGen:
         metadata["menu_items"] = current_menu_items
         metadata["menu_labels"] = menu_labels
 
+    def get_menu_fragment(
+        self,
+        item,
+        distro,
+        arch: enums.Archs,
+        boot_loader: str,
+        used_fragments: Optional[set] = None,
+    ) -> Optional[str]:
+        """
+        Generates the boot menu entry of a profile or an image. The entry is cached until the item, one of its parents,
+        the settings or one of the templates it was rendered from changes. Systems are not part of the key, so adding
+        a system does not render the entries of its profile again.
+
+        :param item: The profile or image.
+        :param distro: The distro of the profile or None for an image.
+        :param arch: The processor architecture of the item.
+        :param boot_loader: The boot loader to generate the entry for.
+        :param used_fragments: Collects the cache keys of the menu fragments that were used. (Optional)
+        :return: The entry or None if the item can't be booted with this boot loader.
+        """
+        key = (item.uid, boot_loader)
+        if used_fragments is not None:
+            used_fragments.add(key)
+        cache_key = item.resolve_cache_key()
+        cached = _menu_fragments.get(key)
+        if (
+            cached is not None
+            and cached[0] == cache_key
+            and all(
+                template_api.snippet_fingerprint(path) == fingerprint
+                for path, fingerprint in cached[1].items()
+            )
+        ):
+            menu_fragment_stats["hits"] += 1
+            return cached[2]
+        menu_fragment_stats["misses"] += 1
+
+        template = os.path.join(
+            self.settings.boot_loader_conf_template_dir, f"{boot_loader}.template"
+        )
+        template_fingerprint = template_api.snippet_fingerprint(template)
+        with template_api.track_snippets() as dependencies:
+            contents = self.write_pxe_file(
+                filename=None,
+                system=None,
+                profile=item if item.COLLECTION_TYPE == "profile" else None,
+                distro=distro,
+                arch=arch,
+                image=item if item.COLLECTION_TYPE == "image" else None,
+                bootloader_format=boot_loader,
+            )
+        dependencies[template] = template_fingerprint
+
+        # Entries with errors or remote snippets are rendered again every time.
+        if not self.templar.last_errors and (-1, -1) not in dependencies.values():
+            _menu_fragments[key] = (cache_key, dependencies, contents)
+        else:
+            _menu_fragments.pop(key, None)
+        return contents
+
     def get_menu_level(self, menu=None, arch: Optional[enums.Archs] = None) -> dict:
         """
         Generates menu items for submenus, pxe, ipxe and grub.
@@ -605,25 +793,45 @@ class TFTPGen:
         :returns: A dictionary with the pxe and grub menu items. It has the keys from
                   utils.get_supported_system_boot_loaders().
         """
-        metadata = {}
-        metadata["parent_menu_name"] = "Cobbler"
-        metadata["parent_menu_label"] = "Cobbler"
+        return self.get_menu_levels(menu, [arch])[arch]
+
+    def get_menu_levels(
+        self,
+        menu=None,
+        archs: Optional[List[Optional[enums.Archs]]] = None,
+        used_fragments: Optional[set] = None,
+    ) -> Dict[Optional[enums.Archs], dict]:
+        """
+        Generates menu items for submenus, pxe, ipxe and grub for several processor architectures at once. The menu
+        tree is only walked once and the submenu templates are only read once for all of them.
+
+        :param menu: The menu for which boot files are generated. (Optional)
+        :param archs: The processor architectures to generate the menu items for. None includes the items of all
+                      architectures.
+        :param used_fragments: Collects the cache keys of the menu fragments that were used. (Optional)
+        :returns: The metadata as returned by get_menu_level() per processor architecture.
+        """
+        if archs is None:
+            archs = [None]
+        base_metadata = {}
+        base_metadata["parent_menu_name"] = "Cobbler"
+        base_metadata["parent_menu_label"] = "Cobbler"
         template_data = {}
         boot_loaders = utils.get_supported_system_boot_loaders()
 
         if menu:
             parent_menu = menu.parent
-            metadata["menu_name"] = menu.name
-            metadata["menu_label"] = (
+            base_metadata["menu_name"] = menu.name
+            base_metadata["menu_label"] = (
                 menu.display_name
                 if menu.display_name and menu.display_name != ""
                 else menu.name
             )
             if parent_menu and parent_menu != "":
-                metadata["parent_menu_name"] = parent_menu.name
-                metadata["parent_menu_label"] = parent_menu.name
+                base_metadata["parent_menu_name"] = parent_menu.name
+                base_metadata["parent_menu_label"] = parent_menu.name
                 if parent_menu.display_name and parent_menu.display_name != "":
-                    metadata["parent_menu_label"] = parent_menu.display_name
+                    base_metadata["parent_menu_label"] = parent_menu.display_name
 
         for boot_loader in boot_loaders:
             template = os.path.join(
@@ -631,8 +839,7 @@ class TFTPGen:
                 f"{boot_loader}_submenu.template",
             )
             if os.path.exists(template):
-                with open(template, encoding="UTF-8") as template_fh:
-                    template_data[boot_loader] = template_fh.read()
+                template_data[boot_loader] = template_api.read_snippet_file(template)
             else:
                 self.logger.warning(
                     'Template for building a submenu not found for bootloader "%s"! Submenu '
@@ -640,13 +847,53 @@ class TFTPGen:
                     boot_loader,
                 )
 
-        self.get_submenus(menu, metadata, arch)
-        nested_menu_items = metadata["menu_items"]
-        self.get_profiles_menu(menu, metadata, arch)
-        current_menu_items = metadata["menu_items"]
-        self.get_images_menu(menu, metadata, arch)
-        current_menu_items = metadata["menu_items"]
+        child_levels = [
+            (child, self.get_menu_levels(child, archs, used_fragments))
+            for child in self.get_child_menus(menu)
+        ]
+
+        levels = {}
+        for arch in archs:
+            metadata = dict(base_metadata)
+            self.get_submenus(
+                menu,
+                metadata,
+                arch,
+                [(child, child_level[arch]) for child, child_level in child_levels],
+            )
+            nested_menu_items = metadata["menu_items"]
+            self.get_profiles_menu(menu, metadata, arch, used_fragments)
+            current_menu_items = metadata["menu_items"]
+            self.get_images_menu(menu, metadata, arch, used_fragments)
+            current_menu_items = metadata["menu_items"]
+            levels[arch] = self.__assemble_menu_level(
+                menu,
+                metadata,
+                template_data,
+                nested_menu_items,
+                current_menu_items,
+            )
+        return levels
+
+    def __assemble_menu_level(
+        self,
+        menu,
+        metadata: dict,
+        template_data: dict,
+        nested_menu_items: dict,
+        current_menu_items: dict,
+    ) -> dict:
+        """
+        Combine the items of the submenus, profiles and images of a menu and render the submenu templates.
 
+        :param menu: The menu for which boot files are generated. (Optional)
+        :param metadata: The metadata collected for the menu.
+        :param template_data: The submenu templates per boot loader.
+        :param nested_menu_items: The items of the submenus per boot loader.
+        :param current_menu_items: The items of the profiles and images per boot loader.
+        :returns: The metadata with the menu items and labels.
+        """
+        boot_loaders = utils.get_supported_system_boot_loaders()
         menu_items = {}
         menu_labels = metadata["menu_labels"]
         line_pat = re.compile(r"^(.+)$", re.MULTILINE)
@@ -759,8 +1006,7 @@ class TFTPGen:
         if boot_loaders is None or bootloader_format not in boot_loaders:
             return None
 
-        settings = input_converters.input_string_or_dict(self.settings.to_dict())
-        metadata.update(settings)
+        metadata.update(self.__settings_dict())
         # ---
         # just some random variables
         buffer = ""
@@ -828,8 +1074,7 @@ class TFTPGen:
 
         # get the template
         if metadata["kernel_path"] is not None:
-            with open(template, encoding="UTF-8") as template_fh:
-                template_data = template_fh.read()
+            template_data = template_api.read_snippet_file(template)
         else:
             # this is something we can't PXE boot
             template_data = "\n"
@@ -842,8 +1087,7 @@ class TFTPGen:
             # Ensure destination path exists to avoid race condition
             if not os.path.exists(os.path.dirname(filename)):
                 filesystem_helpers.mkdir(os.path.dirname(filename))
-            with open(filename, "w", encoding="UTF-8") as pxe_file_fd:
-                pxe_file_fd.write(buffer)
+            filesystem_helpers.write_file(filename, buffer)
         return buffer
 
     def build_kernel(
@@ -866,14 +1110,14 @@ class TFTPGen:
         # ---
 
         if system:
-            blended = utils.blender(self.api, True, system)
-            meta_blended = utils.blender(self.api, False, system)
+            blended = self.__blend(system, True)
+            meta_blended = self.__blend(system, False)
         elif profile:
-            blended = utils.blender(self.api, True, profile)
-            meta_blended = utils.blender(self.api, False, profile)
+            blended = self.__blend(profile, True)
+            meta_blended = self.__blend(profile, False)
         elif image:
-            blended = utils.blender(self.api, True, image)
-            meta_blended = utils.blender(self.api, False, image)
+            blended = self.__blend(image, True)
+            meta_blended = self.__blend(image, False)
         else:
             blended = {}
             meta_blended = {}
@@ -953,7 +1197,7 @@ class TFTPGen:
         management_interface = None
         management_mac = None
         if system is not None:
-            blended = utils.blender(self.api, False, system)
+            blended = self.__blend(system, False)
             # find the first management interface
             try:
                 for intf in list(system.interfaces.keys()):
@@ -966,9 +1210,9 @@ class TFTPGen:
                 # just skip this then
                 pass
         elif profile is not None:
-            blended = utils.blender(self.api, False, profile)
+            blended = self.__blend(profile, False)
         else:
-            blended = utils.blender(self.api, False, image)
+            blended = self.__blend(image, False)
 
         append_line = ""
         kopts = blended.get("kernel_options", {})
@@ -1266,8 +1510,7 @@ class TFTPGen:
 
             if write_file:
                 self.logger.info("generating: %s", dest)
-                with open(dest, "w", encoding="UTF-8") as template_fd:
-                    template_fd.write(buffer)
+                filesystem_helpers.write_file(dest, buffer)
 
         return results
 
@@ -1548,15 +1791,14 @@ class TFTPGen:
         self.logger.info("generating: %s", bootcfg_path)
         if not os.path.exists(os.path.dirname(bootcfg_path)):
             filesystem_helpers.mkdir(os.path.dirname(bootcfg_path))
-        with open(bootcfg_path, "w", encoding="UTF-8") as bootcfg_path_fd:
-            bootcfg_path_fd.write(buffer)
+        filesystem_helpers.write_file(bootcfg_path, buffer)
 
         # symlink to esxi UEFI bootloader in same dir as boot.cfg
         # based on https://stackoverflow.com/a/55741590
-        if os.path.isfile(os.path.join(bootloc_esxi, "mboot.efi")):
-            link_file = os.path.join(
-                bootloc_esxi, os.path.dirname(filename), "mboot.efi"
-            )
+        link_file = os.path.join(bootloc_esxi, os.path.dirname(filename), "mboot.efi")
+        if os.path.isfile(os.path.join(bootloc_esxi, "mboot.efi")) and not (
+            os.path.islink(link_file) and os.readlink(link_file) == "../../mboot.efi"
+        ):
             while True:
                 temp_link_file = os.path.join(
                     bootloc_esxi, os.path.dirname(filename), "mboot.efi.tmp"
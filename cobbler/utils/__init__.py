@@ -20,7 +20,7 @@ import urllib.parse
 import urllib.request
 from functools import reduce
 from pathlib import Path
-from typing import List, Optional, Pattern, Union
+from typing import Dict, List, Optional, Pattern, Tuple, Union
 
 import distro
 import netaddr
@@ -57,6 +57,10 @@ re_initrd = re.compile(r"(initrd(.*)\.img|ramdisk\.image\.gz|boot\.sdi|imgpayld\
 # is another log.
 logger = logging.getLogger()
 
+# Consolidated data of an object and all of its parents, keyed by the uid of the object. See :func:`blender`.
+__blend_cache: Dict[str, Tuple[tuple, dict]] = {}
+blend_cache_stats = {"hits": 0, "misses": 0}
+
 
 def die(msg: str):
     """
@@ -436,11 +440,21 @@ def blender(api_handle, remove_dicts: bool, root_obj):
     :param root_obj: The object which should act as the root-node object.
     :return: A dictionary with all the information from the root node downwards.
     """
-    tree = root_obj.grab_tree()
-    tree.reverse()  # start with top of tree, override going down
-    results = {}
-    for node in tree:
-        __consolidate(node, results)
+    parent = root_obj.parent
+    if parent is None:
+        results = __copy_layer(__settings_layer(api_handle.settings()))
+    else:
+        results = __copy_layer(__blend_layer(parent))
+        # The lists of children are changed in place, so they are not part of the cached layers.
+        ancestors = []
+        while parent is not None:
+            ancestors.insert(0, parent)
+            parent = parent.parent
+        children = []
+        for ancestor in ancestors:
+            children.extend(ancestor.children)
+        results["children"] = uniquify(children)
+    __consolidate(root_obj, results)
 
     # Make interfaces accessible without Cheetah-voodoo in the templates
     # EXAMPLE: $ip == $ip0, $ip1, $ip2 and so on.
@@ -572,6 +586,80 @@ def uniquify(seq: list) -> list:
     return result
 
 
+def __copy_layer(layer: dict) -> dict:
+    """
+    Copy a cached blend layer, so that merging data into the copy does not alter the cached layer. Dictionaries and
+    lists are copied one level deep, the same way :func:`__consolidate` copies the data of a node.
+
+    :param layer: The layer to copy.
+    :return: The copy of the layer.
+    """
+    result = {}
+    for key, value in layer.items():
+        if isinstance(value, (dict, list)):
+            result[key] = value.copy()
+        else:
+            result[key] = value
+    return result
+
+
+def __settings_layer(settings_obj) -> dict:
+    """
+    Get the consolidated data of the settings. The result is cached until the settings are modified.
+
+    :param settings_obj: The settings of Cobbler.
+    :return: The cached layer. This must not be modified.
+    """
+    key = (id(settings_obj), settings_obj.modification_count)
+    cached = __blend_cache.get("settings")
+    if cached is not None and cached[0] == key:
+        blend_cache_stats["hits"] += 1
+        return cached[1]
+    blend_cache_stats["misses"] += 1
+    layer = __consolidate(settings_obj, {})
+    __blend_cache["settings"] = (key, layer)
+    return layer
+
+
+def __blend_layer(node) -> dict:
+    """
+    Get the consolidated data of an object and all of its parents. The result is cached per object until the object,
+    one of its parents or the settings are modified, so all children of an object share the same layer. Layers of
+    systems are not cached as changes to their network interfaces are not tracked.
+
+    :param node: The object to get the layer for.
+    :return: The layer. This must not be modified.
+    """
+    key = None
+    if node.COLLECTION_TYPE != "system":
+        key = node.resolve_cache_key()
+        cached = __blend_cache.get(node.uid)
+        if cached is not None and cached[0] == key:
+            blend_cache_stats["hits"] += 1
+            return cached[1]
+        blend_cache_stats["misses"] += 1
+
+    parent = node.parent
+    if parent is None:
+        layer = __copy_layer(__settings_layer(node.api.settings()))
+    else:
+        layer = __copy_layer(__blend_layer(parent))
+    __consolidate(node, layer)
+    layer.pop("children", None)
+    if key is not None:
+        __blend_cache[node.uid] = (key, layer)
+    return layer
+
+
+def clear_blend_cache():
+    """
+    Drop all cached blend layers and reset the hit and miss counters.
+    """
+    __blend_cache.clear()
+    blend_cache_stats["hits"] = 0
+    blend_cache_stats["misses"] = 0
+
+
 def __consolidate(node, results: dict) -> dict:
     """
     Merge data from a given node with the aggregate of all data from past scanned nodes. Dictionaries and arrays are
@@ -911,14 +999,18 @@ def command_existing(cmd: str) -> bool:
     return shutil.which(cmd) is not None
 
 
-def subprocess_sp(cmd, shell: bool = True, process_input=None):
+def subprocess_sp(
+    cmd, shell: bool = True, process_input=None, timeout: Optional[float] = None
+):
     """
     Call a shell process and redirect the output for internal usage.
 
     :param cmd: The command to execute in a subprocess call.
     :param shell: Whether to use a shell or not for the execution of the command.
     :param process_input: If there is any input needed for that command to stdin.
+    :param timeout: The number of seconds after which the process is killed. ``None`` waits forever.
     :return: A tuple of the output and the return code.
+    :raises subprocess.TimeoutExpired: Raised in case the process was killed after the timeout.
     """
     logger.info("running: %s", cmd)
 
@@ -936,7 +1028,14 @@ def subprocess_sp(cmd, shell: bool = True, process_input=None):
             encoding="utf-8",
             close_fds=True,
         ) as subprocess_popen_obj:
-            (out, err) = subprocess_popen_obj.communicate(process_input)
+            try:
+                (out, err) = subprocess_popen_obj.communicate(
+                    process_input, timeout=timeout
+                )
+            except subprocess.TimeoutExpired:
+                subprocess_popen_obj.kill()
+                subprocess_popen_obj.communicate()
+                raise
             return_code = subprocess_popen_obj.returncode
     except OSError:
         log_exc()
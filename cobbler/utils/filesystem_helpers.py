@@ -2,6 +2,7 @@
 TODO
 """
 
+import contextlib
 import errno
 import glob
 import hashlib
@@ -9,9 +10,10 @@ import json
 import logging
 import os
 import shutil
+import threading
 import urllib
 import pathlib
-from typing import Union
+from typing import Dict, Iterator, Optional, Tuple, Union
 
 from cobbler.cexceptions import CX
 from cobbler.utils import log_exc, mtab
@@ -19,6 +21,146 @@ from cobbler import utils
 
 logger = logging.getLogger()
 
+# Per thread record of the files written by write_file() and symlink(), see track_writes().
+__written_files = threading.local()
+# The link cache of the running sync, see link_cache(). It is shared by all threads.
+__active_link_cache: Optional["LinkCache"] = None
+
+
+class LinkCache:
+    """
+    Keeps the data which is needed to link files in memory while a sync runs: the ``link_cache.json`` databases, the
+    SHA1 sums of the files and the devices of directories. The databases are written once by ``flush()`` instead of
+    after every hashed file.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        # lcache directory -> (database, dirty)
+        self.__databases: Dict[pathlib.Path, Tuple[dict, bool]] = {}
+        # (device, inode, size, mtime) -> sha1
+        self.__hashes: Dict[Tuple[int, int, int, int], str] = {}
+        # directory -> (device, mount point)
+        self.__devices: Dict[str, Tuple[str, str]] = {}
+
+    def __database(self, lcache: pathlib.Path) -> dict:
+        """
+        Get the ``link_cache.json`` database of a cache directory. It is read from disk on first use.
+
+        :param lcache: The cache directory.
+        :return: The database. Must only be used while holding the lock.
+        """
+        if lcache not in self.__databases:
+            database = {}
+            dbfile = lcache / "link_cache.json"
+            if dbfile.exists():
+                database = json.loads(dbfile.read_text(encoding="utf-8"))
+            self.__databases[lcache] = (database, False)
+        return self.__databases[lcache][0]
+
+    def hashfile(self, file_name: str, lcache=None) -> Optional[str]:
+        """
+        Returns the sha1sum of the file. The sum is memoized by the inode, size and mtime of the file.
+
+        :param file_name: The file to get the sha1sum of.
+        :param lcache: The directory of the ``link_cache.json`` file the sum is recorded in.
+        :return: The sha1 sum or None if the file doesn't exist.
+        """
+        try:
+            file_stat = os.stat(file_name)
+        except FileNotFoundError:
+            return None
+        file_key = (
+            file_stat.st_dev,
+            file_stat.st_ino,
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+        )
+        lcache_obj = None if lcache is None else pathlib.Path(lcache)
+        with self.__lock:
+            key = self.__hashes.get(file_key)
+            if key is None and lcache_obj is not None:
+                entry = self.__database(lcache_obj).get(file_name)
+                if entry is not None and entry[0] >= file_stat.st_mtime:
+                    key = entry[1]
+        if key is None:
+            key = sha1_file(file_name)
+        with self.__lock:
+            self.__hashes[file_key] = key
+            if lcache_obj is not None:
+                database = self.__database(lcache_obj)
+                if database.get(file_name, (None, None))[1] != key:
+                    database[file_name] = (file_stat.st_mtime, key)
+                    self.__databases[lcache_obj] = (database, True)
+        return key
+
+    def get_file_device_path(self, fname: str) -> Tuple[str, str]:
+        """
+        Same as ``mtab.get_file_device_path()``, but the mount point of every directory is only looked up once.
+
+        :param fname: The filename to split up.
+        :return: A tuple containing the device and relative filename.
+        """
+        fname = os.path.realpath(fname)
+        fdir = os.path.dirname(fname)
+        with self.__lock:
+            device = self.__devices.get(fdir)
+        if device is None:
+            device = mtab.get_dir_device(fdir)
+            with self.__lock:
+                self.__devices[fdir] = device
+        if device[1] != os.path.sep:
+            fname = fname[len(device[1]) :]
+        return device[0], fname
+
+    def flush(self):
+        """
+        Write the changed ``link_cache.json`` databases to disk.
+        """
+        with self.__lock:
+            for lcache, (database, dirty) in self.__databases.items():
+                if not dirty:
+                    continue
+                lcache.mkdir(parents=True, exist_ok=True)
+                (lcache / "link_cache.json").write_text(
+                    json.dumps(database), encoding="utf-8"
+                )
+                self.__databases[lcache] = (database, False)
+
+
+@contextlib.contextmanager
+def link_cache() -> Iterator[LinkCache]:
+    """
+    Keep a ``LinkCache`` for all linking done by ``linkfile()`` and ``hashfile()`` while the context is active, in all
+    threads. The databases are written when the outermost context is left. Forked sync workers inherit the cache, but
+    the sums they add are not written back.
+
+    :return: The active link cache.
+    """
+    global __active_link_cache  # pylint: disable=global-statement
+    if __active_link_cache is not None:
+        yield __active_link_cache
+        return
+    cache = LinkCache()
+    __active_link_cache = cache
+    try:
+        yield cache
+    finally:
+        __active_link_cache = None
+        cache.flush()
+
+
+def __file_device_path(fname: str) -> Tuple[str, str]:
+    """
+    Get the device and relative path of a file, from the active link cache if there is one.
+
+    :param fname: The filename to split up.
+    :return: A tuple containing the device and relative filename.
+    """
+    if __active_link_cache is not None:
+        return __active_link_cache.get_file_device_path(fname)
+    return mtab.get_file_device_path(fname)
+
 
 def is_safe_to_hardlink(src: str, dst: str, api) -> bool:
     """
@@ -32,8 +174,8 @@ def is_safe_to_hardlink(src: str, dst: str, api) -> bool:
              Otherwise returns False.
     """
     # FIXME: Calling this with emtpy strings returns True?!
-    (dev1, path1) = mtab.get_file_device_path(src)
-    (dev2, _) = mtab.get_file_device_path(dst)
+    (dev1, path1) = __file_device_path(src)
+    (dev2, _) = __file_device_path(dst)
     if dev1 != dev2:
         return False
     # Do not hardlink to a symbolic link! Chances are high the new link will be dangling.
@@ -82,9 +224,12 @@ def hashfile(file_name: str, lcache=None):
                    of the hash. The hash looked up would be checked against the Cobbler internal mtime of the object.
     :return: The sha1 sum or None if the file doesn't exist.
     """
+    if __active_link_cache is not None:
+        return __active_link_cache.hashfile(file_name, lcache=lcache)
+
     hashfile_db = {}
-    dbfile = pathlib.Path(lcache) / "link_cache.json"
     if lcache is not None:
+        dbfile = pathlib.Path(lcache) / "link_cache.json"
         if dbfile.exists():
             hashfile_db = json.loads(dbfile.read_text(encoding="utf-8"))
 
@@ -128,7 +273,7 @@ def cachefile(src: str, dst: str):
 def linkfile(api, src: str, dst: str, symlink_ok: bool = False, cache: bool = True):
     """
     Attempt to create a link dst that points to src. Because file systems suck we attempt several different methods or
-    bail to just copying the file.
+    bail to just copying the file. The destination is recorded by ``track_writes()``.
 
     :param api: This parameter is needed to check if a file can be hardlinked. This method fails if this parameter is
                 not present.
@@ -138,6 +283,14 @@ def linkfile(api, src: str, dst: str, symlink_ok: bool = False, cache: bool = Tr
     :param cache: If it is okay to use a cached file instead of the real one.
     :raises CX: Raised in case the API is not given.
     """
+    __linkfile(api, src, dst, symlink_ok, cache)
+    __record_write(dst, f"<- {src}")
+
+
+def __linkfile(api, src: str, dst: str, symlink_ok: bool, cache: bool):
+    """
+    See ``linkfile()``.
+    """
     dst_obj = pathlib.Path(dst)
     src_obj = pathlib.Path(src)
     if dst_obj.exists():
@@ -230,6 +383,7 @@ def copyremotefile(src: str, dst1: str, api=None):
         raise OSError(
             f"Error while getting remote file ({src} -> {dst1}):\n{error}"
         ) from error
+    __record_write(dst1, f"<- {src}")
 
 
 def copyfile_pattern(
@@ -261,6 +415,93 @@ def copyfile_pattern(
         linkfile(api, file, str(dst1), symlink_ok=symlink_ok, cache=cache)
 
 
+@contextlib.contextmanager
+def track_writes() -> Iterator[Dict[str, str]]:
+    """
+    Record every file that is written by ``write_file()``, ``symlink()``, ``linkfile()`` or ``copyremotefile()`` in the
+    current thread while the context is active. Files are recorded even if their content did not change. Nested contexts
+    also report to the outer ones. Linked and downloaded files can be large, so their source is recorded instead of a
+    fingerprint of their content. They never match ``file_fingerprint()``.
+
+    :return: A dict which is filled with the paths of the written files and their fingerprints.
+    """
+    outer = getattr(__written_files, "files", None)
+    files: Dict[str, str] = {}
+    __written_files.files = files
+    try:
+        yield files
+    finally:
+        __written_files.files = outer
+        if outer is not None:
+            outer.update(files)
+
+
+def __record_write(path: str, fingerprint: str):
+    """
+    Add a file to the files recorded by ``track_writes()``.
+
+    :param path: The path of the file.
+    :param fingerprint: The fingerprint of the file.
+    """
+    files = getattr(__written_files, "files", None)
+    if files is not None:
+        files[path] = fingerprint
+
+
+def file_fingerprint(path: str) -> Optional[str]:
+    """
+    Calculate the fingerprint of a file as it is recorded by ``track_writes()``.
+
+    :param path: The path of the file.
+    :return: The SHA256 of the file content, the target for symbolic links or None if the file does not exist.
+    """
+    if os.path.islink(path):
+        return f"-> {os.readlink(path)}"
+    try:
+        with open(path, "rb") as file_fd:
+            return hashlib.sha256(file_fd.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def write_file(path: str, data: str) -> bool:
+    """
+    Write text to a file. The file is only written if its current content differs, so unchanged files keep their
+    timestamps and no reader ever sees a partially rewritten file with identical content.
+
+    :param path: The file to write.
+    :param data: The new content of the file.
+    :return: True if the file was written, False if it already had this content.
+    """
+    encoded = data.encode("UTF-8")
+    try:
+        with open(path, "rb") as file_fd:
+            changed = file_fd.read() != encoded
+    except OSError:
+        changed = True
+    if changed:
+        with open(path, "w", encoding="UTF-8") as file_fd:
+            file_fd.write(data)
+    __record_write(path, hashlib.sha256(encoded).hexdigest())
+    return changed
+
+
+def symlink(target: str, path: str) -> bool:
+    """
+    Create a symbolic link unless it already exists and points to the same target.
+
+    :param target: The target the link should point to.
+    :param path: The path of the link.
+    :return: True if the link was (re)created, False if it was already correct.
+    """
+    changed = not os.path.islink(path) or os.readlink(path) != target
+    if changed:
+        rmfile(path)
+        os.symlink(target, path)
+    __record_write(path, f"-> {target}")
+    return changed
+
+
 def rmfile(path: str):
     """
     Delete a single file.
@@ -3,10 +3,12 @@ We cache the contents of ``/etc/mtab``. The following module is used to keep our
 """
 
 import os
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 MTAB_MTIME = None
 MTAB_MAP = []
+# Maps the mount points of MTAB_MAP to their devices.
+MTAB_DICT: Dict[str, str] = {}
 
 
 class MntEntObj:
@@ -75,13 +77,14 @@ def get_mtab(mtab="/etc/mtab", vfstype: bool = False) -> list:
     :return: The list of requested mtab entries.
     """
     # These two variables are required to be caches on the module level to be persistent during runtime.
-    global MTAB_MTIME, MTAB_MAP  # pylint: disable=global-statement
+    global MTAB_MTIME, MTAB_MAP, MTAB_DICT  # pylint: disable=global-statement
 
     mtab_stat = os.stat(mtab)
     if mtab_stat.st_mtime != MTAB_MTIME:
         # cache is stale ... refresh
         MTAB_MTIME = mtab_stat.st_mtime
         MTAB_MAP = __cache_mtab__(mtab)
+        MTAB_DICT = {ent.mnt_dir: ent.mnt_fsname for ent in MTAB_MAP}
 
     # was a specific fstype requested?
     if vfstype:
@@ -107,6 +110,30 @@ def __cache_mtab__(mtab="/etc/mtab"):
     return mtab
 
 
+def get_dir_device(fdir: str) -> Tuple[str, str]:
+    """
+    Find the mount point a directory belongs to.
+
+    :param fdir: The directory. It must not contain symlinks.
+    :return: A tuple containing the device and the mount point. The device is ":" if no mount point was found, e.g.
+             inside of a chroot.
+    """
+    try:
+        get_mtab()
+        mtab_dict = MTAB_DICT
+    except Exception:
+        mtab_dict = {}
+
+    # find a best match
+    match = fdir in mtab_dict
+    while not match:
+        if fdir == os.path.sep:
+            return ":", fdir
+        fdir = os.path.realpath(os.path.join(fdir, os.path.pardir))
+        match = fdir in mtab_dict
+    return mtab_dict[fdir], fdir
+
+
 def get_file_device_path(fname):
     """
     What this function attempts to do is take a file and return:
@@ -123,33 +150,12 @@ def get_file_device_path(fname):
 
     # resolve any symlinks
     fname = os.path.realpath(fname)
-
-    # convert mtab to a dict
-    mtab_dict = {}
-    try:
-        for ent in get_mtab():
-            mtab_dict[ent.mnt_dir] = ent.mnt_fsname
-    except Exception:
-        pass
-
-    # find a best match
-    fdir = os.path.dirname(fname)
-    match = fdir in mtab_dict
-    chrootfs = False
-    while not match:
-        if fdir == os.path.sep:
-            chrootfs = True
-            break
-        fdir = os.path.realpath(os.path.join(fdir, os.path.pardir))
-        match = fdir in mtab_dict
+    device, mount_dir = get_dir_device(os.path.dirname(fname))
 
     # construct file path relative to device
-    if fdir != os.path.sep:
-        fname = fname[len(fdir) :]
-
-    if chrootfs:
-        return ":", fname
-    return mtab_dict[fdir], fname
+    if mount_dir != os.path.sep:
+        fname = fname[len(mount_dir) :]
+    return device, fname
 
 
 def is_remote_file(file) -> bool:
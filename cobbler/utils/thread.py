@@ -4,13 +4,36 @@ This module is responsible for managing the custom common threading logic Cobble
 
 import logging
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
 from threading import Thread
-from typing import Optional, Callable
+from typing import Any, Callable, List, Optional
 
 from cobbler import enums
 from cobbler import utils
 
 
+def run_workers(api, func: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+    """
+    Call ``func`` once for every item. Depending on the setting ``sync_workers`` this is done serially or on a thread
+    pool. This function only returns after every item was processed, so everything which depends on the results can
+    safely run afterwards.
+
+    :param api: The Cobbler api object to read the worker settings from.
+    :param func: The callable which is executed for each item.
+    :param items: The items to process.
+    :return: The return values of ``func`` in the order of ``items``.
+    :raises Exception: The first exception raised by ``func`` (in the order of ``items``) is re-raised after all workers
+                       have finished.
+    """
+    workers = min(api.settings().sync_workers, len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(func, item) for item in items]
+    return [future.result() for future in futures]
+
+
 class CobblerThread(Thread):
     """
     This is a custom thread that has a custom logger as well as logic to execute Cobbler triggers.
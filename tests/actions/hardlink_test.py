@@ -1,16 +1,34 @@
+import os
+
 import pytest
 
 from cobbler.actions import hardlink
 
 
+@pytest.fixture
+def mirror(tmp_path):
+    (tmp_path / "distro_mirror" / "a").mkdir(parents=True)
+    (tmp_path / "repo_mirror" / "b").mkdir(parents=True)
+    (tmp_path / "distro_mirror" / "a" / "pkg.rpm").write_text("package")
+    (tmp_path / "repo_mirror" / "b" / "pkg.rpm").write_text("package")
+    (tmp_path / "repo_mirror" / "b" / "other.rpm").write_text("other")
+    return tmp_path
+
+
+@pytest.fixture
+def hardlink_obj(cobbler_api, mirror):
+    linker = hardlink.HardLinker(cobbler_api)
+    linker.webdir = str(mirror)
+    linker.index_path = str(mirror / "hardlink_index.json")
+    return linker
+
+
 def test_object_creation(cobbler_api):
     # Arrange & Act
     result = hardlink.HardLinker(cobbler_api)
 
     # Assert
     assert isinstance(result, hardlink.HardLinker)
-    assert result.hardlink != ""
-    assert result.family != ""
     assert result.webdir != ""
 
 
@@ -20,78 +38,79 @@ def test_constructor_value_error():
         hardlink.HardLinker()
 
 
-def test_no_hardlink_available(mocker, cobbler_api):
+def test_run(mirror, hardlink_obj):
+    # Act
+    result = hardlink_obj.run()
+
+    # Assert
+    assert result == {"files": 3, "hashed": 3, "linked": 1, "reclaimed": 7}
+    assert os.path.samefile(
+        mirror / "distro_mirror" / "a" / "pkg.rpm",
+        mirror / "repo_mirror" / "b" / "pkg.rpm",
+    )
+    assert (mirror / "repo_mirror" / "b" / "pkg.rpm").read_text() == "package"
+    assert os.path.exists(hardlink_obj.index_path)
+
+
+def test_run_dry_run(mirror, hardlink_obj):
+    # Act
+    result = hardlink_obj.run(dry_run=True)
+
+    # Assert
+    assert result == {"files": 3, "hashed": 3, "linked": 1, "reclaimable": 7}
+    assert not os.path.samefile(
+        mirror / "distro_mirror" / "a" / "pkg.rpm",
+        mirror / "repo_mirror" / "b" / "pkg.rpm",
+    )
+    assert not os.path.exists(hardlink_obj.index_path)
+
+
+def test_run_incremental(mocker, mirror, hardlink_obj):
     # Arrange
-    mocker.patch("os.path.exists", return_value=False)
-    utils_die_mock = mocker.patch("cobbler.utils.die")
+    hardlink_obj.run()
+    (mirror / "repo_mirror" / "b" / "new.rpm").write_text("other")
+    spy = mocker.spy(hardlink, "hash_file")
 
     # Act
-    hardlink.HardLinker(api=cobbler_api)
+    result = hardlink_obj.run()
 
     # Assert
-    utils_die_mock.assert_called_once()
-
-
-@pytest.mark.parametrize(
-    "mock_family,expected_hardlink_cmd",
-    [
-        (
-            "debian",
-            [
-                "/usr/bin/hardlink",
-                "-f",
-                "-p",
-                "-o",
-                "-t",
-                "-v",
-                "/srv/www/cobbler/distro_mirror",
-                "/srv/www/cobbler/repo_mirror",
-            ],
-        ),
-        (
-            "suse",
-            [
-                "/usr/bin/hardlink",
-                "-f",
-                "-v",
-                "/srv/www/cobbler/distro_mirror",
-                "/srv/www/cobbler/repo_mirror",
-            ],
-        ),
-        (
-            "other distros",
-            [
-                "/usr/bin/hardlink",
-                "-c",
-                "-v",
-                "/srv/www/cobbler/distro_mirror",
-                "/srv/www/cobbler/repo_mirror",
-            ],
-        ),
-    ],
-)
-def test_run(mocker, cobbler_api, mock_family, expected_hardlink_cmd):
+    spy.assert_called_once_with(str(mirror / "repo_mirror" / "b" / "new.rpm"))
+    assert result == {"files": 4, "hashed": 1, "linked": 1, "reclaimed": 5}
+
+
+def test_run_changed_after_hashing(mocker, mirror, hardlink_obj):
     # Arrange
-    mocker.patch("cobbler.utils.get_family", return_value=mock_family)
-    mock_subprocess_call = mocker.patch("cobbler.utils.subprocess_call", return_value=0)
-    hardlink_obj = hardlink.HardLinker(cobbler_api)
-    hardlink_obj.webdir = "/srv/www/cobbler"
-    expected_calls = [
-        mocker.call(expected_hardlink_cmd, shell=False),
-        mocker.call(
-            [
-                "/usr/bin/hardlink",
-                "-c",
-                "-v",
-                "/srv/www/cobbler/distro_mirror",
-                "/srv/www/cobbler/repo_mirror",
-            ],
-            shell=False,
-        ),
-    ]
+    changed = mirror / "repo_mirror" / "b" / "pkg.rpm"
+    original_hash_file = hardlink.hash_file
+
+    def hash_and_change(path):
+        digest = original_hash_file(path)
+        if path == str(changed):
+            changed.write_text("changed package")
+        return digest
+
+    mocker.patch.object(hardlink, "hash_file", side_effect=hash_and_change)
 
     # Act
-    hardlink_obj.run()
+    result = hardlink_obj.run()
+
+    # Assert
+    assert result["linked"] == 0
+    assert result["reclaimed"] == 0
+    assert changed.read_text() == "changed package"
+
+
+def test_run_outside_link(mirror, hardlink_obj):
+    # Arrange
+    source = mirror / "distro_mirror" / "a" / "pkg.rpm"
+    os.link(source, mirror / "outside1.rpm")
+    os.link(source, mirror / "outside2.rpm")
+    os.link(mirror / "repo_mirror" / "b" / "pkg.rpm", mirror / "outside3.rpm")
+
+    # Act
+    result = hardlink_obj.run()
 
     # Assert
-    assert mock_subprocess_call.mock_calls == expected_calls
+    assert result["linked"] == 1
+    assert result["reclaimed"] == 0
@@ -67,7 +67,7 @@ def test_replace_objects_newer_on_remote(mocker, replicate_obj):
         "cobbler.utils.lod_to_dod",
         side_effect=[
             {"fake_uid": {"uid": "fake_uid", "name": "test", "mtime": 4}},
-            {"fake_uid": {"uid": "fake_uid", "name": "test", "mtime": 5}},
+            {"fake_uid": {"uid": "fake_uid", "name": "test", "mtime": 5, "depth": 0}},
         ],
     )
     api_mock = mocker.patch.object(replicate_obj, "api")
@@ -163,9 +163,11 @@ def test_generate_include_map(mocker, replicate_obj):
     assert replicate_obj.must_include == expected_must_include
 
 
-def test_run(mocker, cobbler_api, replicate_obj):
+def test_run(mocker, tmp_path, cobbler_api, replicate_obj):
     # Arrange
-    mocker.patch("xmlrpc.client.Server")
+    server_mock = mocker.patch("xmlrpc.client.Server")
+    server_mock.return_value.last_modified_time.return_value = 42.0
+    replicate_obj.state_path = str(tmp_path / "replicate_state.json")
     api_sync_mock = mocker.patch.object(cobbler_api, "sync")
     replicate_data_mock = mocker.patch.object(replicate_obj, "replicate_data")
     link_distros_mock = mocker.patch.object(replicate_obj, "link_distros")
@@ -177,3 +179,202 @@ def test_run(mocker, cobbler_api, replicate_obj):
     api_sync_mock.assert_called_once()
     replicate_data_mock.assert_called_once()
     link_distros_mock.assert_called_once()
+    assert replicate_obj.load_state() == {"http://fake.test:80/cobbler_api": 42.0}
+
+
+def test_run_incremental(mocker, tmp_path, cobbler_api, replicate_obj):
+    # Arrange
+    server_mock = mocker.patch("xmlrpc.client.Server")
+    server_mock.return_value.last_modified_time.return_value = 42.0
+    replicate_obj.state_path = str(tmp_path / "replicate_state.json")
+    (tmp_path / "replicate_state.json").write_text(
+        '{"http://fake.test:80/cobbler_api": 21.0}'
+    )
+    api_sync_mock = mocker.patch.object(cobbler_api, "sync")
+    replicate_data_mock = mocker.patch.object(replicate_obj, "replicate_data")
+    incremental_mock = mocker.patch.object(replicate_obj, "replicate_data_incremental")
+
+    # Act
+    replicate_obj.run("fake.test", incremental=True)
+
+    # Assert
+    incremental_mock.assert_called_once_with(21.0)
+    replicate_data_mock.assert_not_called()
+    api_sync_mock.assert_not_called()
+    assert replicate_obj.load_state() == {"http://fake.test:80/cobbler_api": 42.0}
+
+
+def test_replicate_data_incremental(
+    mocker, cobbler_api, replicate_obj, create_distro, create_profile
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    gone_profile = cobbler_api.new_profile()
+    gone_profile.name = "gone"
+    gone_profile.distro = test_distro.name
+    cobbler_api.add_profile(gone_profile)
+    remote_profile = test_profile.to_dict()
+    remote_profile["comment"] = "changed on master"
+    remote_profile["mtime"] = test_profile.mtime + 10
+    replicate_obj.remote = mocker.MagicMock()
+    replicate_obj.remote.get_settings.return_value = {"webdir": "/srv/www/cobbler"}
+    for method in replicate.SINCE_METHODS.values():
+        getattr(replicate_obj.remote, method).return_value = []
+    replicate_obj.remote.get_profiles_since.return_value = [remote_profile]
+    replicate_obj.remote.get_item_uids.side_effect = lambda what: {
+        "distro": [test_distro.uid],
+        "profile": [test_profile.uid],
+    }.get(what, [])
+    replicate_obj.local = mocker.MagicMock()
+    replicate_obj.local.get_items.side_effect = lambda what, fields: [
+        item.to_dict(fields=fields) for item in cobbler_api.get_items(what)
+    ]
+    replicate_obj.prune = True
+    replicate_obj.omit_data = True
+    save_batch_mock = mocker.patch.object(cobbler_api, "save_batch")
+
+    # Act
+    replicate_obj.replicate_data_incremental(10.0)
+
+    # Assert
+    replicate_obj.remote.get_items.assert_not_called()
+    replicate_obj.remote.get_profiles_since.assert_called_once_with(10.0)
+    items, removals = save_batch_mock.call_args[0]
+    assert [item.name for item in items] == [test_profile.name]
+    assert items[0].comment == "changed on master"
+    assert removals == [("profile", gone_profile.name, True)]
+
+
+def test_run_failed_objects(mocker, tmp_path, cobbler_api, replicate_obj):
+    # Arrange
+    server_mock = mocker.patch("xmlrpc.client.Server")
+    server_mock.return_value.last_modified_time.return_value = 42.0
+    replicate_obj.state_path = str(tmp_path / "replicate_state.json")
+    mocker.patch.object(cobbler_api, "sync")
+    mocker.patch.object(
+        replicate_obj,
+        "replicate_data",
+        side_effect=lambda: replicate_obj.failed.append(("system", "test")),
+    )
+    mocker.patch.object(replicate_obj, "link_distros")
+
+    # Act
+    replicate_obj.run("fake.test")
+
+    # Assert
+    assert replicate_obj.load_state() == {}
+
+
+def test_replicate_data_incremental_new_parent(
+    mocker, cobbler_api, replicate_obj, create_distro
+):
+    # Arrange
+    test_distro = create_distro()
+    remote_profiles = [
+        {
+            "uid": "incremental_parent_uid",
+            "name": "incremental_parent",
+            "distro": test_distro.name,
+            "depth": 1,
+            "mtime": 20.0,
+        },
+        {
+            "uid": "incremental_child_uid",
+            "name": "incremental_child",
+            "parent": "incremental_parent",
+            "depth": 2,
+            "mtime": 20.0,
+        },
+    ]
+    replicate_obj.remote = mocker.MagicMock()
+    replicate_obj.remote.get_settings.return_value = {"webdir": "/srv/www/cobbler"}
+    for method in replicate.SINCE_METHODS.values():
+        getattr(replicate_obj.remote, method).return_value = []
+    replicate_obj.remote.get_profiles_since.return_value = remote_profiles
+    replicate_obj.remote.get_item_uids.side_effect = lambda what: {
+        "distro": [test_distro.uid],
+        "profile": ["incremental_parent_uid", "incremental_child_uid"],
+    }.get(what, [])
+    replicate_obj.local = mocker.MagicMock()
+    replicate_obj.local.get_items.side_effect = lambda what, fields: [
+        item.to_dict(fields=fields) for item in cobbler_api.get_items(what)
+    ]
+    replicate_obj.sync_all = True
+    replicate_obj.omit_data = True
+    save_batch_mock = mocker.patch.object(cobbler_api, "save_batch")
+
+    # Act
+    replicate_obj.replicate_data_incremental(10.0)
+
+    # Assert
+    items, _ = save_batch_mock.call_args[0]
+    assert [item.name for item in items] == ["incremental_parent", "incremental_child"]
+    assert replicate_obj.failed == []
+    cobbler_api.remove_profile("incremental_parent", recursive=True)
+
+
+def test_create_objects_duplicates(
+    mocker, cobbler_api, replicate_obj, create_distro, create_profile
+):
+    # Arrange
+    mocker.patch.object(cobbler_api.settings(), "allow_duplicate_macs", False)
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    remote_objects = [
+        {
+            "name": name,
+            "profile": test_profile.name,
+            "interfaces": {"default": {"mac_address": mac_address}},
+        }
+        for name, mac_address in (
+            ("first", "aa:bb:cc:dd:ee:20"),
+            ("second", "aa:bb:cc:dd:ee:20"),
+            ("third", "aa:bb:cc:dd:ee:21"),
+        )
+    ]
+
+    # Act
+    result = replicate_obj.create_objects("system", remote_objects)
+
+    # Assert
+    assert [newobj.name for _, newobj in result] == ["third"]
+    assert test_profile.children == ["third"]
+
+
+def test_create_objects_new_parent(
+    cobbler_api, replicate_obj, create_distro, create_profile
+):
+    # Arrange
+    test_distro = create_distro()
+    create_profile(test_distro.name)
+    remote_objects = [
+        {
+            "uid": "replicate_parent_uid",
+            "name": "replicate_parent",
+            "distro": test_distro.name,
+            "depth": 1,
+        },
+        {
+            "uid": "replicate_child_uid",
+            "name": "replicate_child",
+            "parent": "replicate_parent",
+            "depth": 2,
+        },
+    ]
+
+    # Act
+    result = replicate_obj.create_objects("profile", remote_objects)
+
+    # Assert
+    assert [newobj.name for _, newobj in result] == [
+        "replicate_parent",
+        "replicate_child",
+    ]
+    child = cobbler_api.find_profile(name="replicate_child")
+    assert child is not None
+    assert child.parent.name == "replicate_parent"
+    assert cobbler_api.find_profile(name="replicate_parent").children == [
+        "replicate_child"
+    ]
+    cobbler_api.remove_profile("replicate_parent", recursive=True)
@@ -110,7 +110,7 @@ def test_get_printable_results(cobbler_api):
 def test_run(mocker, cobbler_api, input_mode, expected_result):
     # Arrange
     test_status = status.CobblerStatusReport(cobbler_api, input_mode)
-    mocker.patch.object(test_status, "scan_logfiles")
+    mocker.patch.object(cobbler_api.install_status, "snapshot", return_value={})
     if input_mode == "text":
         mocker.patch.object(test_status, "process_results", return_value="")
     else:
@@ -121,3 +121,53 @@ def test_run(mocker, cobbler_api, input_mode, expected_result):
 
     # Assert
     assert isinstance(result, expected_result)
+
+
+@pytest.fixture
+def status_index(mocker, tmp_path, cobbler_api):
+    mocker.patch.object(status.CobblerStatusReport, "collect_logfiles", return_value=[])
+    index = status.InstallStatusIndex(cobbler_api)
+    index.logfile = str(tmp_path / "install.log")
+    index.index_path = str(tmp_path / "install_status.json")
+    return index
+
+
+def test_install_status_index_refresh(mocker, status_index):
+    # Arrange
+    status_index.refresh()
+    with open(status_index.logfile, "w", encoding="UTF-8") as log_fd:
+        log_fd.write("system\ttest\t192.168.0.1\tstart\t10.0\n")
+    status_index.refresh()
+    with open(status_index.logfile, "a", encoding="UTF-8") as log_fd:
+        log_fd.write("system\ttest\t192.168.0.1\tstop\t20.0\nsystem\ttest\t192.168")
+    spy = mocker.spy(status.CobblerStatusReport, "scan_logfiles")
+
+    # Act
+    result = status_index.snapshot()
+
+    # Assert
+    spy.assert_not_called()
+    assert result["192.168.0.1"].most_recent_start == 10.0
+    assert result["192.168.0.1"].most_recent_stop == 20.0
+    # The incomplete line is read once it is complete
+    assert status_index.offset == len(
+        "system\ttest\t192.168.0.1\tstart\t10.0\nsystem\ttest\t192.168.0.1\tstop\t20.0\n"
+    )
+
+
+def test_install_status_index_resume(cobbler_api, status_index):
+    # Arrange
+    status_index.refresh()
+    with open(status_index.logfile, "w", encoding="UTF-8") as log_fd:
+        log_fd.write("system\ttest\t192.168.0.1\tstart\t10.0\n")
+    status_index.refresh()
+    resumed_index = status.InstallStatusIndex(cobbler_api)
+    resumed_index.logfile = status_index.logfile
+    resumed_index.index_path = status_index.index_path
+
+    # Act
+    result = resumed_index.snapshot()
+
+    # Assert
+    assert result == status_index.snapshot()
+    assert resumed_index.offset == status_index.offset
@@ -3,6 +3,7 @@ from unittest.mock import Mock
 import pytest
 
 from cobbler.actions import sync
+from cobbler.utils import filesystem_helpers
 
 
 @pytest.mark.skip("TODO")
@@ -24,6 +25,54 @@ def test_run_sync_systems():
     assert False
 
 
+def test_sync_manifest_is_current(tmp_path):
+    # Arrange
+    manifest_path = str(tmp_path / "manifest.json")
+    generated_file = str(tmp_path / "generated")
+    inputs = sync.SyncManifest.fingerprint({"name": "test"})
+    manifest = sync.SyncManifest(manifest_path)
+    with filesystem_helpers.track_writes() as files:
+        filesystem_helpers.write_file(generated_file, "content")
+    manifest.update("system:test", inputs, files)
+    manifest.save()
+
+    # Act
+    new_manifest = sync.SyncManifest(manifest_path)
+    result_unchanged = new_manifest.is_current("system:test", inputs)
+    result_inputs_changed = new_manifest.is_current(
+        "system:test", sync.SyncManifest.fingerprint({"name": "changed"})
+    )
+    filesystem_helpers.write_file(generated_file, "modified")
+    result_file_changed = new_manifest.is_current("system:test", inputs)
+
+    # Assert
+    assert result_unchanged
+    assert not result_inputs_changed
+    assert not result_file_changed
+
+
+def test_sync_manifest_orphans(tmp_path):
+    # Arrange
+    manifest_path = str(tmp_path / "manifest.json")
+    manifest = sync.SyncManifest(manifest_path)
+    manifest.update("system:kept", "1", {"/kept": "a"})
+    manifest.update("system:changed", "1", {"/changed_old": "a", "/changed": "a"})
+    manifest.update("system:removed", "1", {"/removed": "a"})
+    manifest.update("dhcp", None, {"/dhcpd.conf": "a"})
+    manifest.save()
+    new_manifest = sync.SyncManifest(manifest_path)
+
+    # Act
+    new_manifest.keep("system:kept")
+    new_manifest.update("system:changed", "2", {"/changed": "b"})
+    result = new_manifest.orphans()
+
+    # Assert
+    assert result == ["/changed_old", "/removed"]
+    # Steps which did not run are kept, so their files are not orphaned.
+    assert "dhcp" in new_manifest.entries
+
+
 @pytest.mark.skip("TODO")
 def test_clean_link_cache():
     # Arrange
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 from cobbler.items.image import Image
 
 
@@ -16,3 +18,39 @@ def test_image_add(cobbler_api):
 
     # Assert
     assert expected_result.exists()
+
+
+def test_import_systems(mocker, cobbler_api, create_distro, create_profile):
+    # Arrange
+    mocker.patch.object(cobbler_api.settings(), "allow_duplicate_macs", False)
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    system_dicts = [
+        {
+            "name": f"test_import_systems_{index}",
+            "profile": test_profile.name,
+            "interfaces": {"default": {"mac_address": f"aa:bb:cc:dd:ee:1{index}"}},
+        }
+        for index in range(3)
+    ]
+    duplicate_dicts = [
+        {
+            "name": f"test_import_systems_duplicate_{index}",
+            "profile": test_profile.name,
+            "interfaces": {"default": {"mac_address": "aa:bb:cc:dd:ee:10"}},
+        }
+        for index in range(2)
+    ]
+
+    # Act
+    result = cobbler_api.import_systems(system_dicts)
+    with pytest.raises(ValueError) as error:
+        cobbler_api.import_systems(duplicate_dicts)
+
+    # Assert
+    assert [ref.name for ref in result] == [
+        system_dict["name"] for system_dict in system_dicts
+    ]
+    assert cobbler_api.find_system(mac_address="aa:bb:cc:dd:ee:12") is result[2]
+    assert cobbler_api.find_system(name="test_import_systems_duplicate_0") is None
+    assert str(error.value).count("aa:bb:cc:dd:ee:10") == 1
@@ -4,7 +4,7 @@ import pytest
 
 from cobbler.api import CobblerAPI
 from cobbler.settings import Settings
-from cobbler import autoinstall_manager
+from cobbler import autoinstall_manager, autoinstallgen
 from cobbler.items.distro import Distro
 from cobbler.items.profile import Profile
 from cobbler.items.system import System
@@ -90,3 +90,42 @@ def test_create_autoinstallation_manager(api_mock):
 
     # Assert
     isinstance(result, autoinstall_manager.AutoInstallationManager)
+
+
+def test_generate_autoinstall_cache(
+    mocker, cobbler_api, create_distro, create_profile, tmp_path
+):
+    # Arrange
+    templates_dir = tmp_path / "templates"
+    templates_dir.mkdir()
+    snippets_dir = tmp_path / "snippets"
+    snippets_dir.mkdir()
+    (templates_dir / "cache.ks").write_text("$comment\nSNIPPET::cache_snippet\n")
+    snippet = snippets_dir / "cache_snippet"
+    snippet.write_text("first")
+    mocker.patch.object(
+        cobbler_api.settings(), "autoinstall_templates_dir", str(templates_dir)
+    )
+    mocker.patch.object(
+        cobbler_api.settings(), "autoinstall_snippets_dir", str(snippets_dir)
+    )
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_profile.autoinstall = "cache.ks"
+    test_manager = autoinstall_manager.AutoInstallationManager(cobbler_api)
+    autoinstallgen.clear_render_cache()
+
+    # Act
+    first_result = test_manager.generate_autoinstall(profile=test_profile.name)
+    cached_result = test_manager.generate_autoinstall(profile=test_profile.name)
+    test_manager.write_autoinstall_snippet("cache_snippet", "second")
+    snippet_result = test_manager.generate_autoinstall(profile=test_profile.name)
+    test_profile.comment = "changed"
+    item_result = test_manager.generate_autoinstall(profile=test_profile.name)
+
+    # Assert
+    assert first_result == cached_result
+    assert "first" in first_result
+    assert "second" in snippet_result
+    assert item_result.startswith("changed")
+    assert autoinstallgen.render_cache_stats == {"hits": 1, "misses": 3}
@@ -0,0 +1,272 @@
+import pytest
+
+from cobbler.items import profile, system
+
+
+@pytest.fixture
+def system_collection(cobbler_api):
+    return cobbler_api.systems()
+
+
+def test_find_by_mac_address(
+    cobbler_api, system_collection, create_distro, create_profile, create_system
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_system = create_system(profile_name=test_profile.name)
+    test_system.interfaces["default"].mac_address = "AA:BB:CC:DD:EE:FF"
+
+    # Act
+    result = system_collection.find(mac_address="aa:bb:cc:dd:ee:ff")
+
+    # Assert
+    assert result is test_system
+    assert test_system.name in system_collection.indexes["mac_address"].get(
+        "aa:bb:cc:dd:ee:ff"
+    )
+
+
+def test_find_by_indexes_interface_update(
+    cobbler_api, system_collection, create_distro, create_profile, create_system
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_system = create_system(profile_name=test_profile.name)
+    test_system.interfaces["default"].ip_address = "192.168.1.10"
+
+    # Act
+    test_system.interfaces["default"].ip_address = "192.168.1.11"
+
+    # Assert
+    assert system_collection.find(ip_address="192.168.1.10") is None
+    assert system_collection.find(ip_address="192.168.1.11") is test_system
+    assert system_collection.find_by_indexes({"ip_address": "192.168.1.11"}) == [
+        test_system
+    ]
+
+
+def test_find_by_indexes_unindexed(system_collection):
+    # Arrange & Act
+    result = system_collection.find_by_indexes(
+        {"mac_address": "aa:bb:*", "netboot_enabled": "True"}
+    )
+
+    # Assert
+    assert result is None
+
+
+def test_find_by_indexes_profile(
+    cobbler_api, system_collection, create_distro, create_profile, create_system
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    create_system(profile_name=test_profile.name, name="system1")
+    create_system(profile_name=test_profile.name, name="system2")
+
+    # Act
+    result = system_collection.find(profile=test_profile.name, return_list=True)
+
+    # Assert
+    assert [obj.name for obj in result] == ["system1", "system2"]
+
+
+def test_find_by_indexes_profile_update(
+    cobbler_api, system_collection, create_distro, create_profile, create_system
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    new_profile = profile.Profile(cobbler_api)
+    new_profile.name = "new_profile"
+    new_profile.distro = test_distro.name
+    cobbler_api.add_profile(new_profile)
+    test_system = create_system(profile_name=test_profile.name)
+
+    # Act
+    test_system.profile = new_profile.name
+
+    # Assert
+    assert system_collection.find(profile=new_profile.name, return_list=True) == [
+        test_system
+    ]
+    assert system_collection.find(profile=test_profile.name, return_list=True) == []
+
+
+def test_indexes_remove(
+    cobbler_api, system_collection, create_distro, create_profile, create_system
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_system = create_system(profile_name=test_profile.name)
+    test_system.interfaces["default"].dns_name = "remove.example.org"
+
+    # Act
+    system_collection.remove(test_system.name)
+
+    # Assert
+    assert "remove.example.org" not in system_collection.indexes["dns_name"]
+    assert system_collection.find(dns_name="remove.example.org") is None
+    # The interface is not part of a stored system anymore and must not update the indexes.
+    test_system.interfaces["default"].dns_name = "removed.example.org"
+    assert "removed.example.org" not in system_collection.indexes["dns_name"]
+
+
+def test_indexes_rename(
+    cobbler_api, system_collection, create_distro, create_profile, create_system
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_system = create_system(profile_name=test_profile.name)
+    test_system.interfaces["default"].mac_address = "aa:bb:cc:dd:ee:01"
+
+    # Act
+    system_collection.rename(test_system, "renamed_system")
+
+    # Assert
+    assert system_collection.indexes["mac_address"]["aa:bb:cc:dd:ee:01"] == {
+        "renamed_system"
+    }
+    assert system_collection.find(uid=test_system.uid) is test_system
+
+
+def test_indexes_new_interface(
+    cobbler_api, system_collection, create_distro, create_profile, create_system
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_system = create_system(profile_name=test_profile.name)
+    new_interface = system.NetworkInterface(cobbler_api)
+    new_interface.mac_address = "aa:bb:cc:dd:ee:02"
+
+    # Act
+    test_system.interfaces = {"eth0": new_interface}
+
+    # Assert
+    assert system_collection.find(mac_address="aa:bb:cc:dd:ee:02") is test_system
+
+
+def test_from_list_lazy(
+    mocker, cobbler_api, system_collection, create_distro, create_profile, create_system
+):
+    # Arrange
+    mocker.patch.object(system_collection.api.settings(), "serializer_lazy_load", True)
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_system = create_system(profile_name=test_profile.name)
+    test_system.interfaces["default"].mac_address = "aa:bb:cc:dd:ee:02"
+    item_dict = test_system.serialize()
+    system_collection.remove(test_system.name)
+
+    # Act
+    system_collection.from_list([item_dict])
+    stub = system_collection.listing[test_system.name]
+    was_stub = stub.is_stub
+    result = system_collection.find(mac_address="aa:bb:cc:dd:ee:02")
+
+    # Assert
+    assert was_stub
+    assert result is stub
+    assert not result.is_stub
+    assert result.profile == test_profile.name
+    assert result.interfaces["default"].mac_address == "aa:bb:cc:dd:ee:02"
+
+
+def test_from_list_lazy_children(
+    mocker, cobbler_api, system_collection, create_distro, create_profile, create_system
+):
+    # Arrange
+    mocker.patch.object(system_collection.api.settings(), "serializer_lazy_load", True)
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_system = create_system(profile_name=test_profile.name)
+    distro_dict = test_distro.serialize()
+    profile_dict = test_profile.serialize()
+    system_dict = test_system.serialize()
+    # A parent is not saved again when a child is added
+    distro_dict["children"] = []
+    profile_dict["children"] = []
+    system_collection.remove(test_system.name)
+    cobbler_api.profiles().remove(test_profile.name)
+    cobbler_api.distros().remove(test_distro.name)
+
+    # Act
+    cobbler_api.distros().from_list([distro_dict])
+    cobbler_api.profiles().from_list([profile_dict])
+    system_collection.from_list([system_dict])
+    distro_stub = cobbler_api.distros().listing[test_distro.name]
+    profile_stub = cobbler_api.profiles().listing[test_profile.name]
+    distro_children = distro_stub.get_children()
+    profile_children = profile_stub.get_children()
+    were_stubs = distro_stub.is_stub and profile_stub.is_stub
+    profile_stub.hydrate()
+
+    # Assert
+    assert were_stubs
+    assert distro_children == [test_profile.name]
+    assert profile_children == [test_system.name]
+    assert profile_stub.children == [test_system.name]
+
+
+def test_from_list_lazy_missing_parent(mocker, system_collection):
+    # Arrange
+    mocker.patch.object(system_collection.api.settings(), "serializer_lazy_load", True)
+
+    # Act & Assert
+    with pytest.raises(ValueError):
+        system_collection.from_list(
+            [{"name": "test_from_list_lazy_missing_parent", "profile": "missing"}]
+        )
+
+
+def test_find_duplicates(
+    mocker, cobbler_api, system_collection, create_distro, create_profile, create_system
+):
+    # Arrange
+    mocker.patch.object(system_collection.api.settings(), "allow_duplicate_macs", False)
+    mocker.patch.object(system_collection.api.settings(), "allow_duplicate_ips", True)
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_system = create_system(profile_name=test_profile.name)
+    test_system.interfaces["default"].mac_address = "aa:bb:cc:dd:ee:03"
+    test_system.interfaces["default"].ip_address = "192.168.1.20"
+    with system.defer_duplicate_checks():
+        pending_system = system.System(cobbler_api)
+        pending_system.name = "pending"
+        pending_system.interfaces = {"eth0": system.NetworkInterface(cobbler_api)}
+        pending_system.interfaces["eth0"].mac_address = "AA:BB:CC:DD:EE:03"
+        pending_system.interfaces["eth0"].ip_address = "192.168.1.20"
+
+    # Act
+    result = system_collection.find_duplicates([pending_system])
+
+    # Assert
+    assert list(result.values()) == [[test_system.name, "pending"]]
+    assert "aa:bb:cc:dd:ee:03" in list(result.keys())[0]
+
+
+def test_from_list_duplicates(
+    mocker, cobbler_api, system_collection, create_distro, create_profile, create_system
+):
+    # Arrange
+    mocker.patch.object(system_collection.api.settings(), "allow_duplicate_macs", False)
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_system = create_system(profile_name=test_profile.name)
+    test_system.interfaces["default"].mac_address = "aa:bb:cc:dd:ee:04"
+    item_dicts = []
+    for name in ("first", "second"):
+        item_dict = test_system.serialize()
+        item_dict["name"] = name
+        item_dict["uid"] = name
+        item_dicts.append(item_dict)
+
+    # Act & Assert
+    with pytest.raises(ValueError) as error:
+        system_collection.from_list(item_dicts)
+    assert '"first", "second"' in str(error.value)
@@ -3,6 +3,7 @@ import os
 import pytest
 
 from cobbler import enums
+from cobbler.cexceptions import CX
 from cobbler.items.distro import Distro
 from cobbler.items.profile import Profile
 from cobbler.items.item import Item
@@ -347,7 +348,7 @@ def test_dump_vars(cobbler_api):
     print(result)
     assert "default_ownership" in result
     assert "owners" in result
-    assert len(result) == 152
+    assert len(result) == 160
 
 
 @pytest.mark.parametrize(
@@ -473,6 +474,97 @@ def test_to_dict_resolved_dict(cobbler_api, create_distro):
     assert result.get("kernel_options") == {"test": True, "my_value": 5}
 
 
+def test_resolve_cache_parent_change(cobbler_api, create_distro):
+    # Arrange
+    test_distro = create_distro()
+    test_distro.kernel_options = {"test": True}
+    titem = Profile(cobbler_api)
+    titem.name = "resolve_cache_profile"
+    titem.distro = test_distro.name
+    cobbler_api.add_profile(titem)
+    assert titem.owners == ["admin"]
+    assert "owners" in titem._cached_dict
+
+    # Act
+    test_distro.owners = ["cobbler"]
+
+    # Assert
+    assert titem.owners == ["cobbler"]
+
+
+def test_resolve_cache_unrelated_change(cobbler_api, create_distro):
+    # Arrange
+    titem = Item(cobbler_api)
+    assert titem.owners == ["admin"]
+    test_distro = create_distro()
+
+    # Act
+    test_distro.comment = "changed"
+
+    # Assert
+    assert "owners" in titem._cached_dict
+
+
+def test_resolve_dict_in_place_change(cobbler_api, create_distro):
+    # Arrange
+    test_distro = create_distro()
+    titem = Profile(cobbler_api)
+    titem.name = "resolve_dict_profile"
+    titem.distro = test_distro.name
+    cobbler_api.add_profile(titem)
+    titem.kernel_options = {"a": "1"}
+    assert titem.kernel_options == {"a": "1"}
+
+    # Act
+    test_distro._kernel_options["dist"] = "x"
+    titem._kernel_options["b"] = "2"
+
+    # Assert
+    assert titem.kernel_options == {"dist": "x", "a": "1", "b": "2"}
+
+
+def test_resolve_cache_returns_copy(cobbler_api, create_distro):
+    # Arrange
+    test_distro = create_distro()
+    test_distro.kernel_options = {"test": True}
+
+    # Act
+    test_distro.kernel_options.update({"changed": True})
+
+    # Assert
+    assert test_distro.kernel_options == {"test": True}
+
+
+def test_resolve_cache_settings_change(cobbler_api):
+    # Arrange
+    titem = Item(cobbler_api)
+    assert titem.owners == ["admin"]
+
+    # Act
+    cobbler_api.settings().default_ownership = ["cobbler"]
+
+    # Assert
+    assert titem.owners == ["cobbler"]
+
+
+def test_resolve_cache_conceptual_parent(cobbler_api, create_distro):
+    # Arrange
+    test_distro = create_distro()
+    titem = Profile(cobbler_api)
+    titem.name = "conceptual_parent_profile"
+    titem.distro = test_distro.name
+    cobbler_api.add_profile(titem)
+    owners = titem.owners
+    key = titem.resolve_cache_key()
+
+    # Act
+    titem.get_conceptual_parent()
+
+    # Assert
+    assert titem.resolve_cache_key() == key
+    assert titem._cached_dict.get("owners") == owners
+
+
 def test_serialize(cobbler_api):
     # Arrange
     kernel_url = "http://10.0.0.1/custom-kernels-are-awesome"
@@ -499,3 +591,60 @@ def test_grab_tree(cobbler_api):
     # Assert
     assert isinstance(result, list)
     assert result[-1].server == "192.168.1.1"
+
+
+def test_create_stub(cobbler_api, create_distro):
+    # Arrange
+    titem = create_distro()
+    titem.comment = "stub comment"
+    item_dict = titem.serialize()
+
+    # Act
+    stub = Distro.create_stub(cobbler_api, item_dict)
+
+    # Assert
+    assert stub.is_stub
+    assert stub.name == titem.name
+    assert stub.stub_value("comment") == "stub comment"
+    assert stub.comment == "stub comment"
+    assert not stub.is_stub
+    assert stub.uid == titem.uid
+    with pytest.raises(AttributeError):
+        stub.not_existing_attribute
+
+
+def test_hydrate_invalid(cobbler_api):
+    # Arrange
+    stub = Distro.create_stub(
+        cobbler_api, {"name": "test_hydrate_invalid", "kernel": "/not/existing"}
+    )
+
+    # Act
+    with pytest.raises(CX):
+        stub.comment
+
+    # Assert
+    assert stub.is_stub
+    assert stub.name == "test_hydrate_invalid"
+
+
+def test_to_dict_fields(create_distro):
+    # Arrange
+    titem = create_distro()
+
+    # Act
+    result = titem.to_dict(fields=["name", "arch", "ks_meta", "not_existing"])
+
+    # Assert
+    assert result == {"name": titem.name, "arch": "x86_64", "ks_meta": {}}
+
+
+def test_sort_key(create_distro):
+    # Arrange
+    titem = create_distro()
+
+    # Act
+    result = titem.sort_key(["arch", "name"])
+
+    # Assert
+    assert result == [titem.to_dict()["arch"], titem.name]
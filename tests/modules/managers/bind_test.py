@@ -20,3 +20,49 @@ def test_get_manager(cobbler_api):
 
     # Assert
     isinstance(result, bind._BindManager)
+
+
+def test_manager_write_configs(
+    mocker, cobbler_api, create_distro, create_profile, create_system, tmp_path
+):
+    # Arrange
+    settings = cobbler_api.settings()
+    mocker.patch.object(settings, "bind_chroot_path", str(tmp_path))
+    mocker.patch.object(
+        settings, "manage_forward_zones", ["example.org", "sub.example.org"]
+    )
+    mocker.patch.object(settings, "manage_reverse_zones", ["192.168", "192.168.1"])
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_system = create_system(profile_name=test_profile.name)
+    test_system.interfaces["default"].dns_name = "host.sub.example.org"
+    test_system.interfaces["default"].ip_address = "192.168.1.5"
+    bind.MANAGER = None
+    manager = bind.get_manager(cobbler_api)
+    manager.serial_file = str(tmp_path / "bind_serial")
+    manager.zonefile_base = "/var/lib/named/"
+    mocker.patch.object(manager, "_BindManager__write_named_conf")
+    mocker.patch.object(manager, "_BindManager__write_secondary_conf")
+    zone_path = tmp_path / "var/lib/named"
+    zone_path.mkdir(parents=True)
+    render_spy = mocker.spy(manager.templar, "render")
+
+    # Act
+    manager.write_configs()
+    first_serial = (tmp_path / "bind_serial").read_text()
+    first_renders = render_spy.call_count
+    manager.write_configs()
+    second_renders = render_spy.call_count - first_renders
+    test_system.interfaces["default"].ip_address = "192.168.2.5"
+    cobbler_api.add_system(test_system)
+    manager.write_configs()
+
+    # Assert
+    assert first_renders == 4
+    assert second_renders == 0
+    assert "192.168.2.5" in (zone_path / "sub.example.org").read_text()
+    assert "5.2  IN  PTR  host.sub.example.org." in (zone_path / "192.168").read_text()
+    assert "host" not in (zone_path / "192.168.1").read_text()
+    assert first_serial in (zone_path / "example.org").read_text()
+    assert (tmp_path / "bind_serial").read_text() != first_serial
+    bind.MANAGER = None
@@ -52,6 +52,9 @@ def test_manager_write_configs(mocker, cobbler_api):
     test_manager = dnsmasq.get_manager(cobbler_api)
     test_manager.systems = [mock_system]
     test_manager.templar = MagicMock(spec=Templar, autospec=True)
+    mock_write_file = mocker.patch(
+        "cobbler.utils.filesystem_helpers.write_file", return_value=True
+    )
 
     # Act
     test_manager.write_configs()
@@ -66,13 +69,18 @@ def test_manager_write_configs(mocker, cobbler_api):
             "next_server_v4": "192.168.1.1",
             "next_server_v6": "::1",
         },
-        "/etc/dnsmasq.conf",
+        None,
+    )
+    mock_write_file.assert_called_once_with(
+        "/etc/dnsmasq.conf", test_manager.templar.render.return_value
     )
 
 
 def test_manager_regen_ethers(mocker, cobbler_api):
     # Arrange
-    mock_builtins_open = mocker.patch("builtins.open", mocker.mock_open())
+    mock_write_file = mocker.patch(
+        "cobbler.utils.filesystem_helpers.write_file", return_value=True
+    )
     mock_system = System(cobbler_api)
     mock_system.name = "test_manager_regen_ethers_system"
     mock_system.interfaces = {"default": NetworkInterface(cobbler_api)}
@@ -88,14 +96,17 @@ def test_manager_regen_ethers(mocker, cobbler_api):
     test_manager.regen_ethers()
 
     # Assert
-    mock_builtins_open.assert_called_once_with("/etc/ethers", "w+", encoding="UTF-8")
-    write_handle = mock_builtins_open()
-    write_handle.write.assert_called_once_with("AA:BB:CC:DD:EE:FF\t192.168.1.2\n")
+    mock_write_file.assert_called_once_with(
+        "/etc/ethers", "AA:BB:CC:DD:EE:FF\t192.168.1.2\n"
+    )
+    assert test_manager.restart_pending
 
 
 def test_manager_regen_hosts(mocker, cobbler_api):
     # Arrange
-    mock_builtins_open = mocker.patch("builtins.open", mocker.mock_open())
+    mock_write_file = mocker.patch(
+        "cobbler.utils.filesystem_helpers.write_file", return_value=True
+    )
     mock_system = System(cobbler_api)
     mock_system.name = "test_manager_regen_hosts_system"
     mock_system.interfaces = {"default": NetworkInterface(cobbler_api)}
@@ -111,11 +122,9 @@ def test_manager_regen_hosts(mocker, cobbler_api):
     test_manager.regen_hosts()
 
     # Assert
-    mock_builtins_open.assert_called_once_with(
-        "/var/lib/cobbler/cobbler_hosts", "w+", encoding="UTF-8"
+    mock_write_file.assert_called_once_with(
+        "/var/lib/cobbler/cobbler_hosts", "::1\thost.example.org\n"
     )
-    write_handle = mock_builtins_open()
-    write_handle.write.assert_called_once_with("::1\thost.example.org\n")
 
 
 def test_manager_restart_service(mocker, cobbler_api):
@@ -133,3 +142,24 @@ def test_manager_restart_service(mocker, cobbler_api):
     assert mock_service_restart.call_count == 1
     mock_service_restart.assert_called_with("dnsmasq")
     assert result == 0
+
+
+def test_manager_restart_service_unchanged(mocker, cobbler_api):
+    # Arrange
+    mock_service_restart = mocker.patch(
+        "cobbler.utils.process_management.service_restart", return_value=0
+    )
+    mocker.patch("cobbler.utils.filesystem_helpers.write_file", return_value=False)
+    dnsmasq.MANAGER = None
+    test_manager = dnsmasq.get_manager(cobbler_api)
+    test_manager.systems = []
+
+    # Act
+    first_result = test_manager.restart_service()
+    test_manager.regen_ethers()
+    second_result = test_manager.restart_service()
+
+    # Assert
+    assert mock_service_restart.call_count == 1
+    assert first_result == 0
+    assert second_result == 0
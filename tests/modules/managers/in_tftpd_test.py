@@ -2,6 +2,7 @@ from unittest.mock import MagicMock, Mock
 
 import pytest
 
+from cobbler.actions.sync import SyncManifest
 from cobbler.api import CobblerAPI
 from cobbler.modules.managers import in_tftpd
 from cobbler.tftpgen import TFTPGen
@@ -9,6 +10,7 @@ from cobbler.items.distro import Distro
 from cobbler.items.profile import Profile
 from cobbler.items.system import System
 from cobbler.settings import Settings
+from cobbler.utils import filesystem_helpers
 
 
 @pytest.fixture
@@ -40,6 +42,7 @@ def api_mock_tftp():
     settings_mock.default_virt_disk_driver = "raw"
     settings_mock.tftpboot_location = "/var/lib/tftpboot"
     settings_mock.webdir = "/srv/www/cobbler"
+    settings_mock.sync_workers = 1
     api_mock_tftp.settings.return_value = settings_mock
     test_distro = Distro(api_mock_tftp)
     test_distro.name = "test"
@@ -187,3 +190,66 @@ def test_manager_sync(mocker, api_mock_tftp, reset_singleton):
     assert manager_obj.tftpgen.get_menu_items.call_count == 1
     assert manager_obj.tftpgen.write_all_system_files.call_count == 1
     assert manager_obj.tftpgen.make_pxe_menu.call_count == 1
+
+
+def test_manager_sync_incremental(
+    mocker,
+    tmp_path,
+    cobbler_api,
+    create_distro,
+    create_profile,
+    create_system,
+    reset_singleton,
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    create_system(profile_name=test_profile.name, name="system1")
+    test_system = create_system(profile_name=test_profile.name, name="system2")
+    manager_obj = in_tftpd.get_manager(cobbler_api)
+    mocker.patch.object(manager_obj, "tftpgen", spec=TFTPGen)
+    manifest_path = str(tmp_path / "sync_manifest.json")
+    first_manifest = SyncManifest(manifest_path)
+    manager_obj.sync(manifest=first_manifest)
+    first_manifest.save()
+    manager_obj.tftpgen.write_all_system_files.reset_mock()
+    test_system.comment = "changed"
+
+    # Act
+    manager_obj.sync(manifest=SyncManifest(manifest_path))
+
+    # Assert
+    written = [
+        call.args[0].name
+        for call in manager_obj.tftpgen.write_all_system_files.call_args_list
+    ]
+    assert written == ["system2"]
+
+
+def test_manager_sync_removed_distro(mocker, tmp_path, api_mock_tftp, reset_singleton):
+    # Arrange
+    api_mock_tftp.settings().boot_loader_conf_template_dir = str(tmp_path)
+    manager_obj = in_tftpd.get_manager(api_mock_tftp)
+    tftpgen_mock = mocker.patch.object(manager_obj, "tftpgen", spec=TFTPGen)
+    kernel_path = str(tmp_path / "vmlinuz")
+    tftpgen_mock.copy_single_distro_files.side_effect = (
+        lambda distro, dirtree, symlink_ok: filesystem_helpers.write_file(
+            kernel_path, "kernel"
+        )
+    )
+    manifest_path = str(tmp_path / "sync_manifest.json")
+    first_manifest = SyncManifest(manifest_path)
+    manager_obj.sync(manifest=first_manifest)
+    first_manifest.save()
+    manager_obj.distros = []
+    manifest = SyncManifest(manifest_path)
+
+    # Act
+    manager_obj.sync(manifest=manifest)
+    result = manifest.orphans()
+
+    # Assert
+    assert first_manifest.entries["tftp_distro:test"]["files"] == {
+        kernel_path: filesystem_helpers.file_fingerprint(kernel_path)
+    }
+    assert result == [kernel_path]
@@ -93,6 +93,9 @@ def test_manager_write_v4_config(mocker, api_isc_mock, reset_singleton):
     isc.MANAGER = None
     manager = isc.get_manager(api_isc_mock)
     mocked_templar = mocker.patch.object(manager, "templar", autospec=True)
+    mocked_write = mocker.patch(
+        "cobbler.utils.filesystem_helpers.write_file", return_value=True
+    )
 
     # Act
     manager.write_v4_config()
@@ -107,7 +110,10 @@ def test_manager_write_v4_config(mocker, api_isc_mock, reset_singleton):
             "dhcp_tags": {"default": {}},
             "next_server_v4": "127.0.0.1",
         },
-        "/etc/dhcpd.conf",
+        None,
+    )
+    mocked_write.assert_called_with(
+        "/etc/dhcpd.conf", mocked_templar.render.return_value
     )
 
 
@@ -121,6 +127,9 @@ def test_manager_write_v6_config(mocker, api_isc_mock, reset_singleton):
     isc.MANAGER = None
     manager = isc.get_manager(api_isc_mock)
     mocked_templar = mocker.patch.object(manager, "templar", autospec=True)
+    mocked_write = mocker.patch(
+        "cobbler.utils.filesystem_helpers.write_file", return_value=True
+    )
 
     # Act
     manager.write_v6_config()
@@ -134,8 +143,42 @@ def test_manager_write_v6_config(mocker, api_isc_mock, reset_singleton):
             "next_server_v6": "::1",
             "dhcp_tags": {"default": {}},
         },
-        "/etc/dhcpd6.conf",
+        None,
+    )
+    mocked_write.assert_called_with(
+        "/etc/dhcpd6.conf", mocked_templar.render.return_value
+    )
+
+
+def test_manager_write_v4_config_cached(
+    mocker, cobbler_api, create_distro, create_profile, create_system
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_system = create_system(profile_name=test_profile.name)
+    test_system.interfaces["default"].mac_address = "aa:bb:cc:dd:ee:ff"
+    mocker.patch("builtins.open", mocker.mock_open(read_data="test"))
+    mocker.patch("os.path.exists", return_value=True)
+    mocked_write = mocker.patch(
+        "cobbler.utils.filesystem_helpers.write_file", return_value=False
     )
+    manager = isc.get_manager(cobbler_api)
+    mocked_templar = mocker.patch.object(manager, "templar", autospec=True)
+    manager.restart_pending = False
+    mocked_build = mocker.spy(manager, "_IscManager__build_v4_entries")
+
+    # Act
+    manager.write_v4_config()
+    manager.write_v4_config()
+
+    # Assert
+    assert mocked_build.call_count == 1
+    assert test_system.uid in manager.fragment_cache[isc.enums.DHCP.V4]
+    assert mocked_templar.render.call_count == 1
+    assert mocked_write.call_count == 1
+    assert not manager.restart_pending
+    assert manager.restart_service() == 0
 
 
 def test_manager_restart_dhcp(mocker, api_isc_mock, reset_singleton):
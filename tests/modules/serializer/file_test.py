@@ -178,6 +178,29 @@ def test_deserialize_raw(
     assert result == expected_result
 
 
+@pytest.mark.parametrize("workers", [1, 4])
+def test_deserialize_raw_workers(
+    mocker, cobbler_api, serializer_obj, tmp_path: pathlib.Path, workers
+):
+    # Arrange
+    mocker.patch.object(cobbler_api.settings(), "serializer_load_workers", workers)
+    serializer_obj.libpath = str(tmp_path / "collections")
+    distros_path = tmp_path / "collections" / "distros"
+    distros_path.mkdir(parents=True)
+    for index in range(10):
+        (distros_path / f"distro{index}.json").write_text(
+            json.dumps({"name": f"distro{index}"})
+        )
+
+    # Act
+    result = serializer_obj.deserialize_raw("distros")
+
+    # Assert
+    assert sorted(item["name"] for item in result) == [
+        f"distro{index}" for index in range(10)
+    ]
+
+
 @pytest.mark.parametrize(
     "input_collection_type,input_collection,input_topological,expected_result",
     [
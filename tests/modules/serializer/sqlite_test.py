@@ -0,0 +1,199 @@
+import json
+import os
+import pathlib
+import sqlite3
+
+import pytest
+
+from cobbler.cexceptions import CX
+from cobbler.modules.serializers import sqlite
+
+
+@pytest.fixture()
+def serializer_obj(cobbler_api, tmp_path: pathlib.Path):
+    serializer = sqlite.SQLiteSerializer(cobbler_api)
+    serializer.database_file = str(tmp_path / "cobbler.db")
+    yield serializer
+    serializer.close()
+
+
+@pytest.fixture()
+def mcollection(mocker):
+    collection = mocker.Mock()
+    collection.collection_types.return_value = "distros"
+    collection.collection_type.return_value = "distro"
+    return collection
+
+
+def create_item(mocker, name: str, depth: int = 0):
+    item = mocker.Mock()
+    item.name = name
+    item.serialize.return_value = {
+        "name": name,
+        "uid": f"uid-{name}",
+        "mtime": 1.0,
+        "depth": depth,
+    }
+    return item
+
+
+def test_register():
+    # Arrange
+    # Act
+    result = sqlite.register()
+
+    # Assert
+    assert result == "serializer"
+
+
+def test_what():
+    # Arrange
+    # Act
+    result = sqlite.what()
+
+    # Assert
+    assert result == "serializer/sqlite"
+
+
+def test_storage_factory(cobbler_api):
+    # Arrange
+
+    # Act
+    result = sqlite.storage_factory(cobbler_api)
+
+    # Assert
+    assert isinstance(result, sqlite.SQLiteSerializer)
+
+
+def test_serialize_item_raise(mocker, serializer_obj, mcollection):
+    # Arrange
+    mitem = create_item(mocker, "")
+
+    # Act and assert
+    with pytest.raises(CX):
+        serializer_obj.serialize_item(mcollection, mitem)
+
+
+def test_serialize_item(mocker, serializer_obj, mcollection):
+    # Arrange
+    mitem = create_item(mocker, "test_serializer")
+
+    # Act
+    serializer_obj.serialize_item(mcollection, mitem)
+    mitem.serialize.return_value["mtime"] = 2.0
+    serializer_obj.serialize_item(mcollection, mitem)
+
+    # Assert
+    assert serializer_obj.deserialize_raw("distros") == [mitem.serialize()]
+
+
+def test_serialize_delete(mocker, serializer_obj, mcollection):
+    # Arrange
+    mitem = create_item(mocker, "test_serializer_del")
+    serializer_obj.serialize_item(mcollection, mitem)
+
+    # Act
+    serializer_obj.serialize_delete(mcollection, mitem)
+
+    # Assert
+    assert serializer_obj.deserialize_raw("distros") == []
+
+
+def test_transaction_rollback(mocker, serializer_obj, mcollection):
+    # Arrange
+    serializer_obj.serialize_item(mcollection, create_item(mocker, "existing"))
+
+    # Act
+    with pytest.raises(ValueError):
+        with serializer_obj.transaction():
+            serializer_obj.serialize_item(mcollection, create_item(mocker, "new"))
+            serializer_obj.serialize_delete(
+                mcollection, create_item(mocker, "existing")
+            )
+            raise ValueError("abort")
+
+    # Assert
+    assert [item["name"] for item in serializer_obj.deserialize_raw("distros")] == [
+        "existing"
+    ]
+
+
+def test_transaction_commit_failure(mocker, serializer_obj, mcollection):
+    # Arrange
+    connection = serializer_obj._SQLiteSerializer__connect()
+    failing_connection = mocker.Mock(wraps=connection)
+    failing_connection.in_transaction = True
+
+    def execute(statement, *args):
+        if statement == "COMMIT":
+            raise sqlite3.OperationalError("database is locked")
+        return connection.execute(statement, *args)
+
+    failing_connection.execute.side_effect = execute
+    mocker.patch.object(
+        serializer_obj,
+        "_SQLiteSerializer__connect",
+        return_value=failing_connection,
+    )
+
+    # Act
+    with pytest.raises(sqlite3.OperationalError):
+        with serializer_obj.transaction():
+            serializer_obj.serialize_item(mcollection, create_item(mocker, "lost"))
+    mocker.stopall()
+    serializer_obj.serialize_item(mcollection, create_item(mocker, "saved"))
+
+    # Assert
+    assert [item["name"] for item in serializer_obj.deserialize_raw("distros")] == [
+        "saved"
+    ]
+
+
+def test_deserialize(mocker, serializer_obj, mcollection):
+    # Arrange
+    serializer_obj.serialize_item(mcollection, create_item(mocker, "child", depth=2))
+    serializer_obj.serialize_item(mcollection, create_item(mocker, "parent", depth=1))
+
+    # Act
+    serializer_obj.deserialize(mcollection)
+
+    # Assert
+    loaded = mcollection.from_list.call_args[0][0]
+    assert [item["name"] for item in loaded] == ["parent", "child"]
+
+
+def test_import_collections(serializer_obj, tmp_path: pathlib.Path):
+    # Arrange
+    libpath = tmp_path / "collections"
+    for collection_types in ("distros", "systems"):
+        os.makedirs(libpath / collection_types)
+        with open(libpath / collection_types / "test.json", "w") as item_file:
+            json.dump({"name": "test", "uid": collection_types, "depth": 0}, item_file)
+
+    # Act
+    result = serializer_obj.import_collections(str(libpath))
+
+    # Assert
+    assert result == 2
+    assert serializer_obj.deserialize_raw("distros") == [
+        {"name": "test", "uid": "distros", "depth": 0}
+    ]
+    assert len(serializer_obj.deserialize_raw("systems")) == 1
+
+
+def test_main(tmp_path: pathlib.Path):
+    # Arrange
+    libpath = tmp_path / "collections"
+    os.makedirs(libpath / "distros")
+    with open(libpath / "distros" / "test.json", "w") as item_file:
+        json.dump({"name": "test"}, item_file)
+    database_file = str(tmp_path / "migrated.db")
+
+    # Act
+    result = sqlite.main(
+        ["sqlite", "--source", str(libpath), "--database", database_file]
+    )
+
+    # Assert
+    assert result == 0
+    assert os.path.exists(database_file)
@@ -0,0 +1,101 @@
+import subprocess
+
+import pytest
+
+from cobbler import power_manager
+from cobbler.cexceptions import CX
+
+
+@pytest.fixture
+def power_systems(mocker, cobbler_api, create_distro, create_profile, create_system):
+    mocker.patch(
+        "cobbler.power_manager.get_power_command",
+        return_value="/usr/sbin/fence_ipmilanplus",
+    )
+    mocker.patch("time.sleep")
+    mocker.patch.object(cobbler_api.settings(), "power_bmc_interval", 0.0)
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    systems = []
+    for index in range(3):
+        test_system = create_system(profile_name=test_profile.name, name=f"node{index}")
+        test_system.power_address = f"10.0.0.{index % 2}"
+        systems.append(test_system)
+    return systems
+
+
+def test_power_systems(mocker, cobbler_api, power_systems):
+    # Arrange
+    mocked_subprocess = mocker.patch(
+        "cobbler.utils.subprocess_sp", return_value=("Status: ON\n", 0)
+    )
+    test_manager = power_manager.PowerManager(cobbler_api)
+
+    # Act
+    result = test_manager.power_systems(power_systems, "status")
+
+    # Assert
+    assert mocked_subprocess.call_count == 3
+    assert result == {
+        f"node{index}": {"success": True, "status": True, "error": ""}
+        for index in range(3)
+    }
+
+
+def test_power_systems_failure(mocker, cobbler_api, power_systems):
+    # Arrange
+    def fence_agent(cmd, shell=False, process_input=None, timeout=None):
+        if "ip=10.0.0.1" in process_input:
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        return "", 0
+
+    mocked_subprocess = mocker.patch(
+        "cobbler.utils.subprocess_sp", side_effect=fence_agent
+    )
+    mocked_sleep = power_manager.time.sleep
+    test_manager = power_manager.PowerManager(cobbler_api)
+
+    # Act
+    result = test_manager.power_systems(power_systems, "on")
+
+    # Assert
+    assert result["node0"] == {"success": True, "status": None, "error": ""}
+    assert result["node2"]["success"]
+    assert not result["node1"]["success"]
+    assert "command failed" in result["node1"]["error"]
+    assert mocked_subprocess.call_count == 2 + power_manager.POWER_RETRIES
+    # The retries back off
+    mocked_sleep.assert_any_call(power_manager.POWER_RETRY_DELAY)
+    mocked_sleep.assert_any_call(power_manager.POWER_RETRY_DELAY * 2)
+
+
+def test_power_systems_invalid_operation(cobbler_api):
+    # Arrange
+    test_manager = power_manager.PowerManager(cobbler_api)
+
+    # Act & Assert
+    with pytest.raises(CX):
+        test_manager.power_systems([], "cycle")
+
+
+def test_power_status_poller(mocker, cobbler_api, power_systems):
+    # Arrange
+    def fence_agent(cmd, shell=False, process_input=None, timeout=None):
+        if "ip=10.0.0.1" in process_input:
+            return "Status: OFF\n", 2
+        return "Status: ON\n", 0
+
+    mocker.patch("cobbler.utils.subprocess_sp", side_effect=fence_agent)
+    power_systems[2].power_address = ""
+    test_poller = power_manager.PowerStatusPoller(cobbler_api)
+
+    # Act
+    test_poller.poll()
+    result = test_poller.get_states(["node0", "node1", "node2"])
+
+    # Assert
+    assert result["node0"]["status"] == "on"
+    assert result["node1"]["status"] == "off"
+    assert result["node0"]["timestamp"] > 0
+    assert result["node2"] == {"status": "unknown", "timestamp": 0.0, "error": ""}
+    assert set(test_poller.get_states()) == {"node0", "node1"}
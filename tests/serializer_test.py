@@ -81,3 +81,29 @@ def test_deserialize(mocker, serializer_obj):
 
     # Assert
     storage_object_mock.deserialize.assert_called_with(input_collection, True)
+
+
+def test_transaction(mocker, serializer_obj):
+    # Arrange
+    open_mock = mocker.MagicMock()
+    open_mock.fileno.return_value = 5
+    mock_lock_file_location = mocker.patch(
+        "builtins.open", return_value=mocker.mock_open(mock=open_mock)
+    )
+    mocker.patch("fcntl.flock")
+    mocker.patch("os.path.exists", return_value=True)
+    input_collection = mocker.MagicMock()
+    storage_object_mock = mocker.patch.object(serializer_obj, "storage_object")
+
+    # Act
+    with serializer_obj.transaction():
+        serializer_obj.serialize_item(input_collection, mocker.MagicMock())
+        serializer_obj.serialize_item(input_collection, mocker.MagicMock())
+        serializer_obj.serialize_delete(input_collection, mocker.MagicMock())
+
+    # Assert
+    assert storage_object_mock.serialize_item.call_count == 2
+    assert storage_object_mock.serialize_delete.call_count == 1
+    storage_object_mock.transaction.assert_called_once()
+    # One access for __grab_lock and two for __release_lock, independent of the number of items
+    assert mock_lock_file_location.call_count == 3
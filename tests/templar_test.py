@@ -1,5 +1,8 @@
+import os
+
 import pytest
 
+from cobbler import templar
 from cobbler.cexceptions import CX
 from cobbler.templar import Templar
 
@@ -59,6 +62,34 @@ def test_render_cheetah(cobbler_api):
     assert result == "5"
 
 
+@pytest.mark.parametrize(
+    "test_input,expected_path",
+    [
+        ("/etc/foo", "literal"),
+        ("/images/$distro_name/${kernel}", "variables"),
+        ("/images/$distro_name/$missing", "cheetah"),
+        ("/images/$distro_name.$kernel", "cheetah"),
+        ("#set $a = 1\n/etc/$a", "cheetah"),
+    ],
+)
+def test_render_simple(mocker, cobbler_api, test_input, expected_path):
+    # Arrange
+    test_templar = Templar(cobbler_api)
+    search_table = {"distro_name": "test", "kernel": "vmlinuz"}
+    mocker.patch.dict(
+        templar.render_stats, {"literal": 0, "variables": 0, "cheetah": 0, "jinja2": 0}
+    )
+    expected = test_templar.render_cheetah(test_input, search_table.copy())
+
+    # Act
+    result = test_templar.render(test_input, search_table, None, "cheetah")
+
+    # Assert
+    assert result == expected
+    assert templar.render_stats[expected_path] == 1
+    assert sum(templar.render_stats.values()) == 1
+
+
 @pytest.mark.usefixtures("setup_cheetah_macros_file")
 @pytest.mark.skip("Macros only work if we restart cobblerd")
 def test_cheetah_macros(cobbler_api):
@@ -81,3 +112,21 @@ def test_render_jinja2(cobbler_api):
 
     # Assert
     assert result == "Test successful"
+
+
+def test_compile_jinja2(tmp_path):
+    # Arrange
+    templar.clear_jinja2_cache()
+    bytecode_cache_dir = str(tmp_path / "jinja2")
+
+    # Act
+    first = templar.compile_jinja2("{{ foo }}", "", bytecode_cache_dir)
+    second = templar.compile_jinja2("{{ foo }}", "", bytecode_cache_dir)
+    templar.clear_jinja2_cache()
+    reloaded = templar.compile_jinja2("{{ foo }}", "", bytecode_cache_dir)
+
+    # Assert
+    assert first is second
+    assert reloaded is not first
+    assert reloaded.render(foo="bar") == "bar"
+    assert len(os.listdir(bytecode_cache_dir)) == 1
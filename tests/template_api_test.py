@@ -1,5 +1,8 @@
+import os
+
 import pytest
 
+from cobbler import template_api
 from cobbler.template_api import CobblerTemplate
 
 
@@ -91,3 +94,56 @@ class TestCobblerTemplate:
 
         # Assert
         assert result == expected
+
+
+def test_track_snippets(tmp_path):
+    # Arrange
+    snippet = tmp_path / "existing"
+    snippet.write_text("content")
+    test_template = CobblerTemplate(
+        searchList=[{"autoinstall_snippets_dir": str(tmp_path)}]
+    )
+
+    # Act
+    with template_api.track_snippets() as snippets:
+        test_template.read_snippet("existing")
+        test_template.read_snippet("missing")
+
+    # Assert
+    assert snippets == {
+        str(snippet): template_api.snippet_fingerprint(str(snippet)),
+        str(tmp_path / "missing"): None,
+    }
+
+
+def test_compile_cache():
+    # Arrange
+    template_api.clear_compile_cache()
+
+    # Act
+    first = CobblerTemplate.compile(source="$test", baseclass=CobblerTemplate)
+    second = CobblerTemplate.compile(source="$test", baseclass=CobblerTemplate)
+    other = CobblerTemplate.compile(source="$other", baseclass=CobblerTemplate)
+
+    # Assert
+    assert first is second
+    assert other is not first
+    assert template_api.compile_cache_stats == {"hits": 1, "misses": 2}
+    assert str(first(searchList=[{"test": "value"}])) == "value"
+
+
+def test_read_snippet_file(tmp_path):
+    # Arrange
+    template_api.clear_compile_cache()
+    snippet = tmp_path / "snippet"
+    snippet.write_text("first")
+    template_api.read_snippet_file(str(snippet))
+    stat = snippet.stat()
+    snippet.write_text("second")
+    os.utime(snippet, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+    # Act
+    result = template_api.read_snippet_file(str(snippet))
+
+    # Assert
+    assert result == "second"
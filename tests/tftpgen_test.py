@@ -5,8 +5,9 @@ import shutil
 
 import pytest
 
-from cobbler import tftpgen
+from cobbler import enums, tftpgen, utils
 from cobbler.items.distro import Distro
+from cobbler.items.system import NetworkInterface
 
 
 def test_copy_bootloaders(tmpdir, cobbler_api):
@@ -92,3 +93,103 @@ def test_copy_single_distro_files(
     result_initrd = os.path.join(directory, "images", test_distro.name, fk_initrd)
     assert os.path.exists(result_kernel)
     assert os.path.exists(result_initrd)
+
+
+def test_get_menu_fragment(
+    mocker, cobbler_api, create_distro, create_profile, create_system
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_gen = tftpgen.TFTPGen(cobbler_api)
+    tftpgen.clear_menu_fragment_cache()
+    expected = test_gen.get_menu_items()
+    create_system(profile_name=test_profile.name)
+    spy = mocker.spy(test_gen, "write_pxe_file")
+
+    # Act
+    result = test_gen.get_menu_items()
+
+    # Assert
+    assert result["menu_items"] == expected["menu_items"]
+    assert "pxe" in result["menu_items"]
+    spy.assert_not_called()
+    assert tftpgen.menu_fragment_stats["hits"] > 0
+
+
+def test_get_menu_levels(cobbler_api, create_distro, create_profile):
+    # Arrange
+    test_distro = create_distro()
+    create_profile(test_distro.name)
+    test_gen = tftpgen.TFTPGen(cobbler_api)
+    archs = [None, test_distro.arch, enums.Archs.PPC64]
+
+    # Act
+    result = test_gen.get_menu_levels(None, archs)
+
+    # Assert
+    for arch in archs:
+        assert result[arch]["menu_items"] == (
+            test_gen.get_menu_level(None, arch)["menu_items"]
+        )
+
+
+def test_get_menu_levels_used_fragments(cobbler_api, create_distro, create_profile):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_gen = tftpgen.TFTPGen(cobbler_api)
+    used_fragments = set()
+
+    # Act
+    test_gen.get_menu_levels(None, [None], used_fragments)
+
+    # Assert
+    assert (test_profile.uid, "pxe") in used_fragments
+
+
+def test_write_all_system_files(
+    mocker, cobbler_api, create_distro, create_profile, create_system
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    test_system = create_system(profile_name=test_profile.name)
+    second_interface = NetworkInterface(cobbler_api)
+    second_interface.mac_address = "aa:bb:cc:dd:ee:02"
+    test_system.interfaces = {
+        "default": test_system.interfaces["default"],
+        "eth1": second_interface,
+    }
+    test_system.interfaces["default"].mac_address = "aa:bb:cc:dd:ee:01"
+    test_gen = tftpgen.TFTPGen(cobbler_api)
+    expected_pxe = test_gen.write_pxe_file(
+        None,
+        test_system,
+        test_profile,
+        test_distro,
+        test_distro.arch,
+        metadata={"menu_items": {}},
+    )
+    expected_grub = test_gen.write_pxe_file(
+        None,
+        test_system,
+        test_profile,
+        test_distro,
+        test_distro.arch,
+        bootloader_format="grub",
+    )
+    blender_spy = mocker.spy(utils, "blender")
+
+    # Act
+    test_gen.write_all_system_files(test_system, {})
+
+    # Assert
+    assert blender_spy.call_count == 1
+    for mac in ("aa-bb-cc-dd-ee-01", "aa-bb-cc-dd-ee-02"):
+        pxe_file = pathlib.Path(test_gen.bootloc, "pxelinux.cfg", f"01-{mac}")
+        grub_file = pathlib.Path(
+            test_gen.bootloc, "grub", "system", mac.replace("-", ":")
+        )
+        assert pxe_file.read_text(encoding="UTF-8") == expected_pxe
+        assert grub_file.read_text(encoding="UTF-8") == expected_grub
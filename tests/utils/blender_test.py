@@ -0,0 +1,43 @@
+from cobbler import utils
+
+
+def test_blender_cache(cobbler_api, create_distro, create_profile, create_system):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    system1 = create_system(profile_name=test_profile.name, name="system1")
+    system2 = create_system(profile_name=test_profile.name, name="system2")
+    utils.clear_blend_cache()
+    utils.blender(cobbler_api, False, system1)
+    misses = utils.blend_cache_stats["misses"]
+
+    # Act
+    result = utils.blender(cobbler_api, False, system2)
+    result["kernel_options"]["modified"] = "yes"
+    test_profile.kernel_options = {"changed": "value"}
+    changed_result = utils.blender(cobbler_api, False, system1)
+
+    # Assert
+    assert utils.blend_cache_stats["misses"] > misses
+    assert utils.blend_cache_stats["hits"] > 0
+    assert "modified" not in changed_result["kernel_options"]
+    assert changed_result["kernel_options"].get("changed") == "value"
+
+
+def test_blender_removed_child(
+    cobbler_api, create_distro, create_profile, create_system
+):
+    # Arrange
+    test_distro = create_distro()
+    test_profile = create_profile(test_distro.name)
+    system1 = create_system(profile_name=test_profile.name, name="system1")
+    create_system(profile_name=test_profile.name, name="system2")
+    utils.clear_blend_cache()
+    utils.blender(cobbler_api, False, system1)
+
+    # Act
+    cobbler_api.remove_system("system2")
+    result = utils.blender(cobbler_api, False, system1)
+
+    # Assert
+    assert "system2" not in result["children"]
@@ -1,3 +1,4 @@
+import json
 import os
 import shutil
 from pathlib import Path
@@ -118,6 +119,93 @@ def test_copyfile_pattern():
     assert False
 
 
+def test_write_file(tmp_path: Path):
+    # Arrange
+    tfile = tmp_path / "testfile"
+    tfile.write_text("content")
+    os.utime(tfile, (0, 0))
+
+    # Act
+    with filesystem_helpers.track_writes() as files:
+        unchanged_result = filesystem_helpers.write_file(str(tfile), "content")
+        unchanged_mtime = tfile.stat().st_mtime
+        changed_result = filesystem_helpers.write_file(str(tfile), "new content")
+
+    # Assert
+    assert not unchanged_result
+    assert unchanged_mtime == 0
+    assert changed_result
+    assert tfile.read_text() == "new content"
+    assert files == {str(tfile): filesystem_helpers.file_fingerprint(str(tfile))}
+
+
+def test_symlink(tmp_path: Path):
+    # Arrange
+    tlink = tmp_path / "testlink"
+
+    # Act
+    with filesystem_helpers.track_writes() as files:
+        first_result = filesystem_helpers.symlink("target", str(tlink))
+        second_result = filesystem_helpers.symlink("target", str(tlink))
+
+    # Assert
+    assert first_result
+    assert not second_result
+    assert os.readlink(tlink) == "target"
+    assert files == {str(tlink): "-> target"}
+
+
+def test_linkfile_track_writes(cobbler_api, tmp_path: Path):
+    # Arrange
+    test_source = tmp_path / "source"
+    test_source.write_text("content")
+    test_destination = tmp_path / "destination"
+
+    # Act
+    with filesystem_helpers.track_writes() as files:
+        filesystem_helpers.linkfile(
+            cobbler_api, str(test_source), str(test_destination)
+        )
+
+    # Assert
+    assert test_destination.read_text() == "content"
+    assert files == {str(test_destination): f"<- {test_source}"}
+
+
+def test_track_writes_nested(tmp_path: Path):
+    # Arrange
+    tfile = tmp_path / "testfile"
+
+    # Act
+    with filesystem_helpers.track_writes() as outer_files:
+        with filesystem_helpers.track_writes() as inner_files:
+            filesystem_helpers.write_file(str(tfile), "content")
+
+    # Assert
+    assert str(tfile) in inner_files
+    assert str(tfile) in outer_files
+
+
+def test_link_cache(mocker, tmp_path: Path):
+    # Arrange
+    test_file = tmp_path / "vmlinuz"
+    test_file.write_text("kernel")
+    lcache = tmp_path / ".link_cache"
+    spy = mocker.spy(filesystem_helpers, "sha1_file")
+
+    # Act
+    with filesystem_helpers.link_cache():
+        first = filesystem_helpers.hashfile(str(test_file), lcache=lcache)
+        second = filesystem_helpers.hashfile(str(test_file), lcache=lcache)
+        written_early = (lcache / "link_cache.json").exists()
+
+    # Assert
+    assert first == second == filesystem_helpers.sha1_file(str(test_file))
+    assert spy.call_count == 2
+    assert not written_early
+    assert str(test_file) in json.loads((lcache / "link_cache.json").read_text())
+
+
 def test_rmfile(tmpdir: Path):
     # Arrange
     tfile = tmpdir.join("testfile")
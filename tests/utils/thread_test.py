@@ -0,0 +1,38 @@
+import pytest
+
+from cobbler.utils import thread
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_run_workers(cobbler_api, tmp_path, workers):
+    # Arrange
+    cobbler_api.settings().sync_workers = workers
+    target_dir = tmp_path / "workers"
+    target_dir.mkdir()
+
+    def write_file(name):
+        (target_dir / name).write_text(name)
+        return name.upper()
+
+    # Act
+    result = thread.run_workers(cobbler_api, write_file, ["a", "b", "c", "d"])
+
+    # Assert
+    assert result == ["A", "B", "C", "D"]
+    assert sorted(path.name for path in target_dir.iterdir()) == ["a", "b", "c", "d"]
+
+
+def test_run_workers_exception(cobbler_api):
+    # Arrange
+    cobbler_api.settings().sync_workers = 2
+    processed = []
+
+    def fail_on_b(name):
+        processed.append(name)
+        if name == "b":
+            raise ValueError(name)
+
+    # Act & Assert
+    with pytest.raises(ValueError):
+        thread.run_workers(cobbler_api, fail_on_b, ["a", "b", "c"])
+    assert sorted(processed) == ["a", "b", "c"]
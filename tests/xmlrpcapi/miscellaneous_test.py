@@ -39,6 +39,13 @@ def cleanup_find_items_paged(remove_distro):
     remove_distro("test_system_template_for_system")
 
 
+@pytest.fixture()
+def cleanup_iterate_items(remove_distro):
+    yield
+    for index in range(3):
+        remove_distro(f"distro_iterate_items_{index}")
+
+
 @pytest.fixture(autouse=True)
 def cleanup_get_blended_data(remove_distro, remove_profile, remove_system):
     remove_system("test_system_blended")
@@ -176,6 +183,71 @@ class TestMiscellaneous:
         assert "pages" in result["pageinfo"]
         assert result["pageinfo"]["pages"] == [1, 2]
 
+    def test_iterate_items(
+        self,
+        remote,
+        token,
+        create_distro,
+        create_kernel_initrd,
+        cleanup_iterate_items,
+    ):
+        # Arrange
+        folder = create_kernel_initrd("vmlinuz1", "initrd1.img")
+        path_kernel = os.path.join(folder, "vmlinuz1")
+        path_initrd = os.path.join(folder, "initrd1.img")
+        for index in range(3):
+            create_distro(
+                f"distro_iterate_items_{index}",
+                "x86_64",
+                "suse",
+                path_kernel,
+                path_initrd,
+            )
+
+        # Act
+        first = remote.iterate_items("distro", "", 2, {}, ["name", "arch"])
+        second = remote.iterate_items("distro", first["cursor"], 2, {}, ["name"])
+
+        # Assert
+        assert first["items"] == [
+            {"name": "distro_iterate_items_0", "arch": "x86_64"},
+            {"name": "distro_iterate_items_1", "arch": "x86_64"},
+        ]
+        assert first["cursor"] == "distro_iterate_items_1"
+        assert second["items"] == [{"name": "distro_iterate_items_2"}]
+        assert second["cursor"] == ""
+
+    def test_get_distros_paged(
+        self,
+        remote,
+        token,
+        create_distro,
+        create_kernel_initrd,
+        cleanup_iterate_items,
+    ):
+        # Arrange
+        folder = create_kernel_initrd("vmlinuz1", "initrd1.img")
+        path_kernel = os.path.join(folder, "vmlinuz1")
+        path_initrd = os.path.join(folder, "initrd1.img")
+        for index in range(3):
+            create_distro(
+                f"distro_iterate_items_{index}",
+                "x86_64",
+                "suse",
+                path_kernel,
+                path_initrd,
+            )
+
+        # Act
+        result = remote.get_distros(2, 2, token, ["name"])
+        result_past_end = remote.get_distros(3, 2, token, ["name"])
+        result_token_only = remote.get_distros(token)
+
+        # Assert
+        assert result == [{"name": "distro_iterate_items_2"}]
+        assert result_past_end == []
+        assert len(result_token_only) == 3
+
     @pytest.mark.skip(
         "This functionality was implemented very quickly. The test for this needs to be fixed at a "
         "later point!"
@@ -163,6 +163,140 @@ class TestSystem:
         # Assert --> A not exiting system returns an empty list
         assert result == []
 
+    @pytest.mark.usefixtures(
+        "create_testdistro",
+        "create_testmenu",
+        "create_testprofile",
+        "remove_testdistro",
+        "remove_testmenu",
+        "remove_testprofile",
+        "remove_testsystem",
+    )
+    def test_find_system_by_mac_and_ip(self, remote, token):
+        """
+        Test: find systems by the MAC or IP address of one of their interfaces
+        """
+
+        # Arrange
+        system = remote.new_system(token)
+        remote.modify_system(system, "name", "testsystem0", token)
+        remote.modify_system(system, "profile", "testprofile0", token)
+        remote.modify_system(
+            system,
+            "modify_interface",
+            {"macaddress-eth0": "aa:bb:cc:dd:ee:ff", "ipaddress-eth0": "192.168.1.20"},
+            token,
+        )
+        remote.save_system(system, token)
+
+        # Act
+        result_mac = remote.find_system_by_mac("AA:BB:CC:DD:EE:FF")
+        result_ip = remote.find_system_by_ip("192.168.1.20")
+        result_unknown = remote.find_system_by_mac("aa:bb:cc:dd:ee:00")
+
+        # Assert
+        assert result_mac == ["testsystem0"]
+        assert result_ip == ["testsystem0"]
+        assert result_unknown == []
+
+    @pytest.mark.usefixtures(
+        "create_testdistro",
+        "create_testmenu",
+        "create_testprofile",
+        "remove_testdistro",
+        "remove_testmenu",
+        "remove_testprofile",
+        "remove_testsystem",
+    )
+    def test_batch_edit(self, mocker, remote, token):
+        """
+        Test: add, edit and remove systems with a single call
+        """
+
+        # Arrange
+        sync_spy = mocker.spy(remote.api, "sync_systems")
+        add_operations = [
+            {
+                "action": "add",
+                "what": "system",
+                "name": f"testsystem{index}",
+                "attributes": {
+                    "profile": "testprofile0",
+                    "modify_interface": {"macaddress-eth0": f"aa:bb:cc:dd:ee:0{index}"},
+                },
+            }
+            for index in range(2)
+        ]
+        invalid_operations = [
+            {
+                "action": "edit",
+                "what": "system",
+                "name": "testsystem0",
+                "attributes": {"comment": "never saved"},
+            },
+            {
+                "action": "edit",
+                "what": "system",
+                "name": "testsystem1",
+                "attributes": {
+                    "modify_interface": {"macaddress-eth0": "aa:bb:cc:dd:ee:00"}
+                },
+            },
+            {"action": "add", "what": "system", "name": "testsystem2"},
+        ]
+        edit_operations = [
+            {
+                "action": "edit",
+                "what": "system",
+                "name": "testsystem0",
+                "attributes": {"comment": "batch"},
+            },
+            {"action": "remove", "what": "system", "name": "testsystem1"},
+        ]
+        move_operations = [
+            {
+                "action": "edit",
+                "what": "system",
+                "name": "testsystem0",
+                "attributes": {"profile": "testprofile1"},
+            },
+            {"action": "add", "what": "system", "name": "testsystem2"},
+        ]
+
+        # Act
+        add_result = remote.batch_edit(add_operations, token)
+        with pytest.raises(CX) as error:
+            remote.batch_edit(invalid_operations, token)
+        edit_result = remote.batch_edit(edit_operations, token)
+        remote.batch_edit(
+            [
+                {
+                    "action": "add",
+                    "what": "profile",
+                    "name": "testprofile1",
+                    "attributes": {"distro": "testdistro0"},
+                }
+            ],
+            token,
+        )
+        with pytest.raises(CX):
+            remote.batch_edit(move_operations, token)
+        old_children = remote.api.find_profile(name="testprofile0").children
+        new_children = remote.api.find_profile(name="testprofile1").children
+        remote.remove_profile("testprofile1", token)
+
+        # Assert
+        assert add_result == ["testsystem0", "testsystem1"]
+        assert sync_spy.call_count == 2
+        assert "aa:bb:cc:dd:ee:00" in str(error.value)
+        assert "operation 2" in str(error.value)
+        assert edit_result == ["testsystem0"]
+        assert remote.get_system("testsystem0").get("comment") == "batch"
+        assert remote.find_system({"name": "testsystem1"}, token) == []
+        assert remote.get_system("testsystem0").get("profile") == "testprofile0"
+        assert "testsystem0" in old_children
+        assert "testsystem0" not in new_children
+
     @pytest.mark.usefixtures(
         "create_testdistro",
         "create_testmenu",